@@ -1,6 +1,16 @@
 from asyncpg import Pool
 from typing import List
 
+# Salary text column of each `salary_contract` value (set by Scout, see services/scout/salary.py)
+SALARY_TEXT_BY_CONTRACT = {
+    "B2B": "salary_b2b",
+    "Permanent": "salary_permanent",
+    "Any": "salary_any",
+    "Mandate": "salary_mandate",
+    "Specific-task": "salary_specific_task",
+    "Internship": "salary_internship",
+}
+
 class OffersRepository:
     def __init__(self, pool: Pool):
         self.pool = pool
@@ -13,6 +23,8 @@ class OffersRepository:
                 o.experience, o.work_schedule, 
                 o.salary_any, o.salary_b2b, o.salary_permanent,
                 o.salary_mandate, o.salary_internship, o.salary_specific_task,
+                o.salary_min, o.salary_max, o.salary_currency,
+                o.salary_is_gross, o.salary_period, o.salary_contract,
                 array_agg(COALESCE(s.canonical_skill_name, s.original_skill_name)) as skills
             FROM offers o
             LEFT JOIN offer_skills os ON o.job_url = os.job_url
@@ -21,7 +33,9 @@ class OffersRepository:
                      o.location, o.operating_mode, o.employment_type,
                      o.experience, o.work_schedule, 
                      o.salary_any, o.salary_b2b, o.salary_permanent,
-                     o.salary_mandate, o.salary_internship, o.salary_specific_task
+                     o.salary_mandate, o.salary_internship, o.salary_specific_task,
+                     o.salary_min, o.salary_max, o.salary_currency,
+                     o.salary_is_gross, o.salary_period, o.salary_contract
         """
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(query)
@@ -30,8 +44,11 @@ class OffersRepository:
             for row in rows:
                 # Filter out None values from skills array if any
                 skills_list = [s for s in row["skills"] if s] if row["skills"] else []
-                # Salary choosing logic: B2B > Permanent > Any > Mandate > Task > Internship
+                # Show the salary the typed columns were parsed from; without one
+                # fall back to B2B > Permanent > Any > Mandate > Task > Internship
+                contract_column = SALARY_TEXT_BY_CONTRACT.get(row["salary_contract"])
                 salary = (
+                    (row[contract_column] if contract_column else None) or
                     row["salary_b2b"] or 
                     row["salary_permanent"] or 
                     row["salary_any"] or 
@@ -50,6 +67,13 @@ class OffersRepository:
                     "experience": row["experience"],
                     "workSchedule": row["work_schedule"],
                     "salary": salary,
+                    # Parsed by Scout from the same salary (see services/scout/salary.py)
+                    "salaryMin": float(row["salary_min"]) if row["salary_min"] is not None else None,
+                    "salaryMax": float(row["salary_max"]) if row["salary_max"] is not None else None,
+                    "salaryCurrency": row["salary_currency"],
+                    "salaryIsGross": row["salary_is_gross"],
+                    "salaryPeriod": row["salary_period"],
+                    "salaryContract": row["salary_contract"],
                     "requiredSkills": skills_list,
                 })
             return results
@@ -0,0 +1,24 @@
+-- Migration 011: Incremental re-scrape support for offers
+-- first_seen_at / last_seen_at track when an offer was listed on the website,
+-- scraped_at / updated_at track when its page was last visited / last changed,
+-- listing_hash / content_hash detect changes without comparing every column.
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS listing_hash TEXT;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+-- Existing rows were first seen and last scraped when they were inserted
+UPDATE offers
+SET first_seen_at = created_at,
+    scraped_at = created_at,
+    updated_at = created_at
+WHERE created_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_offers_last_seen_at ON offers(last_seen_at);
+CREATE INDEX IF NOT EXISTS idx_offers_updated_at ON offers(updated_at);
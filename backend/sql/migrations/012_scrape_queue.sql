@@ -0,0 +1,16 @@
+-- Migration 012: Shared work queue for parallel scout workers
+-- The collector enqueues offer URLs; workers claim batches with
+-- FOR UPDATE SKIP LOCKED and hold them under a lease until marked done.
+CREATE TABLE IF NOT EXISTS scrape_queue (
+    job_url TEXT PRIMARY KEY,
+    listing JSONB,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    lease_expires_at TIMESTAMP,
+    error TEXT,
+    enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_queue_claimable ON scrape_queue(enqueued_at) WHERE state IN ('pending', 'claimed');
+CREATE INDEX IF NOT EXISTS idx_scrape_queue_claimed_by ON scrape_queue(claimed_by) WHERE state = 'claimed';
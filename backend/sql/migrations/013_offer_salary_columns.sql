@@ -0,0 +1,20 @@
+-- Migration 013: Typed salary columns parsed by Scout at insert time
+-- The salary shown to users (B2B > Permanent > Any > Mandate > Task > Internship)
+-- parsed into numbers, so filters and sorting no longer go through the
+-- regexp_match calls of the offers_parsed view.
+-- Fill existing rows afterwards with: python -m scout backfill --salaries
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_min NUMERIC;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_max NUMERIC;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_currency TEXT;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_is_gross BOOLEAN;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_period TEXT;
+ALTER TABLE offers
+ADD COLUMN IF NOT EXISTS salary_contract TEXT;
+-- Comparisons only make sense within one currency and period
+CREATE INDEX IF NOT EXISTS idx_offers_salary_min ON offers(salary_currency, salary_period, salary_min);
+CREATE INDEX IF NOT EXISTS idx_offers_salary_max ON offers(salary_currency, salary_period, salary_max);
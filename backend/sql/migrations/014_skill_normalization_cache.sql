@@ -0,0 +1,13 @@
+-- Migration 014: Persistent normalization cache for Atlas
+-- Raw skill -> canonical name(s) answers of the model survive
+-- clear_skills_tables and schema resets, so re-normalizing does not
+-- send the same raw names to Bedrock again.
+-- canonical is a JSON string, or a list when a raw name was split.
+CREATE TABLE IF NOT EXISTS skill_normalization_cache (
+    raw_key TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    canonical JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (raw_key, category)
+);
@@ -0,0 +1,9 @@
+-- Migration 015: Watermarks for incremental skill extraction
+-- Atlas stores, per stage, the time its last successful run started;
+-- the next run only reads offers whose updated_at is later than that.
+-- Without a row (or with --full), the stage processes every offer.
+CREATE TABLE IF NOT EXISTS normalization_state (
+    stage TEXT PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,7 @@
+-- Watermarks of Atlas' incremental stages: offers changed (updated_at)
+-- after a stage's watermark have not been processed by it yet.
+CREATE TABLE IF NOT EXISTS normalization_state (
+    stage TEXT PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
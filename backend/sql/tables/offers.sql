@@ -16,6 +16,32 @@ CREATE TABLE IF NOT EXISTS offers (
     operating_mode TEXT,
     tech_stack TEXT,
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    salary_min NUMERIC,
+    salary_max NUMERIC,
+    salary_currency TEXT,
+    salary_is_gross BOOLEAN,
+    salary_period TEXT,
+    salary_contract TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    listing_hash TEXT,
+    content_hash TEXT
 );
 
+-- Existing databases get these columns from migrations 011 and 013; only
+-- index them once they exist, so this file can run before the migrations.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'offers' AND column_name = 'last_seen_at') THEN
+        CREATE INDEX IF NOT EXISTS idx_offers_last_seen_at ON offers(last_seen_at);
+        CREATE INDEX IF NOT EXISTS idx_offers_updated_at ON offers(updated_at);
+    END IF;
+    IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'offers' AND column_name = 'salary_min') THEN
+        CREATE INDEX IF NOT EXISTS idx_offers_salary_min ON offers(salary_currency, salary_period, salary_min);
+        CREATE INDEX IF NOT EXISTS idx_offers_salary_max ON offers(salary_currency, salary_period, salary_max);
+    END IF;
+END $$;
+
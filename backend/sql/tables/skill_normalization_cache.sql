@@ -0,0 +1,11 @@
+-- Raw skill -> canonical name(s) answers of the normalization model, kept
+-- across runs (and across resets of `skills`) so a raw name is only ever
+-- sent to the model once. Keyed by the case-folded raw name and category.
+CREATE TABLE IF NOT EXISTS skill_normalization_cache (
+    raw_key TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    canonical JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (raw_key, category)
+);
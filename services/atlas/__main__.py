@@ -4,8 +4,6 @@ Allows running: python -m atlas.extract_skills
 """
 
 import argparse
-import asyncio
-
 
 from .normalize_skills import main as normalize_main
 
@@ -18,11 +16,12 @@ def main():
     norm_parser = subparsers.add_parser("normalize", help="Run skill normalization")
     norm_parser.add_argument("--stage", type=str, default="all", choices=["all", "extract", "normalize", "deduplicate", "link"], help="Stage to run.")
     norm_parser.add_argument("--clear-all", action="store_true", help="DEV ONLY: Full destructive reset including user_skills.")
+    norm_parser.add_argument("--full", action="store_true", help="Re-read all offers instead of those changed since the last run.")
     
     args = parser.parse_args()
     
     if args.command == "normalize":
-        asyncio.run(normalize_main(stage=args.stage, clear_all=args.clear_all))
+        normalize_main(stage=args.stage, clear_all=args.clear_all, full=args.full)
     else:
         parser.print_help()
 
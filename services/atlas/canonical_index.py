@@ -0,0 +1,145 @@
+"""
+Local fuzzy matching of raw skills against existing canonical names.
+
+Many new raw skills are trivial variants of a canonical name we already have
+("NodeJS", "node.js", "Node JS"). `CanonicalIndex` resolves those without
+the model. Local matches are final (they never reach the model), so only
+near-certain ones are accepted:
+
+1. Normalized key: case-folded, without spaces, dots, hyphens and
+   underscores ("node.js" -> "nodejs"), so "NodeJS" matches "Node.js".
+2. Aliases: a "js" suffix is added or dropped only for the libraries in
+   `JS_SUFFIX_OPTIONAL` ("ReactJS" -> "React"), where both spellings name
+   the same thing - "GoJS" is not "Go", and "AngularJS" is not "Angular".
+   `KEY_ALIASES` maps well-known short forms ("Postgres" -> "PostgreSQL").
+3. Typos in long names: a canonical key sharing most character trigrams
+   (`MIN_TRIGRAM_OVERLAP`) with the raw key, both at least
+   `MIN_FUZZY_LENGTH` characters, one edit apart, unique, and agreeing on
+   every digit ("Kubernets" -> "Kubernetes"). Short names one edit apart
+   are often different tools ("MSSQL"/"MySQL", "Flash"/"Flask").
+
+Anything else is ambiguous and left to the model.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+# Libraries equally known with and without a "js" suffix (normalized keys)
+JS_SUFFIX_OPTIONAL = frozenset({"react", "vue", "express", "ember", "backbone", "knockout", "svelte"})
+# Well-known short forms -> normalized key of the full name
+KEY_ALIASES = {
+    "postgres": "postgresql",
+    "postgre": "postgresql",
+    "golang": "go",
+    "k8s": "kubernetes",
+}
+
+# Keys shorter than this are never fuzzy-matched ("String"/"Spring", "Raven"/"Maven")
+MIN_FUZZY_LENGTH = 8
+# Share of the raw key's trigrams a candidate must have
+MIN_TRIGRAM_OVERLAP = 0.7
+# Edit distance accepted for a fuzzy match
+MAX_EDIT_DISTANCE = 1
+
+
+def normalize_key(name: str) -> str:
+    """Comparison key: case-folded, without spaces, dots, hyphens and underscores."""
+    return re.sub(r'[\s\.\-_]', '', name).casefold()
+
+
+def alias_keys(key: str) -> List[str]:
+    """Keys that name the same skill as `key`, the key itself first."""
+    keys = [key]
+    if key in KEY_ALIASES:
+        keys.append(KEY_ALIASES[key])
+    if key.endswith("js") and key[:-2] in JS_SUFFIX_OPTIONAL:
+        keys.append(key[:-2])
+    elif key in JS_SUFFIX_OPTIONAL:
+        keys.append(key + "js")
+    return keys
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, bound: int) -> Optional[int]:
+    """Levenshtein distance of `a` and `b`, or None when it exceeds `bound`."""
+    if abs(len(a) - len(b)) > bound:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > bound:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= bound else None
+
+
+class CanonicalIndex:
+    """In-memory index of canonical skill names for local pre-matching."""
+
+    def __init__(self, canonicals: Iterable[str] = ()):
+        self.by_key: Dict[str, str] = {}
+        self.by_trigram: Dict[str, Set[str]] = defaultdict(set)
+        self.matched = 0
+        self.prompts_skipped = 0
+        self._lock = threading.Lock()
+        self.add(canonicals)
+
+    def add(self, canonicals: Iterable[str]):
+        """Index canonical names (the alphabetically first name wins a shared key)."""
+        with self._lock:
+            for name in sorted(canonicals):
+                key = normalize_key(name)
+                if not key or key in self.by_key:
+                    continue
+                self.by_key[key] = name
+                for trigram in _trigrams(key):
+                    self.by_trigram[trigram].add(key)
+
+    def match(self, raw: str) -> Optional[str]:
+        """Canonical name a raw skill certainly refers to, or None when it is ambiguous."""
+        key = normalize_key(raw)
+        if not key:
+            return None
+        with self._lock:
+            for alias in alias_keys(key):
+                if alias in self.by_key:
+                    return self.by_key[alias]
+
+            if len(key) < MIN_FUZZY_LENGTH:
+                return None
+            trigrams = _trigrams(key)
+            shared: Dict[str, int] = defaultdict(int)
+            for trigram in trigrams:
+                for candidate in self.by_trigram.get(trigram, ()):
+                    shared[candidate] += 1
+
+            digits = re.sub(r'\D', '', key)
+            best, best_distance, tied = None, MAX_EDIT_DISTANCE + 1, False
+            for candidate, count in shared.items():
+                if (len(candidate) < MIN_FUZZY_LENGTH or count < MIN_TRIGRAM_OVERLAP * len(trigrams)
+                        or re.sub(r'\D', '', candidate) != digits):
+                    continue
+                distance = bounded_edit_distance(key, candidate, MAX_EDIT_DISTANCE)
+                if distance is None:
+                    continue
+                if distance < best_distance:
+                    best, best_distance, tied = candidate, distance, False
+                elif distance == best_distance:
+                    tied = True
+            if best is None or tied:
+                return None
+            return self.by_key[best]
+
+    def record(self, matched: int, prompt_skipped: bool):
+        """Count skills resolved locally for one batch, and whether its model call was avoided."""
+        with self._lock:
+            self.matched += matched
+            self.prompts_skipped += int(prompt_skipped)
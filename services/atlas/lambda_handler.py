@@ -1,6 +1,7 @@
 """
 Lambda entry point for skill normalization.
 Runs full normalization (extract → normalize → deduplicate → link).
+Extraction and linking only read offers changed since the last run unless the event sets "full".
 Uses IAM role for Bedrock; DATABASE_URL (or AWS_DB_*) and AWS_REGION from env.
 """
 import asyncio
@@ -21,5 +22,5 @@ def handler(event=None, context=None):
         raise ValueError("clear_first is not allowed in Lambda prod environment")
     if not any(os.environ.get(k) for k in ["DATABASE_URL", "AWS_DB_ENDPOINT", "SECRET_ARN"]):
         raise ValueError("Set DATABASE_URL, AWS_DB_*, or SECRET_ARN env var for Lambda")
-    asyncio.run(run_normalization_process(stage=stage, clear_first=False))
+    asyncio.run(run_normalization_process(stage=stage, clear_first=False, full=bool(event.get("full"))))
     return {"statusCode": 200, "body": "Normalization completed"}
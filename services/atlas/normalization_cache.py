@@ -0,0 +1,142 @@
+"""
+Persistent raw -> canonical normalization cache.
+
+Every answer of the normalization model is kept in the
+`skill_normalization_cache` table, keyed by the case-folded raw name and its
+category, so wiping `skills` (`--clear`, `--clear-all`, a schema reset) no
+longer means paying for the same model calls again. When the table does not
+exist (migration 014 not applied, local runs without it), a JSON file at
+`ATLAS_CACHE_PATH` is used instead.
+
+Lookups happen in memory from the Bedrock worker threads; new answers are
+collected there and written by the event loop with `flush`.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import asyncpg
+
+# Local stand-in for the cache table
+CACHE_PATH = Path(os.getenv('ATLAS_CACHE_PATH', '.atlas/normalization-cache.json'))
+
+
+def cache_key(raw: str, category: Optional[str]) -> Tuple[str, str]:
+    """Cache key of a raw skill: case-folded name and category ('' when unknown)."""
+    return raw.strip().casefold(), category or ''
+
+
+class NormalizationCache:
+    """Raw skill -> canonical name (or list of names) answers, shared across runs."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self.entries: Dict[Tuple[str, str], object] = {}
+        self.use_table = True
+        self.hits = 0
+        self.misses = 0
+        self._dirty: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    async def load(self, conn: asyncpg.Connection):
+        """Load every cached answer (from the table, or the file when the table does not exist)."""
+        try:
+            rows = await conn.fetch("SELECT raw_key, category, canonical FROM skill_normalization_cache")
+            self.entries = {(r['raw_key'], r['category']): json.loads(r['canonical']) for r in rows}
+            logging.info(f"🗃️ Loaded {len(self.entries)} cached normalizations.")
+            return
+        except asyncpg.exceptions.UndefinedTableError:
+            self.use_table = False
+            logging.warning("⚠️ skill_normalization_cache table missing (migration 014), using the local cache file.")
+
+        try:
+            data = json.loads(self.path.read_text())
+            self.entries = {(e['raw_key'], e['category']): e['canonical'] for e in data}
+            logging.info(f"🗃️ Loaded {len(self.entries)} cached normalizations from {self.path}.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"⚠️ Could not read normalization cache {self.path}: {e}")
+
+    def get(self, raw: str, category: Optional[str]) -> Optional[object]:
+        """Cached canonical name(s) of a raw skill, or None (counts a hit or a miss)."""
+        with self._lock:
+            canonical = self.entries.get(cache_key(raw, category))
+            if canonical is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return canonical
+
+    def put(self, raw: str, category: Optional[str], canonical: object):
+        """Remember the model's answer for a raw skill (written on the next `flush`)."""
+        if not canonical:
+            return
+        key = cache_key(raw, category)
+        with self._lock:
+            if self.entries.get(key) != canonical:
+                self.entries[key] = canonical
+                self._dirty[key] = canonical
+
+    def rename(self, merges: Dict[str, str]):
+        """Apply canonical merges (deduplication) to the cached answers, so they are not undone next run."""
+        if not merges:
+            return
+        with self._lock:
+            for key, canonical in self.entries.items():
+                if isinstance(canonical, list):
+                    renamed = list(dict.fromkeys(merges.get(name, name) for name in canonical))
+                else:
+                    renamed = merges.get(canonical, canonical)
+                if renamed != canonical:
+                    self.entries[key] = renamed
+                    self._dirty[key] = renamed
+
+    async def flush(self, conn: asyncpg.Connection):
+        """Write the answers collected since the last flush."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        if not self.use_table:
+            self._save_file()
+            return
+
+        raw_keys: List[str] = [key[0] for key in dirty]
+        categories: List[str] = [key[1] for key in dirty]
+        canonicals: List[str] = [json.dumps(value) for value in dirty.values()]
+        try:
+            await conn.execute("""
+                INSERT INTO skill_normalization_cache (raw_key, category, canonical)
+                SELECT u.raw_key, u.category, u.canonical::jsonb
+                FROM unnest($1::text[], $2::text[], $3::text[]) AS u(raw_key, category, canonical)
+                ON CONFLICT (raw_key, category)
+                DO UPDATE SET canonical = EXCLUDED.canonical, updated_at = CURRENT_TIMESTAMP
+            """, raw_keys, categories, canonicals)
+        except Exception as e:
+            logging.error(f"❌ Could not write {len(dirty)} normalizations to the cache: {e}")
+            with self._lock:
+                for key, value in dirty.items():
+                    self._dirty.setdefault(key, value)
+
+    def _save_file(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+            with self._lock:
+                data = [{'raw_key': k[0], 'category': k[1], 'canonical': v} for k, v in self.entries.items()]
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save normalization cache to {self.path}: {e}")
+
+    def log_summary(self):
+        """Log the hit rate of this run."""
+        lookups = self.hits + self.misses
+        if lookups:
+            logging.info(f"🗃️ Normalization cache: {self.hits}/{lookups} hits ({self.hits / lookups:.0%}), "
+                         f"{len(self.entries)} entries.")
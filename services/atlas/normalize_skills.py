@@ -18,11 +18,14 @@ import logging
 import sys
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 import re
 from dotenv import load_dotenv
 import boto3
+from botocore.config import Config
 
 # Load environment variables
 env_path = Path(__file__).parent.parent.parent / '.env'
@@ -32,6 +35,8 @@ load_dotenv(dotenv_path=env_path)
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scout.db import get_database_dsn
+from atlas.normalization_cache import NormalizationCache
+from atlas.canonical_index import CanonicalIndex
 
 # Configure logging
 logging.basicConfig(
@@ -64,8 +69,29 @@ _HARDCODED_RULES: Dict[str, str] = {
     "episerver": "Optimizely CMS",
     "zarządzanie": "Management",
     "lamp": "LAMP",
+    # Not a variant of "Angular" (keeps the local pre-matcher from folding it in)
+    "angularjs": "AngularJS",
 }
 
+# Skills per model call, model calls in flight at once, and the cap on model
+# calls per run (prevents runaway costs)
+NORMALIZE_BATCH_SIZE = 50
+NORMALIZE_CONCURRENCY = int(os.getenv('ATLAS_CONCURRENCY', '4'))
+MAX_ITERATIONS = 200
+
+# Unanswered attempts before a skill is skipped for the rest of the run, and the
+# pause after a round without any answer (doubled per such round, up to the max)
+MAX_SKILL_FAILURES = 3
+RETRY_BACKOFF_SECONDS = 5
+RETRY_BACKOFF_MAX_SECONDS = 60
+
+# Incremental stages re-read offers changed this long before their watermark,
+# so scraper transactions that committed late are not missed (re-reading is harmless)
+WATERMARK_OVERLAP_MINUTES = 15
+
+# (job_url, raw skill) pairs per COPY while linking
+LINK_COPY_CHUNK = 10000
+
 
 def parse_tech_stack(tech_stack: str) -> List[str]:
     """Parse a tech stack string into a list of raw skills."""
@@ -103,42 +129,91 @@ def parse_tech_stack(tech_stack: str) -> List[str]:
 
 async def init_tables(conn: asyncpg.Connection):
     """Initialize necessary tables."""
-    # Ensure offer_skills exists
+    # Ensure offer_skills, the normalization cache and the stage watermarks exist
     project_root = Path(__file__).resolve().parent.parent.parent
-    schema_path = project_root / "backend" / "sql" / "tables" / "offer_skills.sql"
-    if schema_path.exists():
-        await conn.execute(schema_path.read_text())
+    for table in ("offer_skills.sql", "skill_normalization_cache.sql", "normalization_state.sql"):
+        schema_path = project_root / "backend" / "sql" / "tables" / table
+        if schema_path.exists():
+            await conn.execute(schema_path.read_text())
     
     # Ensure skills table has necessary columns/constraints (handled by schema)
     logging.info("✅ Tables initialized.")
 
-async def extract_distinct_skills(conn: asyncpg.Connection):
-    """
-    Step 1 & 2: Extract distinct skills from ALL offers and insert into skills table.
-    We parse the JSON-like 'tech_stack' array from offers.
-    """
-    logging.info("🔍 Extracting distinct skills from offers...")
-    
-    # Fetch all offers with tech_stack
-    query = """
+async def get_watermark(conn: asyncpg.Connection, stage: str) -> Optional[datetime]:
+    """Start time of the stage's last successful incremental run, or None (never run, or table missing)."""
+    try:
+        return await conn.fetchval("SELECT watermark FROM normalization_state WHERE stage = $1", stage)
+    except asyncpg.exceptions.UndefinedTableError:
+        logging.warning("⚠️ normalization_state table missing (migration 015), processing all offers.")
+        return None
+
+async def set_watermark(conn: asyncpg.Connection, stage: str, watermark: datetime):
+    """Record a successful run of the stage that started at `watermark`."""
+    try:
+        await conn.execute("""
+            INSERT INTO normalization_state (stage, watermark)
+            VALUES ($1, $2)
+            ON CONFLICT (stage) DO UPDATE SET watermark = EXCLUDED.watermark, updated_at = CURRENT_TIMESTAMP
+        """, stage, watermark)
+    except asyncpg.exceptions.UndefinedTableError:
+        pass
+
+async def fetch_offer_stacks(conn: asyncpg.Connection, since: Optional[datetime] = None) -> List[asyncpg.Record]:
+    """(job_url, tech_stack, category) of all offers, or only those changed after `since` (minus the overlap)."""
+    if since is None:
+        return await conn.fetch("""
+            SELECT job_url, tech_stack, category
+            FROM offers
+            WHERE tech_stack IS NOT NULL
+        """)
+    return await conn.fetch("""
         SELECT job_url, tech_stack, category
-        FROM offers 
+        FROM offers
         WHERE tech_stack IS NOT NULL
+          AND updated_at > $1::timestamp - make_interval(mins => $2)
+    """, since, WATERMARK_OVERLAP_MINUTES)
+
+async def insert_raw_skills(conn: asyncpg.Connection, skill_category_map: Dict[str, str]) -> int:
     """
-    rows = await conn.fetch(query)
-    
-    new_skills_count = 0
-    
-    # Use a set to track (skill, category) uniqueness in memory before DB insert
-    # normalizing raw skill to lowercase for deduplication might be good, 
-    # but let's keep original casing for now and rely on DB generic uniqueness if any.
-    # Actually, the skills table has unique constraint on `original_skill_name`.
-    # We should probably combine category? No, skill name should be unique globally? 
-    # "Python" in Data vs "Python" in Backend is the same skill.
-    # "Go" in Backend vs "Go" (game) - rare conflict.
-    # Let's stick to unique `original_skill_name`.
+    Insert raw skill names not yet in `skills` (normalized or not) as pending rows, in one statement.
+    Existing names are skipped so they don't get redundant NULL rows that would trigger AI calls.
+
+    Returns:
+        int: Number of new raw skills
+    """
+    if not skill_category_map:
+        return 0
+    inserted = await conn.execute("""
+        INSERT INTO skills (original_skill_name, category)
+        SELECT u.name, u.category
+        FROM unnest($1::text[], $2::text[]) AS u(name, category)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM skills s WHERE s.original_skill_name = u.name
+        )
+        ON CONFLICT (original_skill_name) WHERE canonical_skill_name IS NULL DO NOTHING
+    """, list(skill_category_map), list(skill_category_map.values()))
+    return int(inserted.split()[-1])
+
+async def extract_distinct_skills(conn: asyncpg.Connection, incremental: bool = False):
+    """
+    Step 1 & 2: Extract distinct skills from offers and insert new ones into skills table.
+    We parse the JSON-like 'tech_stack' array from offers.
+    With `incremental`, only offers changed since the last successful extract are read
+    (all offers when there is no watermark yet).
+    """
+    started = await conn.fetchval("SELECT LOCALTIMESTAMP")
+    since = await get_watermark(conn, 'extract') if incremental else None
+    if since is not None:
+        logging.info(f"🔍 Extracting skills from offers changed since {since:%Y-%m-%d %H:%M}...")
+    else:
+        logging.info("🔍 Extracting distinct skills from all offers...")
+
+    rows = await fetch_offer_stacks(conn, since)
+    logging.info(f"👉 Read {len(rows)} offers.")
     
-    # We collect all raw skills first
+    # The skills table has a unique `original_skill_name` per pending row.
+    # "Python" in Data vs "Python" in Backend is the same skill, so raw names
+    # are unique globally; the category is only kept as context for the AI.
     distinct_skills = set()
     skill_category_map = {} # Keep one category sample for context
     
@@ -162,48 +237,51 @@ async def extract_distinct_skills(conn: asyncpg.Connection):
 
     logging.info(f"👉 Found {len(distinct_skills)} distinct raw skills.")
     
-    # Bulk insert — skip any original_skill_name that already exists in
-    # the skills table (whether normalised or not) to avoid creating
-    # redundant NULL rows that would trigger unnecessary AI calls.
-    insert_query = """
-        INSERT INTO skills (original_skill_name, category)
-        SELECT $1, $2
-        WHERE NOT EXISTS (
-            SELECT 1 FROM skills WHERE original_skill_name = $1
-        )
-    """
-    
-    # Prepare batch
-    batch_data = [(s, skill_category_map.get(s)) for s in distinct_skills]
-    
     try:
-        await conn.executemany(insert_query, batch_data)
-        logging.info("✅ Distinct skills populated in DB.")
+        new_skills_count = await insert_raw_skills(conn, skill_category_map)
+        logging.info(f"✅ Distinct skills populated in DB ({new_skills_count} new).")
+        await set_watermark(conn, 'extract', started)
     except Exception as e:
         logging.error(f"❌ Failed to insert skills: {e}")
         
     return distinct_skills, skill_category_map
 
-async def get_unnormalized_skills(conn: asyncpg.Connection, limit: int = 50) -> List[Dict]:
-    """Fetch skills that don't have a canonical name yet."""
+async def get_unnormalized_skills(conn: asyncpg.Connection, limit: int = 50, exclude: Set[str] = frozenset()) -> List[Dict]:
+    """Fetch skills that don't have a canonical name yet (skipping the `exclude` names)."""
     query = """
         SELECT original_skill_name, category
         FROM skills
         WHERE canonical_skill_name IS NULL
+          AND NOT (original_skill_name = ANY($2::text[]))
         ORDER BY original_skill_name ASC
         LIMIT $1
     """
-    rows = await conn.fetch(query, limit)
+    rows = await conn.fetch(query, limit, list(exclude))
     return [dict(row) for row in rows]
 
-def normalize_batch_with_ai(skills_data: List[Dict], bedrock_client) -> Dict[str, object]:
+def normalize_batch_with_ai(skills_data: List[Dict], bedrock_client, cache: Optional[NormalizationCache] = None,
+                            index: Optional[CanonicalIndex] = None) -> Dict[str, object]:
     """
     Step 3: Normalize a batch of skills using Bedrock.
+    Skills already answered in an earlier run are taken from `cache`, and
+    new answers are added to it. Trivial variants of existing canonical names
+    are resolved locally by `index`; only the rest is sent to the model.
     Returns: { "raw_skill": "Canonical Name" }
             OR { "raw_skill": ["Name1", "Name2", ...] }  (when AI splits a multi-skill string)
     """
+    return normalize_batch(skills_data, bedrock_client, cache, index)[0]
+
+def normalize_batch(skills_data: List[Dict], bedrock_client, cache: Optional[NormalizationCache] = None,
+                    index: Optional[CanonicalIndex] = None) -> Tuple[Dict[str, object], Dict[str, object], bool]:
+    """
+    `normalize_batch_with_ai`, also reporting what the model itself did.
+
+    Returns:
+        Tuple: The mapping, the answers the model returned (without the identity
+        fallback for keys it dropped), and whether the model was called at all
+    """
     if not skills_data:
-        return {}
+        return {}, {}, False
 
     # Apply hardcoded rules first — these bypass AI entirely.
     result: Dict[str, object] = {}
@@ -214,11 +292,27 @@ def normalize_batch_with_ai(skills_data: List[Dict], bedrock_client) -> Dict[str
         if canonical is not None:
             logging.info(f"📌 Hardcoded rule applied: '{raw}' -> '{canonical}'")
             result[raw] = canonical
+            continue
+        canonical = cache.get(raw, skill['category']) if cache is not None else None
+        if canonical is not None:
+            result[raw] = canonical
         else:
             remaining.append(skill)
 
+    if remaining and index is not None:
+        ambiguous = []
+        for skill in remaining:
+            canonical = index.match(skill['original_skill_name'])
+            if canonical is not None:
+                logging.debug(f"🎯 Matched locally: '{skill['original_skill_name']}' -> '{canonical}'")
+                result[skill['original_skill_name']] = canonical
+            else:
+                ambiguous.append(skill)
+        index.record(len(remaining) - len(ambiguous), prompt_skipped=not ambiguous)
+        remaining = ambiguous
+
     if not remaining:
-        return result
+        return result, {}, False
 
     # Input map: Raw -> Category (Context)
     input_map = {s['original_skill_name']: s['category'] for s in remaining}
@@ -296,13 +390,19 @@ Input:
                     logging.info("✅ Successfully repaired truncated JSON.")
                 except json.JSONDecodeError:
                     logging.error(f"❌ Could not repair JSON: {e}")
-                    return {}
+                    return result, {}, True
             else:
                 logging.error(f"❌ JSON is too mangled: {e}")
-                return {}
+                return result, {}, True
         
-        input_keys = {s['original_skill_name'] for s in skills_data}
+        input_keys = {s['original_skill_name'] for s in remaining}
         missing = input_keys - set(result_map.keys())
+        model_answers = {raw: canonical for raw, canonical in result_map.items() if raw in input_keys}
+
+        if cache is not None:
+            for s in remaining:
+                if s['original_skill_name'] in result_map:
+                    cache.put(s['original_skill_name'], s['category'], result_map[s['original_skill_name']])
 
         if missing:
             logging.warning(f"⚠️ Key Mismatch: AI altered {len(missing)} key(s). Falling back to identity. Missing: {missing}")
@@ -310,11 +410,11 @@ Input:
                 result_map[m_key] = m_key
             
         result.update(result_map)
-        return result
+        return result, model_answers, True
 
     except Exception as e:
         logging.error(f"❌ AI Normalization failed: {e}")
-        return result
+        return result, {}, True
 
 async def update_canonical_names(conn: asyncpg.Connection, mapping: Dict[str, object]):
     """
@@ -405,10 +505,98 @@ async def update_canonical_names(conn: asyncpg.Connection, mapping: Dict[str, ob
         else:
             logging.info("✅ No new extra canonical rows to insert.")
 
-async def deduplicate_canonical_skills(conn: asyncpg.Connection, bedrock_client):
+async def normalize_pending_skills(conn: asyncpg.Connection, bedrock_client, cache: Optional[NormalizationCache] = None,
+                                   index: Optional[CanonicalIndex] = None) -> int:
+    """
+    Steps 3 & 4: Normalize all pending skills with concurrent model calls.
+
+    Each round claims up to NORMALIZE_CONCURRENCY disjoint batches of
+    NORMALIZE_BATCH_SIZE skills and runs their (blocking) Bedrock calls on a
+    thread pool of the same size. Results are written as soon as each call
+    returns, one at a time on the single connection, while the other calls
+    are still in flight. Only batches that actually call the model count
+    towards MAX_ITERATIONS. A skill the model failed to answer is claimed
+    again in a later round, and skipped for the rest of the run after
+    MAX_SKILL_FAILURES failures. A round without any answer (e.g. Bedrock
+    unavailable) is followed by an exponential backoff; the run only stops
+    once every remaining skill has been skipped. New answers are written to `cache` after each call, and
+    canonical names returned by the model are added to `index`.
+
+    Returns:
+        int: Number of skills normalized
+    """
+    loop = asyncio.get_running_loop()
+    concurrency = max(1, NORMALIZE_CONCURRENCY)
+    normalized_count = 0
+    calls = 0
+    failures: Dict[str, int] = {}
+    skipped: Set[str] = set()
+    empty_rounds = 0
+
+    async def run_batch(batch: List[Dict]):
+        return batch, await loop.run_in_executor(executor, normalize_batch, batch, bedrock_client, cache, index)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bedrock") as executor:
+        while True:
+            if calls >= MAX_ITERATIONS:
+                logging.error(f"🛑 Normalization hit the limit of {MAX_ITERATIONS} model calls. "
+                              f"Stopping to prevent runaway costs.")
+                break
+
+            # Every batch of the round may need a model call; never exceed the limit
+            rounds = min(concurrency, MAX_ITERATIONS - calls)
+            pending = await get_unnormalized_skills(conn, limit=rounds * NORMALIZE_BATCH_SIZE, exclude=skipped)
+            if not pending:
+                logging.info("No more un-normalized skills.")
+                break
+
+            batches = [pending[i:i + NORMALIZE_BATCH_SIZE] for i in range(0, len(pending), NORMALIZE_BATCH_SIZE)]
+            logging.info(f"Normalizing {len(pending)} skills in {len(batches)} parallel batches... "
+                         f"({calls}/{MAX_ITERATIONS} model calls so far)")
+
+            round_count = 0
+            for task in asyncio.as_completed([run_batch(batch) for batch in batches]):
+                batch, (normalized_map, model_answers, model_called) = await task
+                calls += int(model_called)
+                if cache is not None:
+                    await cache.flush(conn)
+                if normalized_map:
+                    await update_canonical_names(conn, normalized_map)
+                    round_count += len(normalized_map)
+                if index is not None and model_answers:
+                    index.add(name for value in model_answers.values()
+                              for name in (value if isinstance(value, list) else [value]))
+                for skill in batch:
+                    raw = skill['original_skill_name']
+                    if not normalized_map.get(raw):
+                        failures[raw] = failures.get(raw, 0) + 1
+                        if failures[raw] >= MAX_SKILL_FAILURES:
+                            skipped.add(raw)
+
+            normalized_count += round_count
+            if round_count:
+                empty_rounds = 0
+                continue
+            empty_rounds += 1
+            if all(skill['original_skill_name'] in skipped for skill in pending):
+                continue
+            delay = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** (empty_rounds - 1))
+            logging.warning(f"Empty response from AI for every batch, retrying in {delay} s "
+                            f"({len(skipped)} skills skipped after {MAX_SKILL_FAILURES} failures).")
+            await asyncio.sleep(delay)
+
+    if cache is not None:
+        cache.log_summary()
+    if index is not None and index.matched:
+        logging.info(f"🎯 Resolved {index.matched} skills against existing canonical names without the model "
+                     f"(~{index.matched / NORMALIZE_BATCH_SIZE:.1f} model calls' worth, {index.prompts_skipped} calls skipped entirely).")
+    return normalized_count
+
+async def deduplicate_canonical_skills(conn: asyncpg.Connection, bedrock_client, cache: Optional[NormalizationCache] = None):
     """
     Step 5: Semantic Deduplication.
     Clusters canonical names to merge synonyms (e.g. "AI assistants" -> "AI Code Assistants").
+    Merges are applied to `cache` too, so cached answers don't bring the merged names back.
     """
     logging.info("🧠 Starting Semantic Deduplication...")
     
@@ -467,6 +655,9 @@ async def deduplicate_canonical_skills(conn: asyncpg.Connection, bedrock_client)
                 await conn.execute("DELETE FROM skills WHERE canonical_skill_name = $1", str(old_canon))
             except Exception as e:
                 logging.error(f"Error in pre-deduplication '{old_canon}' -> '{new_canon}': {e}")
+        if cache is not None:
+            cache.rename(pre_updates)
+            await cache.flush(conn)
                 
         # Re-fetch the updated list of canonicals after programmatic merge
         rows = await conn.fetch("""
@@ -575,6 +766,9 @@ Example Output:
                 """, old_canon)
             except Exception as e:
                 logging.error(f"❌ Error merging '{old_canon}' into '{new_canon}': {e}")
+        if cache is not None:
+            cache.rename(updates)
+            await cache.flush(conn)
 
         logging.info("✅ Semantic deduplication applied.")
 
@@ -605,60 +799,122 @@ async def detect_and_report_collisions(conn: asyncpg.Connection) -> int:
     return len(rows)
 
 
-async def link_offers_to_skills(conn: asyncpg.Connection):
+async def link_offers_to_skills(conn: asyncpg.Connection, incremental: bool = False):
     """
     Step 4: Link offers to skills based on text match.
     One original_skill_name may map to MULTIPLE skill rows (multi-canonical),
     so we link the offer to ALL of them.
-    """
-    logging.info("🔗 Linking offers to skills...")
-
-    # Build skill_map: original_skill_name -> list of UUIDs
-    # (one raw string may have been split into several canonical rows)
-    from collections import defaultdict
-    skill_rows = await conn.fetch("SELECT original_skill_name, uuid FROM skills")
-    skill_map: Dict[str, List] = defaultdict(list)
-    for row in skill_rows:
-        skill_map[row['original_skill_name']].append(row['uuid'])
-
-    logging.info(f"Loaded {len(skill_map)} distinct raw skills for linking.")
 
-    query = "SELECT job_url, tech_stack FROM offers WHERE tech_stack IS NOT NULL"
+    (job_url, raw skill) pairs are COPYed into a temporary table and joined
+    to `skills` in one INSERT. With `incremental`, only offers changed since
+    the last successful link (or without any link yet) are parsed, and skill
+    rows created since then (extra names of split skills) are linked to the
+    offers already linked to the same raw name - so linking time follows the
+    new data, not the size of `offers`.
+    """
+    started = await conn.fetchval("SELECT LOCALTIMESTAMP")
+    since = await get_watermark(conn, 'link') if incremental else None
+    if since is not None:
+        logging.info(f"🔗 Linking offers changed since {since:%Y-%m-%d %H:%M} to skills...")
+        query = """
+            SELECT o.job_url, o.tech_stack
+            FROM offers o
+            WHERE o.tech_stack IS NOT NULL
+              AND (o.updated_at > $1::timestamp - make_interval(mins => $2)
+                   OR NOT EXISTS (SELECT 1 FROM offer_skills os WHERE os.job_url = o.job_url))
+        """
+        args = (since, WATERMARK_OVERLAP_MINUTES)
+    else:
+        logging.info("🔗 Linking all offers to skills...")
+        query = "SELECT job_url, tech_stack FROM offers WHERE tech_stack IS NOT NULL"
+        args = ()
 
+    offers_count = 0
+    pairs_count = 0
     async with conn.transaction():
-        async for row in conn.cursor(query):
-            job_url = row['job_url']
-            tech_stack = row['tech_stack']
+        await conn.execute("CREATE TEMP TABLE offer_raw_skills (job_url TEXT, raw_skill TEXT) ON COMMIT DROP")
 
-            # Parse stack
+        pairs: List[Tuple[str, str]] = []
+        async for row in conn.cursor(query, *args):
+            offers_count += 1
             try:
-                if isinstance(tech_stack, str):
-                    skills_list = parse_tech_stack(tech_stack)
-                elif isinstance(tech_stack, list):
-                    skills_list = [str(s) for s in tech_stack]
-                else:
-                    skills_list = []
+                skills_list = parse_tech_stack(str(row['tech_stack']))
             except Exception:
                 skills_list = []
+            pairs.extend((row['job_url'], s.strip()) for s in skills_list if s.strip())
+            if len(pairs) >= LINK_COPY_CHUNK:
+                await conn.copy_records_to_table('offer_raw_skills', records=pairs, columns=['job_url', 'raw_skill'])
+                pairs_count += len(pairs)
+                pairs = []
+        if pairs:
+            await conn.copy_records_to_table('offer_raw_skills', records=pairs, columns=['job_url', 'raw_skill'])
+            pairs_count += len(pairs)
+        await conn.execute("ANALYZE offer_raw_skills")
+
+        linked = await conn.execute("""
+            INSERT INTO offer_skills (job_url, skill_id)
+            SELECT DISTINCT t.job_url, s.uuid
+            FROM offer_raw_skills t
+            JOIN skills s ON s.original_skill_name = t.raw_skill
+            ON CONFLICT (job_url, skill_id) DO NOTHING
+        """)
+        links_count = int(linked.split()[-1])
+
+        if since is not None:
+            extra = await conn.execute("""
+                INSERT INTO offer_skills (job_url, skill_id)
+                SELECT DISTINCT os.job_url, n.uuid
+                FROM skills n
+                JOIN skills s ON s.original_skill_name = n.original_skill_name AND s.uuid <> n.uuid
+                JOIN offer_skills os ON os.skill_id = s.uuid
+                WHERE n.created_at > $1::timestamp - make_interval(mins => $2)
+                ON CONFLICT (job_url, skill_id) DO NOTHING
+            """, since, WATERMARK_OVERLAP_MINUTES)
+            links_count += int(extra.split()[-1])
+
+    await set_watermark(conn, 'link', started)
+    logging.info(f"✅ Linking completed: {offers_count} offers, {pairs_count} raw skills, {links_count} new links.")
+
+async def ingest_offer_skills(conn: asyncpg.Connection, offers: List[Tuple[str, str, str]]) -> Tuple[int, int]:
+    """
+    Incremental extract + link for a handful of freshly scraped offers.
 
-            # Link offer to ALL canonical rows for each raw skill
-            to_link = []
-            for s in skills_list:
-                s_clean = s.strip() if isinstance(s, str) else str(s)
-                for uid in skill_map.get(s_clean, []):
-                    to_link.append((job_url, uid))
+    Used by Scout's streaming pipeline: new raw skills are inserted as pending
+    rows (normalized by the next `normalize` run, which keeps their uuid) and
+    the offers are linked to every skill row of their raw skills right away.
 
-            if to_link:
-                try:
-                    await conn.executemany("""
-                        INSERT INTO offer_skills (job_url, skill_id)
-                        VALUES ($1, $2::uuid)
-                        ON CONFLICT (job_url, skill_id) DO NOTHING
-                    """, to_link)
-                except Exception as e:
-                    logging.error(f"Link error {job_url}: {e}")
-                     
-    logging.info("✅ Linking completed.")
+    Args:
+        conn: Database connection
+        offers: (job_url, tech_stack, category) tuples
+
+    Returns:
+        Tuple[int, int]: New raw skills inserted and offer_skills links created
+    """
+    job_urls, names = [], []
+    skill_category_map = {}
+    for job_url, tech_stack, category in offers:
+        for skill in parse_tech_stack(str(tech_stack)) if tech_stack else []:
+            skill_clean = str(skill).strip()
+            if not skill_clean or len(skill_clean) >= 100:
+                continue
+            job_urls.append(job_url)
+            names.append(skill_clean)
+            skill_category_map.setdefault(skill_clean, category)
+
+    if not names:
+        return 0, 0
+
+    async with conn.transaction():
+        inserted = await insert_raw_skills(conn, skill_category_map)
+        linked = await conn.execute("""
+            INSERT INTO offer_skills (job_url, skill_id)
+            SELECT DISTINCT u.job_url, s.uuid
+            FROM unnest($1::text[], $2::text[]) AS u(job_url, name)
+            JOIN skills s ON s.original_skill_name = u.name
+            ON CONFLICT (job_url, skill_id) DO NOTHING
+        """, job_urls, names)
+
+    return inserted, int(linked.split()[-1])
 
 async def clear_skills_tables(conn: asyncpg.Connection):
     """Clear offer_skills and skills, but preserve user_skills.
@@ -685,7 +941,12 @@ async def clear_all_tables(conn: asyncpg.Connection):
     logging.info("✅ All skill-related tables cleared (including user_skills).")
 
 
-async def run_normalization_process(stage: str = 'all', clear_first: bool = False, clear_all: bool = False):
+async def run_normalization_process(stage: str = 'all', clear_first: bool = False, clear_all: bool = False, full: bool = False):
+    """
+    Run the pipeline (or one stage of it).
+    Extraction and linking are incremental unless `full` is set or the skills tables were just cleared.
+    """
+    incremental = not (full or clear_first or clear_all)
     dsn = get_database_dsn()
     conn = await asyncpg.connect(dsn=dsn)
     
@@ -695,55 +956,46 @@ async def run_normalization_process(stage: str = 'all', clear_first: bool = Fals
         elif clear_first:
             await clear_skills_tables(conn)
 
-        bedrock = boto3.client('bedrock-runtime', region_name=os.getenv('AWS_REGION', 'eu-central-1'))
+        # boto3 clients are thread-safe; size the HTTP pool for the parallel calls and back off adaptively on throttling
+        bedrock = boto3.client(
+            'bedrock-runtime',
+            region_name=os.getenv('AWS_REGION', 'eu-central-1'),
+            config=Config(max_pool_connections=max(10, NORMALIZE_CONCURRENCY), retries={'mode': 'adaptive', 'max_attempts': 6}),
+        )
 
         if stage in ['all', 'extract']:
             # 1. Extract Distinct (only if not skipping)
             await init_tables(conn)
-            await extract_distinct_skills(conn)
+            await extract_distinct_skills(conn, incremental=incremental)
+
+        cache = NormalizationCache()
+        if stage in ['all', 'normalize', 'deduplicate']:
+            await cache.load(conn)
 
         normalized_count = 0
         if stage in ['all', 'normalize']:
-            # 2 & 3. Normalize Loop
-            MAX_ITERATIONS = 200
-            iteration = 0
-            while iteration < MAX_ITERATIONS:
-                batch = await get_unnormalized_skills(conn, limit=50)
-                if not batch:
-                    logging.info("No more un-normalized skills.")
-                    break
-                
-                iteration += 1
-                logging.info(f"Normalizing batch of {len(batch)} skills... (iteration {iteration}/{MAX_ITERATIONS})")
-                normalized_map = normalize_batch_with_ai(batch, bedrock)
-                
-                if normalized_map:
-                    await update_canonical_names(conn, normalized_map)
-                    normalized_count += len(normalized_map)
-                else:
-                    logging.warning("Empty response from AI, stopping or skipping.")
-                    break
-            else:
-                logging.error(f"🛑 Normalization loop hit {MAX_ITERATIONS} iteration limit. "
-                              f"Stopping to prevent runaway costs.")
+            # 2 & 3. Normalize (concurrent batches; cached answers and local matches first)
+            rows = await conn.fetch("SELECT DISTINCT canonical_skill_name FROM skills WHERE canonical_skill_name IS NOT NULL")
+            index = CanonicalIndex(r['canonical_skill_name'] for r in rows)
+            normalized_count = await normalize_pending_skills(conn, bedrock, cache, index)
 
         if stage in ['all', 'deduplicate']:
             if stage == 'deduplicate' or normalized_count > 0:
-                await deduplicate_canonical_skills(conn, bedrock)
+                await deduplicate_canonical_skills(conn, bedrock, cache)
                 await detect_and_report_collisions(conn)
             else:
                 logging.info("No new skills normalized — skipping deduplication.")
                  
         if stage in ['all', 'link']:
             # 4. Link
-            await link_offers_to_skills(conn)
+            await link_offers_to_skills(conn, incremental=incremental)
         
     finally:
         await conn.close()
 
-def main(stage: str = 'all', clear_first: bool = False, clear_all: bool = False):
+def main(stage: str = 'all', clear_first: bool = False, clear_all: bool = False, full: bool = False):
     import asyncio
-    asyncio.run(run_normalization_process(stage=stage, clear_first=clear_first, clear_all=clear_all))
+    asyncio.run(run_normalization_process(stage=stage, clear_first=clear_first, clear_all=clear_all, full=full))
 
 if __name__ == "__main__":
     import argparse
@@ -751,6 +1003,7 @@ if __name__ == "__main__":
     parser.add_argument('stage', nargs='?', default='all', help='Stage to run')
     parser.add_argument('--clear', action='store_true', help='Clear offer_skills + unreferenced skills (safe)')
     parser.add_argument('--clear-all', action='store_true', help='DEV ONLY: Full destructive reset including user_skills')
+    parser.add_argument('--full', action='store_true', help='Re-read all offers instead of those changed since the last run')
     args = parser.parse_args()
     
-    main(stage=args.stage, clear_first=args.clear, clear_all=args.clear_all)
+    main(stage=args.stage, clear_first=args.clear, clear_all=args.clear_all, full=args.full)
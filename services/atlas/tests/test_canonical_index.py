@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from atlas.canonical_index import CanonicalIndex, bounded_edit_distance  # noqa: E402
+
+CANONICALS = [
+    "Angular", "Elasticsearch", "Flask", "Go", "Java", "JavaScript", "Kubernetes", "Maven",
+    "MySQL", "Node.js", "PostgreSQL", "Python 3", "React", "Spring", "Three", "TypeScript", "Vue.js",
+]
+
+
+@pytest.fixture
+def index():
+    return CanonicalIndex(CANONICALS)
+
+
+@pytest.mark.parametrize("raw, canonical", [
+    ("NodeJS", "Node.js"),
+    ("node.js", "Node.js"),
+    ("Node JS", "Node.js"),
+    ("react", "React"),
+    ("ReactJS", "React"),
+    ("react.js", "React"),
+    ("Vue", "Vue.js"),
+    ("Postgres", "PostgreSQL"),
+    ("golang", "Go"),
+    ("Kubernets", "Kubernetes"),
+    ("Typescrpt", "TypeScript"),
+    ("Elasticserch", "Elasticsearch"),
+])
+def test_trivial_variants_match_locally(index, raw, canonical):
+    assert index.match(raw) == canonical
+
+
+@pytest.mark.parametrize("raw", [
+    # One edit apart, but different tools
+    "MSSQL", "Flash", "String", "Raven",
+    # A "js" suffix makes a different library
+    "GoJS", "ThreeJS", "java js", "AngularJS",
+    # Digits must agree
+    "Python 2",
+    # Too far, or too short to tell
+    "Postgress", "C", "Jav",
+])
+def test_ambiguous_skills_are_left_to_the_model(index, raw):
+    assert index.match(raw) is None
+
+
+def test_tied_candidates_are_ambiguous():
+    index = CanonicalIndex(["Terraforms", "Terraformx"])
+    assert index.match("Terraform") is None
+
+
+def test_added_canonicals_are_matched():
+    index = CanonicalIndex()
+    assert index.match("Kubernets") is None
+    index.add(["Kubernetes"])
+    assert index.match("Kubernets") == "Kubernetes"
+
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("kubernets", "kubernetes", 1) == 1
+    assert bounded_edit_distance("terrafrom", "terraform", 1) is None
+    assert bounded_edit_distance("same", "same", 0) == 0
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Enables running the Scout package as a script:
-    python -m scout
+    python -m scout [--resume] [--processes N] [--queue collect|work]
+    python -m scout backfill [--limit N | --salaries]
     or
     python scout/__main__.py
 """
@@ -11,9 +12,9 @@ import asyncio, os, sys
 if __package__ is None:
     pkg_root = os.path.dirname(os.path.dirname(__file__))
     sys.path.insert(0, pkg_root)
-    from scout.cli import main
+    from scout.cli import run, parse_args
 else:
-    from .cli import main
+    from .cli import run, parse_args
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(run(parse_args()))
\ No newline at end of file
@@ -0,0 +1,184 @@
+# backfill.py
+"""
+Backfill of offers with missing fields (`scout backfill`).
+
+Re-opens offers whose category, company, location, work schedule,
+experience, employment type or operating mode is missing (or whose location
+equals the category) and fills the gaps. Offers go through the same fetch and
+extraction code as a scrape (HTTP fast path first, then Playwright) on
+`MAX_CONCURRENT_PAGES` pages paced by the rate controller. Found values are
+merged with the stored offers and applied in bulk with
+`UPDATE ... FROM unnest(...)`, together with the recomputed `content_hash`
+and typed salary columns, `BACKFILL_BATCH_SIZE` offers per statement.
+
+`scout backfill --salaries` instead parses the stored salary text of offers
+saved before the typed salary columns existed (no browser involved).
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from playwright.async_api import Page
+
+from .config import ScrapingConfig
+from .db import init_db_connection, check_connection, reconnect_db, fetch_incomplete_offers, update_offer_fields, backfill_salary_columns
+from .http_fetch import OfferFetcher
+from .metrics import METRICS
+from .navigation import NavigationProfile
+from .rate_control import RateController
+from .scrape_core import init_browser, scrape_offer, fetch_offer, requeue_throttled
+
+# Columns the backfill fills in
+BACKFILL_FIELDS = ("company", "category", "location", "work_schedule", "experience", "employment_type", "operating_mode")
+
+
+async def backfill_offers(page: Page, conn, offer_urls: list[str], profile: Optional[NavigationProfile] = None,
+                          fetcher: Optional[OfferFetcher] = None) -> dict:
+    """
+    Scrape offers concurrently and bulk-update their missing fields.
+
+    Args:
+        page: Playwright page object (its context hosts the extra pages)
+        conn: Database connection
+        offer_urls: Offers to backfill
+        profile: Fast navigation profile (optional, must already be attached to the page's context)
+        fetcher: HTTP fast-path fetcher (optional)
+
+    Returns:
+        dict: Counts of `updated`, `empty` (nothing found) and `failed` offers
+    """
+    total = len(offer_urls)
+    concurrency = max(1, ScrapingConfig.MAX_CONCURRENT_PAGES)
+    rate = RateController(max_concurrency=concurrency, name="backfill")
+    context = page.context
+    original_conn = conn
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, href in enumerate(offer_urls, 1):
+        queue.put_nowait((i, href))
+
+    pending: list[dict] = []
+    db_lock = asyncio.Lock()
+    stats = {"updated": 0, "empty": 0, "failed": 0}
+    throttle_retries: dict[str, int] = {}
+
+    async def flush():
+        nonlocal conn
+        if not pending:
+            return
+        batch = pending[:]
+        pending.clear()
+        async with db_lock:
+            for attempt in (1, 2):
+                try:
+                    if not await check_connection(conn):
+                        logging.warning("⚠️ Database connection lost, attempting to reconnect...")
+                        conn = await reconnect_db()
+                    stats["updated"] += await update_offer_fields(conn, batch, BACKFILL_FIELDS)
+                    logging.info(f"💾 Backfilled batch of {len(batch)} offers ({stats['updated']} changed so far)")
+                    return
+                except Exception as e:
+                    logging.error(f"❌ Backfill update of {len(batch)} offers failed (attempt {attempt}/2): {e}")
+            stats["failed"] += len(batch)
+
+    async def worker(worker_page: Page):
+        while True:
+            try:
+                i, href = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                async with rate.track() as request:
+                    logging.info(f"🔄 Backfilling offer {i}/{total}: {href}")
+                    offer_data = await fetch_offer(fetcher, href) if fetcher is not None else None
+                    if offer_data is not None:
+                        request.path = "http"
+                    else:
+                        if worker_page.is_closed():
+                            worker_page = await context.new_page()
+                        offer_data = await scrape_offer(worker_page, href, profile)
+            except Exception as e:
+                if not requeue_throttled(queue, throttle_retries, (i, href), e):
+                    stats["failed"] += 1
+                    METRICS.inc("offer_failures_total", error=type(e).__name__)
+                    logging.error(f"Error backfilling job offer {href}: {e}")
+                continue
+
+            fields = {field: offer_data.get(field) for field in BACKFILL_FIELDS}
+            if not any(fields.values()):
+                stats["empty"] += 1
+                logging.warning(f"⚠️ No data found to backfill {href}")
+                continue
+            pending.append({"job_url": href, **fields})
+            if len(pending) >= ScrapingConfig.BACKFILL_BATCH_SIZE:
+                await flush()
+
+    pages = [page]
+    for _ in range(min(concurrency, total) - 1):
+        try:
+            pages.append(await context.new_page())
+        except Exception as e:
+            logging.warning(f"⚠️ Could not open additional page: {e}")
+            break
+
+    try:
+        await asyncio.gather(*(worker(p) for p in pages))
+    finally:
+        await flush()
+        for extra_page in pages[1:]:
+            try:
+                await extra_page.close()
+            except Exception:
+                pass
+        rate.log_state()
+        if conn is not original_conn:
+            await conn.close()
+    return stats
+
+
+async def run_backfill(limit: Optional[int] = None):
+    """
+    Entry point of `scout backfill`: fill in missing fields of stored offers.
+
+    Args:
+        limit: Backfill at most this many offers (optional)
+    """
+    conn = await init_db_connection()
+    try:
+        offer_urls = await fetch_incomplete_offers(conn, BACKFILL_FIELDS, limit)
+        logging.info(f"🔍 Found {len(offer_urls)} offers with missing data ({', '.join(BACKFILL_FIELDS)})")
+        if not offer_urls:
+            logging.info("✅ Nothing to backfill")
+            return
+
+        profile = NavigationProfile() if ScrapingConfig.FAST_NAVIGATION else None
+        playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS, profile=profile)
+        fetcher = OfferFetcher() if ScrapingConfig.HTTP_FAST_PATH else None
+        try:
+            if profile is not None:
+                await profile.calibrate(browser, offer_urls)
+            with METRICS.timer("backfill"):
+                stats = await backfill_offers(page, conn, offer_urls, profile=profile, fetcher=fetcher)
+        finally:
+            if fetcher is not None:
+                await fetcher.close()
+                fetcher.log_summary()
+            await browser.close()
+            await playwright.stop()
+
+        logging.info(f"✅ Backfilled {len(offer_urls)} offers: {stats['updated']} changed, "
+                     f"{stats['empty']} without data, {stats['failed']} failed")
+    finally:
+        await conn.close()
+
+
+async def run_salary_backfill():
+    """Entry point of `scout backfill --salaries`: fill the typed salary columns of stored offers."""
+    conn = await init_db_connection()
+    try:
+        with METRICS.timer("salary_backfill"):
+            await backfill_salary_columns(conn)
+    finally:
+        await conn.close()
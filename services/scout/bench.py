@@ -0,0 +1,329 @@
+# bench.py
+"""
+Offline benchmark for link collection and offer extraction.
+
+Serves the fixture corpus in `fixtures/` (a listing page with an
+infinite-scroll JSON endpoint and saved offer pages) from a local HTTP
+server, points Scout at it and runs `collect_offer_links` followed by the
+same per-offer extraction `process_offers` uses. Reports offers/sec,
+p50/p95 per-offer latency, Playwright round trips per offer and field
+accuracy against `fixtures/expected.json`, so scraper changes can be
+compared run to run without touching justjoin.it:
+
+    python -m scout.bench --output before.json
+    python -m scout.bench --compare before.json
+
+Modes: `auto` (HTTP fast path with Playwright fallback, as in production),
+`browser` (Playwright only) and `http` (fast path only; misses count as
+failed offers).
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from functools import partial, wraps
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from .config import ScrapingConfig
+from .http_fetch import OfferFetcher
+from .navigation import NavigationProfile
+from .scrape_core import init_browser, collect_offer_links, fetch_offer, scrape_offer
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Compared after collapsing whitespace: innerText and the fast path break lines differently
+COMPARED_FIELDS = (
+    "job_title", "company", "location", "category", "work_schedule", "employment_type", "experience",
+    "operating_mode", "tech_stack", "description",
+    "salary_any", "salary_b2b", "salary_internship", "salary_mandate", "salary_permanent", "salary_specific_task",
+)
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Maps justjoin.it paths onto the fixture files."""
+
+    def __init__(self, *args, fixtures: Path, **kwargs):
+        self.fixtures = fixtures
+        super().__init__(*args, directory=str(fixtures), **kwargs)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == ScrapingConfig.LISTING_PATH:
+            self._send(self.fixtures / "listing.html", "text/html; charset=utf-8")
+        elif url.path == "/api/offers":
+            page = parse_qs(url.query).get("page", ["1"])[0]
+            self._send(self.fixtures / "api" / f"offers-page-{page}.json", "application/json")
+        elif url.path.startswith("/job-offer/"):
+            slug = url.path.rsplit("/", 1)[-1]
+            self._send(self.fixtures / "offers" / f"{slug}.html", "text/html; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def _send(self, path: Path, content_type: str):
+        if not path.is_file():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Local stand-in for justjoin.it serving the fixture corpus."""
+
+    def __init__(self, fixtures: Path = FIXTURES_DIR):
+        self.fixtures = fixtures
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(_FixtureHandler, fixtures=fixtures))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RoundTripCounter:
+    """
+    Counts Playwright protocol calls (client -> driver round trips).
+
+    Wraps the sending methods of Playwright's internal channel; if that API
+    moves, `count` stays None and the report shows n/a.
+    """
+
+    _METHODS = ("send", "send_return_as_dict", "send_no_reply")
+
+    def __init__(self):
+        self.count: Optional[int] = None
+        self._originals: dict = {}
+
+    def install(self):
+        try:
+            from playwright._impl._connection import Channel
+        except ImportError:
+            return
+        self.count = 0
+        for name in self._METHODS:
+            original = getattr(Channel, name, None)
+            if original is None:
+                continue
+            self._originals[name] = original
+            setattr(Channel, name, self._wrap(original))
+        self._channel = Channel
+
+    def _wrap(self, original):
+        counter = self
+        if inspect.iscoroutinefunction(original):
+            @wraps(original)
+            async def counted(*args, **kwargs):
+                counter.count += 1
+                return await original(*args, **kwargs)
+        else:
+            @wraps(original)
+            def counted(*args, **kwargs):
+                counter.count += 1
+                return original(*args, **kwargs)
+        return counted
+
+    def uninstall(self):
+        for name, original in self._originals.items():
+            setattr(self._channel, name, original)
+        self._originals = {}
+
+
+def _percentile(values: list[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * q)))]
+
+
+def _normalize(value) -> Optional[str]:
+    return " ".join(str(value).split()) if value is not None else None
+
+
+def check_accuracy(results: dict[str, dict], expected: dict[str, dict]) -> dict:
+    """Compare extracted offers with the expected fields of the corpus."""
+    matched = 0
+    compared = 0
+    mismatches = []
+    for url, offer in results.items():
+        slug = url.rsplit("/", 1)[-1]
+        for field in COMPARED_FIELDS:
+            want = _normalize(expected.get(slug, {}).get(field))
+            got = _normalize(offer.get(field))
+            compared += 1
+            if want == got:
+                matched += 1
+            else:
+                mismatches.append({"offer": slug, "field": field, "expected": want, "got": got})
+    return {"fields": compared, "matched": matched, "ratio": matched / compared if compared else None, "mismatches": mismatches}
+
+
+async def run_benchmark(mode: str = "auto", repeat: int = 3, fixtures: Path = FIXTURES_DIR) -> dict:
+    """
+    Collect links from the fixture listing and extract every offer `repeat` times.
+
+    Args:
+        mode: 'auto', 'browser' or 'http'
+        repeat: How many times each offer is extracted
+        fixtures: Fixture corpus directory
+
+    Returns:
+        dict: Benchmark report (see module docstring)
+    """
+    expected = json.loads((fixtures / "expected.json").read_text())
+    server = FixtureServer(fixtures)
+    server.start()
+    base_url = ScrapingConfig.BASE_URL
+    ScrapingConfig.BASE_URL = server.url
+
+    counter = RoundTripCounter()
+    counter.install()
+    profile = NavigationProfile() if ScrapingConfig.FAST_NAVIGATION else None
+    playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS, profile=profile)
+    fetcher = OfferFetcher() if mode != "browser" else None
+
+    try:
+        # Link collection
+        round_trips = counter.count
+        started = time.perf_counter()
+        await page.goto(f"{server.url}{ScrapingConfig.LISTING_PATH}", timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+        links = await collect_offer_links(page)
+        collection = {
+            "collected": len(links),
+            "expected": len(expected),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "round_trips": counter.count - round_trips if counter.count is not None else None,
+        }
+
+        # Offer extraction, with the same page pool size as process_offers
+        queue: asyncio.Queue = asyncio.Queue()
+        for _ in range(repeat):
+            for href in links:
+                queue.put_nowait(href)
+        total = queue.qsize()
+        latencies: list[float] = []
+        results: dict[str, dict] = {}
+        failed = 0
+        fast_hits = 0
+
+        async def worker(worker_page):
+            nonlocal failed, fast_hits
+            while True:
+                try:
+                    href = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                try:
+                    offer_data = await fetch_offer(fetcher, href) if fetcher is not None else None
+                    if offer_data is not None:
+                        fast_hits += 1
+                    elif mode != "http":
+                        offer_data = await scrape_offer(worker_page, href, profile)
+                except Exception as e:
+                    logging.error(f"Error extracting {href}: {e}")
+                    offer_data = None
+                latencies.append(time.perf_counter() - start)
+                if offer_data is None:
+                    failed += 1
+                else:
+                    results[href] = offer_data
+
+        pages = [page] + [await page.context.new_page() for _ in range(max(1, ScrapingConfig.MAX_CONCURRENT_PAGES) - 1)]
+        round_trips = counter.count
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(p) for p in pages))
+        elapsed = time.perf_counter() - started
+        extraction_round_trips = counter.count - round_trips if counter.count is not None else None
+    finally:
+        if fetcher is not None:
+            await fetcher.close()
+        await browser.close()
+        await playwright.stop()
+        counter.uninstall()
+        ScrapingConfig.BASE_URL = base_url
+        server.stop()
+
+    # Accuracy is checked on the last extraction of each offer, against the production URL form
+    report = {
+        "mode": mode,
+        "repeat": repeat,
+        "offers": total,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "offers_per_sec": round(total / elapsed, 2) if elapsed else None,
+        "latency_p50_ms": round(_percentile(latencies, 0.50) * 1000, 1) if latencies else None,
+        "latency_p95_ms": round(_percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+        "round_trips_per_offer": round(extraction_round_trips / total, 1) if extraction_round_trips is not None and total else None,
+        "fast_path_hits": fast_hits,
+        "links": collection,
+        "accuracy": check_accuracy(results, expected),
+    }
+    return report
+
+
+def log_report(report: dict, previous: Optional[dict] = None):
+    """Log a benchmark report, with deltas against a previous one."""
+    def delta(key: str, fmt: str = "{:+.1f}") -> str:
+        if not previous or previous.get(key) is None or report.get(key) is None:
+            return ""
+        return f" ({fmt.format(report[key] - previous[key])})"
+
+    links = report["links"]
+    accuracy = report["accuracy"]
+    logging.info(f"🔗 Links: {links['collected']}/{links['expected']} in {links['elapsed_s']} s, {links['round_trips'] if links['round_trips'] is not None else 'n/a'} round trips")
+    logging.info(f"📈 Extraction ({report['mode']}): {report['offers']} offers in {report['elapsed_s']} s, "
+                 f"{report['offers_per_sec']} offers/s{delta('offers_per_sec', '{:+.2f}')}, {report['failed']} failed, {report['fast_path_hits']} via HTTP fast path")
+    logging.info(f"⏱️ Latency per offer: p50 {report['latency_p50_ms']} ms{delta('latency_p50_ms')}, p95 {report['latency_p95_ms']} ms{delta('latency_p95_ms')}")
+    logging.info(f"🔁 Playwright round trips per offer: {report['round_trips_per_offer'] if report['round_trips_per_offer'] is not None else 'n/a'}{delta('round_trips_per_offer')}")
+    if accuracy["ratio"] is not None:
+        logging.info(f"🎯 Field accuracy: {accuracy['matched']}/{accuracy['fields']} ({accuracy['ratio']:.1%})")
+    for mismatch in accuracy["mismatches"][:10]:
+        logging.warning(f"⚠️ {mismatch['offer']}.{mismatch['field']}: expected {mismatch['expected']!r}, got {mismatch['got']!r}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="scout.bench", description="Benchmark Scout against the offline fixture corpus")
+    parser.add_argument("--mode", choices=("auto", "browser", "http"), default="auto", help="Extraction path to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Extract every offer N times")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Fixture corpus directory")
+    parser.add_argument("--output", type=Path, help="Write the report as JSON")
+    parser.add_argument("--compare", type=Path, help="Show deltas against a previous JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmark(args.mode, args.repeat, args.fixtures))
+    previous = json.loads(args.compare.read_text()) if args.compare else None
+    log_report(report, previous)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        logging.info(f"💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
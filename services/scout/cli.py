@@ -1,13 +1,23 @@
 # cli.py
-import asyncio, logging
+import argparse, asyncio, logging
 import os
 from dotenv import load_dotenv
 
-from .db import init_db_connection, check_connection, reconnect_db, cleanup_empty_offers, purge_stale_offers
-from .scrape_core import init_browser, collect_offer_links, process_offers
+from typing import Optional
+from .db import init_db_connection, check_connection, reconnect_db, cleanup_empty_offers, mark_seen_offers, purge_stale_offers, fetch_offer_state
+from .scrape_core import init_browser, collect_offer_listings, process_offers, process_queue
+from .freshness import listing_hash, select_offers_to_scrape
+from .navigation import NavigationProfile
 from .config import ScrapingConfig
 from .aws_secrets import setup_database_credentials_from_secrets
 from .invoke_normalize import invoke_normalize_lambda
+from .journal import RunJournal
+from .work_queue import ScrapeQueue
+from .farm import process_offers_farm
+from .metrics import METRICS
+from .selector_health import SELECTOR_HEALTH
+from .dom_extract import TEXT_FIELDS, field_chain
+from .backfill import run_backfill, run_salary_backfill
 
 # Logging configuration - MUST be first before any logging calls
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -22,7 +32,87 @@ if SECRET_ARN:
 else:
     logging.info("ℹ️ No SECRET_ARN provided, using .env file for database credentials")
 
-async def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="scout", description="Scrape JustJoin.it job offers")
+    parser.add_argument("command", nargs="?", choices=("scrape", "backfill"), default="scrape",
+                        help="'scrape' (default) runs the daily scrape, 'backfill' fills in missing fields of stored offers")
+    parser.add_argument("--limit", type=int, help="backfill: process at most N offers")
+    parser.add_argument("--salaries", action="store_true", help="backfill: parse stored salary text into the typed salary columns instead")
+    parser.add_argument("--resume", action="store_true", help="Continue the last unfinished run from its journal instead of starting over")
+    parser.add_argument("--queue", choices=("collect", "work"),
+                        help="Use the shared scrape_queue: 'collect' enqueues the listing and works it, 'work' only claims and scrapes")
+    parser.add_argument("--processes", type=int, default=ScrapingConfig.PROCESSES,
+                        help="Split the offers across N browser processes (default: SCOUT_PROCESSES or 1)")
+    return parser.parse_args(argv)
+
+def report_metrics():
+    """Log the per-stage summary, write the JSON / Prometheus metrics files and save the selector statistics."""
+    SELECTOR_HEALTH.log_summary({field: field_chain(field) for field in TEXT_FIELDS})
+    SELECTOR_HEALTH.save()
+    METRICS.log_summary()
+    try:
+        json_path, prom_path = METRICS.write()
+        logging.info(f"📈 Metrics written to {json_path} and {prom_path}")
+    except OSError as e:
+        logging.warning(f"⚠️ Could not write metrics: {e}")
+
+async def run_queue(role: str):
+    """
+    Scrape through the shared `scrape_queue` so several workers can run in parallel.
+
+    The collector (`role="collect"`) gathers the listing, enqueues the offers
+    selected by the refresh policy and then works the queue like any other
+    worker. Once nothing is left it runs the cleanup and triggers
+    normalization. Workers (`role="work"`) only claim and scrape batches and
+    exit when the queue stays empty.
+    """
+    conn = await init_db_connection()
+    queue = ScrapeQueue(await init_db_connection())
+    profile = NavigationProfile() if ScrapingConfig.FAST_NAVIGATION else None
+    playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS, profile=profile)
+
+    try:
+        if role == "collect":
+            await page.goto(f"{ScrapingConfig.BASE_URL}{ScrapingConfig.LISTING_PATH}", timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+            listings = await collect_offer_listings(page)
+            if not listings:
+                logging.warning("⚠️ No job offer links found")
+                return
+
+            selected = select_offers_to_scrape(list(listings), await fetch_offer_state(conn), listings)
+            await queue.enqueue({url: listings[url] for url in selected})
+
+            # Listing-only maintenance does not depend on the scrape
+            await mark_seen_offers(conn, set(listings), {url: listing_hash(listing) for url, listing in listings.items()})
+            await purge_stale_offers(conn, set(listings))
+
+        with METRICS.timer("scrape_offers"):
+            processed_count, page = await process_queue(page, conn, queue, browser, playwright, profile=profile)
+
+        if role == "collect":
+            # Keep picking up expired leases until every claim is settled
+            while remaining := await queue.remaining():
+                logging.info(f"⏳ {remaining} offers still pending or claimed by other workers")
+                count, page = await process_queue(page, conn, queue, page.context.browser or browser, playwright, profile=profile)
+                processed_count += count
+            logging.info(f"📊 Queue summary: {await queue.summary()}")
+
+            await cleanup_empty_offers(conn)
+            logging.info(f"🎉 Scraping completed successfully!")
+            invoke_normalize_lambda()
+
+    except Exception as e:
+        logging.error(f"❌ Error during scraping: {e}")
+        raise
+    finally:
+        await conn.close()
+        await queue.conn.close()
+        await (page.context.browser or browser).close()
+        await playwright.stop()
+        logging.info("🔒 Resources cleaned up successfully")
+        report_metrics()
+
+async def main(resume: bool = False, queue_role: Optional[str] = None, processes: int = 1):
     """
     Main entry point for scraping JustJoin.it job offers.
 
@@ -31,16 +121,41 @@ async def main():
     - Collects job offer links and determines new offers.
     - Processes new offers and inserts them into the database.
     - Closes all resources and logs completion.
+
+    Progress is recorded in a run journal; with `resume=True` the newest
+    unfinished run continues from its journal (skipping link collection if it
+    had completed).
+
+    With `processes > 1` the offers are scraped by a farm of browser
+    processes (see `farm.process_offers_farm`). With `queue_role` set, the run goes through the shared `scrape_queue`
+    instead (see `run_queue`).
     """
+    if queue_role is not None:
+        await run_queue(queue_role)
+        return
 
-    conn = await init_db_connection()
-    playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS)
+    journal = RunJournal.latest_unfinished() if resume else None
+    if resume and journal is None:
+        logging.info("ℹ️ No unfinished run to resume, starting a new one")
+    if journal is None:
+        journal = RunJournal.create()
 
-    await page.goto("https://justjoin.it/job-offers", timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+    conn = await init_db_connection()
+    profile = NavigationProfile() if ScrapingConfig.FAST_NAVIGATION else None
+    playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS, profile=profile)
 
     try:
-        # Collect job offer links
-        offer_urls = await collect_offer_links(page)
+        if journal.has_links:
+            listings = journal.listings()
+            logging.info(f"📓 Resuming with {len(listings)} collected links, {journal.summary()}")
+        else:
+            await page.goto(f"{ScrapingConfig.BASE_URL}{ScrapingConfig.LISTING_PATH}", timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+
+            # Collect job offer links (with listing-level fields when available)
+            listings = await collect_offer_listings(page)
+            if listings:
+                journal.record_links(listings)
+        offer_urls = list(listings)
  
         if not offer_urls:
             logging.warning("⚠️ No job offer links found")
@@ -52,14 +167,20 @@ async def main():
             conn = await reconnect_db()
 
         # Process offers and save to database (with browser restart for memory management)
-        processed_count, page = await process_offers(page, conn, offer_urls, browser, playwright)
+        with METRICS.timer("scrape_offers"):
+            if processes > 1:
+                processed_count, page = await process_offers_farm(page, conn, journal.pending_urls(), processes, listings=listings, journal=journal)
+            else:
+                processed_count, page = await process_offers(page, conn, journal.pending_urls(), browser, playwright, profile=profile, listings=listings, journal=journal)
         
-        # Remove stale offers that are no longer on the website
+        # Refresh last_seen_at, then remove offers that have not been listed for a while
+        await mark_seen_offers(conn, set(offer_urls), {url: listing_hash(listing) for url, listing in listings.items()})
         await purge_stale_offers(conn, set(offer_urls))
         
         # Clean up offers with empty data (only job_url, all other fields NULL)
         await cleanup_empty_offers(conn)
         
+        journal.finish()
         logging.info(f"🎉 Scraping completed successfully!")
 
         # Trigger normalization Lambda so it runs only after today's scrape is done
@@ -73,7 +194,22 @@ async def main():
         await conn.close()
         await browser.close()
         await playwright.stop()
+        journal.close()
         logging.info("🔒 Resources cleaned up successfully")
+        report_metrics()
+
+async def run(args: argparse.Namespace):
+    """Dispatch the parsed command line to the scrape or the backfill."""
+    if args.command == "backfill":
+        try:
+            if args.salaries:
+                await run_salary_backfill()
+            else:
+                await run_backfill(limit=args.limit)
+        finally:
+            report_metrics()
+        return
+    await main(resume=args.resume, queue_role=args.queue, processes=args.processes)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(run(parse_args()))
\ No newline at end of file
@@ -4,18 +4,104 @@ Configuration constants for Scout.
 This module contains all configurable parameters used throughout the scraping process.
 """
 
+import os
+
+
 class ScrapingConfig:
     """Configuration constants for scraping behavior."""
     
+    # Target site
+    BASE_URL = "https://justjoin.it"
+    LISTING_PATH = "/job-offers"
+
     # Browser configuration
     HEADLESS = True
-    RESTART_BROWSER_EVERY = 500  # Restart browser every N offers for memory cleanup
+    RESTART_BROWSER_EVERY = 500  # Restart browser every N offers when memory cannot be measured (no /proc)
+    MEMORY_RECYCLING = True  # Recycle the context / restart the browser from measured memory (see memory.py)
+    MEMORY_CHECK_EVERY = 10  # Sample browser memory every N offers
+    CONTEXT_HEAP_LIMIT_MB = 256  # Page JS heap that triggers a context recycle
+    CONTEXT_RSS_LIMIT_MB = 1024  # Browser memory (all processes) that triggers a context recycle
+    BROWSER_RSS_LIMIT_MB = 1536  # Browser memory that triggers a browser restart
+    MAX_CONCURRENT_PAGES = 4  # Pages processing offers in parallel within one browser context (1 = sequential)
+    PROCESSES = int(os.getenv('SCOUT_PROCESSES', '1'))  # Browser processes splitting the offers (1 = in-process, see farm.py)
     
     # Scraping limits
     SCROLL_PAUSE_TIME = 0.05
     MAX_IDLE_SCROLLS = 100
+    LINK_COLLECTION_MODE = 'network'  # 'network' (listing JSON responses, DOM fallback), 'observer' (MutationObserver) or 'dom' (legacy re-query)
+    NETWORK_IDLE_SCROLLS = 8  # Stop network capture after N scrolls without new offers
+    NETWORK_RESPONSE_TIMEOUT = 3000  # Max wait for a listing response after each scroll (ms)
+    LISTING_MIN_COVERAGE = 0.98  # Share of the listing's reported total the network capture must reach (else DOM fallback)
     
+    # Extraction
+    SINGLE_PASS_EXTRACTION = True  # Read the whole offer with one page.evaluate() instead of per-element locators
+    SELECTOR_RANKING = True  # Try each field's candidate selectors best-performing first (see selector_health.py)
+    SELECTOR_SCORE_ALPHA = 0.2  # Weight of the latest attempt in a candidate's hit-rate score
+    SELECTOR_MIN_SCORE = 0.2  # Candidates scoring below this are tried after the working ones
+    SELECTOR_PROBE_EVERY = 50  # Every Nth offer tries the configured order, so demoted selectors can recover
+    SELECTOR_STATS_PATH = os.getenv('SCOUT_SELECTOR_STATS', '.scout/selector-stats.json')  # Persisted between runs
+
+    # HTTP fast path
+    HTTP_FAST_PATH = True  # Parse offers from server-rendered structured data over httpx; Playwright only for misses
+    HTTP_MAX_CONNECTIONS = 8  # Pooled HTTP/2 keep-alive connections
+    HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+    # Navigation profile
+    FAST_NAVIGATION = True  # Block heavy resources and start extraction once the read selectors are present
+    NAVIGATION_WAIT_UNTIL = 'domcontentloaded'  # Load state awaited before checking the ready selectors
+    BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+    BLOCKED_DOMAINS = (
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+        'facebook.net', 'facebook.com', 'hotjar.com', 'clarity.ms', 'linkedin.com',
+        'tiktok.com', 'cookielaw.org', 'onetrust.com',
+    )
+    NAVIGATION_BASELINE_SAMPLES = 2  # Offers loaded with networkidle once per run to measure savings (0 = off)
+
+    # Database writes
+    BATCH_WRITES = True  # Buffer scraped offers and COPY them in batches instead of one INSERT per offer
+    WRITE_BATCH_SIZE = 50  # Flush when this many offers are buffered
+    WRITE_FLUSH_INTERVAL = 5.0  # ... or at least every N seconds
+    BACKFILL_BATCH_SIZE = 200  # Offers per UPDATE ... FROM (VALUES ...) in `scout backfill`
+
+    # Streaming skills (see skill_stream.py)
+    STREAM_SKILLS = os.getenv('SCOUT_STREAM_SKILLS', '0') == '1'  # Link offer_skills as offers are saved, not after the scrape
+    SKILL_STREAM_BATCH_SIZE = 50  # Offers linked per statement
+
+    # Incremental re-scraping
+    REFRESH_AFTER_DAYS = 7  # Re-visit known offers whose last scrape is older than this
+    STALE_AFTER_HOURS = 36  # Delete offers not seen on the listing for this long
+    PURGE_CHUNK_SIZE = 500  # Stale offers deleted per transaction
+
+    # Run journal (checkpoint/resume)
+    JOURNAL_DIR = os.getenv('SCOUT_JOURNAL_DIR', '.scout/journal')  # Use a persistent volume in ECS
+    JOURNAL_MAX_ATTEMPTS = 3  # Failed URLs are retried on --resume until this many attempts
+    JOURNAL_KEEP = 5  # Finished journals kept on disk
+
+    # Shared work queue (parallel workers, see work_queue.py)
+    WORKER_ID = os.getenv('SCOUT_WORKER_ID')  # Defaults to <hostname>-<pid>
+    QUEUE_BATCH_SIZE = 20  # URLs claimed per round trip
+    QUEUE_LEASE_SECONDS = 600  # Claims not renewed for this long are taken over by other workers
+    QUEUE_MAX_ATTEMPTS = 3  # Give up on a URL after this many claims
+    QUEUE_POLL_INTERVAL = 5.0  # Seconds between claims when the queue is empty
+    QUEUE_IDLE_TIMEOUT = 120.0  # Workers exit after the queue has been empty for this long
+
+    # Metrics
+    METRICS_DIR = os.getenv('SCOUT_METRICS_DIR', '.scout/metrics')  # scout-metrics.json and scout.prom (Prometheus textfile)
+
     # Timeouts
     LINK_TIMEOUT = 2000  # 2 seconds
     PAGE_LOAD_TIMEOUT = 60000  # 60 seconds
-    REQUEST_DELAY = 0.5  # 0.5 seconds between requests
+    READY_TIMEOUT = 10000  # 10 seconds for the read selectors to appear after DOMContentLoaded
+    REQUEST_DELAY = 0.5  # Initial delay between request starts; adapted by the rate controller
+
+    # Adaptive rate control (AIMD, see rate_control.py); MAX_CONCURRENT_PAGES is the upper bound
+    RATE_INITIAL_CONCURRENCY = 2  # Requests in flight at start
+    RATE_INCREASE = 1.0  # Concurrency added per window of successful requests
+    RATE_DECREASE = 0.5  # Concurrency multiplier on 429/5xx, timeouts or high latency
+    RATE_DELAY_STEP = 0.02  # Delay removed per successful request (seconds)
+    RATE_BACKOFF_DELAY = 0.5  # Minimum delay after a backoff (seconds)
+    RATE_MIN_DELAY = 0.0
+    RATE_MAX_DELAY = 30.0
+    RATE_LATENCY_FACTOR = 3.0  # Latency this many times above its floor counts as congestion
+    RATE_LOG_EVERY = 50  # Log the controller state every N requests
+    THROTTLE_RETRIES = 3  # Times a throttled (429/5xx) offer goes back to the queue before it counts as failed
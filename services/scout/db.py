@@ -1,12 +1,30 @@
 # db.py
 
-import asyncpg, logging, os
+import asyncio, asyncpg, logging, os, time
 from pathlib import Path
+from typing import Callable, Optional
 from urllib.parse import quote_plus
 
 import json
 import boto3
 
+from .config import ScrapingConfig
+from .metrics import METRICS, timed
+from .salary import SALARY_COLUMNS, salary_columns
+
+# Columns written by the scraper, in `offers` table order
+OFFER_COLUMNS = (
+    "job_url", "job_title", "category", "company", "location",
+    "salary_any", "salary_b2b", "salary_internship", "salary_mandate", "salary_permanent", "salary_specific_task",
+    "work_schedule", "experience", "employment_type", "operating_mode", "tech_stack", "description",
+)
+
+# Postgres types of SALARY_COLUMNS, for unnest() parameters
+SALARY_COLUMN_TYPES = ("numeric", "numeric", "text", "boolean", "text", "text")
+
+# Scraped columns, the typed salary parsed from them and the change-detection hashes
+OFFER_WRITE_COLUMNS = OFFER_COLUMNS + SALARY_COLUMNS + ("listing_hash", "content_hash")
+
 def get_database_dsn() -> str:
     """Get database DSN from environment variables for AWS RDS or DATABASE_URL."""
     database_url = os.getenv('DATABASE_URL')
@@ -51,7 +69,7 @@ async def init_db_connection() -> asyncpg.Connection:
     Initializes and returns an asyncpg database connection to AWS RDS.
 
     - Connects to a PostgreSQL database using AWS RDS configuration.
-    - Ensures the 'offers' table exists with the required schema.
+    - Ensures the 'offers' and 'scrape_queue' tables exist with the required schema.
 
     Returns:
         asyncpg.Connection: An open connection to the database.
@@ -72,15 +90,16 @@ async def init_db_connection() -> asyncpg.Connection:
         logging.error(f"❌ Connection error: {e}")
         raise Exception(f"❌ Failed to connect to database: {e}")
 
-    # Ensure the offers table exists
+    # Ensure the offers and scrape_queue tables exist
     project_root = Path(__file__).resolve().parent.parent.parent
-    schema_path = project_root / "backend" / "sql" / "tables" / "offers.sql"
-    if schema_path.exists():
-        ddl = schema_path.read_text()
-        await conn.execute(ddl)
-        logging.info("✅ Database schema initialized")
-    else:
-        logging.warning(f"⚠️ Schema file not found: {schema_path}")
+    for table in ("offers", "scrape_queue"):
+        schema_path = project_root / "backend" / "sql" / "tables" / f"{table}.sql"
+        if schema_path.exists():
+            ddl = schema_path.read_text()
+            await conn.execute(ddl)
+        else:
+            logging.warning(f"⚠️ Schema file not found: {schema_path}")
+    logging.info("✅ Database schema initialized")
     
     return conn
 
@@ -111,9 +130,83 @@ async def reconnect_db() -> asyncpg.Connection:
     return await init_db_connection()
 
 
+async def fetch_offer_state(conn: asyncpg.Connection) -> dict:
+    """
+    Load the refresh-policy state of offers already in the database.
+
+    Returns:
+        dict: job_url -> record with `listing_hash` and `scraped_at` (empty on error)
+    """
+    try:
+        records = await conn.fetch("SELECT job_url, listing_hash, scraped_at FROM offers")
+    except Exception as e:
+        logging.warning(f"⚠️ Could not fetch existing offers: {e}")
+        return {}
+    logging.info(f"📊 Found {len(records)} existing offers in database")
+    return {record['job_url']: record for record in records}
+
+async def stage_current_urls(conn: asyncpg.Connection, current_urls: set[str]):
+    """
+    COPY the URLs currently listed on the website into the `current_offer_urls` temp table.
+
+    Args:
+        conn: Database connection.
+        current_urls: Set of URLs currently present on the website.
+    """
+    await conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_offer_urls (job_url TEXT PRIMARY KEY)")
+    await conn.execute("TRUNCATE current_offer_urls")
+    await conn.copy_records_to_table("current_offer_urls", records=[(url,) for url in current_urls], columns=["job_url"])
+    await conn.execute("ANALYZE current_offer_urls")
+
+@timed("mark_seen")
+async def mark_seen_offers(conn: asyncpg.Connection, current_urls: set[str], listing_hashes: Optional[dict[str, Optional[str]]] = None):
+    """
+    Record that offers are still listed on the website.
+
+    Offers saved before listing hashes existed (migration 011) get their
+    current listing hash here, so they are compared against it next run
+    instead of all being treated as changed once.
+
+    Args:
+        conn: Database connection.
+        current_urls: Set of URLs currently present on the website.
+        listing_hashes: Offer URL -> current listing hash (optional)
+    """
+    if not current_urls:
+        return
+
+    await stage_current_urls(conn, current_urls)
+    result = await conn.execute("""
+        UPDATE offers o
+        SET last_seen_at = CURRENT_TIMESTAMP
+        FROM current_offer_urls c
+        WHERE o.job_url = c.job_url
+    """)
+    logging.info(f"👀 Marked {_affected_rows(result)} offers as seen")
+
+    hashes = {url: value for url, value in (listing_hashes or {}).items() if value is not None}
+    if hashes:
+        result = await conn.execute("""
+            UPDATE offers o
+            SET listing_hash = u.listing_hash
+            FROM unnest($1::text[], $2::text[]) AS u(job_url, listing_hash)
+            WHERE o.job_url = u.job_url AND o.listing_hash IS NULL
+        """, list(hashes), list(hashes.values()))
+        if _affected_rows(result):
+            logging.info(f"🔖 Recorded listing hashes of {_affected_rows(result)} offers saved without one")
+
+@timed("purge")
 async def purge_stale_offers(conn: asyncpg.Connection, current_urls: set[str]):
     """
-    Remove offers that are no longer present on the website.
+    Remove offers that have not been listed on the website for a while.
+
+    The current URLs are COPYed into a temp table and stale offers are found
+    with an indexed anti-join against it. Offers missing from the current run
+    only age through `last_seen_at` (see `mark_seen_offers`); they are deleted
+    once they have not been seen for `STALE_AFTER_HOURS`, so a single
+    incomplete crawl cannot wipe them. Deletes run in chunks of
+    `PURGE_CHUNK_SIZE`, each in its own short transaction, so the cascade into
+    `offer_skills` never holds locks for the whole purge.
 
     Args:
         conn: Database connection.
@@ -125,27 +218,44 @@ async def purge_stale_offers(conn: asyncpg.Connection, current_urls: set[str]):
 
     # Count offers before deletion
     total_offers_before = await conn.fetchval("SELECT COUNT(*) FROM offers")
-    
-    # Convert set to list for SQL IN clause
-    current_urls_list = list(current_urls)
-    
-    # Use PostgreSQL's ANY operator for better performance
+
     delete_query = """
-        DELETE FROM offers 
-        WHERE job_url != ALL($1::text[])
+        DELETE FROM offers
+        WHERE job_url IN (
+            SELECT o.job_url
+            FROM offers o
+            WHERE o.last_seen_at < CURRENT_TIMESTAMP - make_interval(hours => $1)
+              AND NOT EXISTS (SELECT 1 FROM current_offer_urls c WHERE c.job_url = o.job_url)
+            LIMIT $2
+        )
     """
 
     try:
-        result = await conn.execute(delete_query, current_urls_list)
-        # Extract number of deleted rows from result string
-        deleted_count = int(result.split()[-1]) if result and result.split()[-1].isdigit() else 0
+        await stage_current_urls(conn, current_urls)
+
+        deleted_count = 0
+        chunk = 0
+        while True:
+            chunk += 1
+            start = time.perf_counter()
+            async with conn.transaction():
+                result = await conn.execute(delete_query, ScrapingConfig.STALE_AFTER_HOURS, ScrapingConfig.PURGE_CHUNK_SIZE)
+            lock_ms = (time.perf_counter() - start) * 1000
+            chunk_deleted = _affected_rows(result)
+            deleted_count += chunk_deleted
+
+            if chunk_deleted:
+                logging.info(f"🗑️ Purge chunk {chunk}: deleted {chunk_deleted} offers, locks held {lock_ms:.0f} ms")
+            if chunk_deleted < ScrapingConfig.PURGE_CHUNK_SIZE:
+                break
         
-        logging.info(f"🗑️ Purged {deleted_count} stale offers")
+        logging.info(f"🗑️ Purged {deleted_count} stale offers (not seen for {ScrapingConfig.STALE_AFTER_HOURS}h)")
         logging.info(f"📊 Database sync: {total_offers_before} → {total_offers_before - deleted_count} offers")
     except Exception as e:
         logging.error(f"❌ Error purging stale offers: {e}")
         raise
 
+@timed("cleanup")
 async def cleanup_empty_offers(conn: asyncpg.Connection):
     """
     Remove offers that have only job_url but all other fields are NULL.
@@ -179,4 +289,326 @@ async def cleanup_empty_offers(conn: asyncpg.Connection):
         logging.info(f"🧹 Cleaned up empty offers: {result}")
     except Exception as e:
         logging.error(f"❌ Error cleaning up empty offers: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def _affected_rows(status: str) -> int:
+    """Extract the row count from a command status string such as 'INSERT 0 12'."""
+    last = status.split()[-1] if status else ""
+    return int(last) if last.isdigit() else 0
+
+
+async def ensure_offer_staging(conn: asyncpg.Connection):
+    """Create the session-local staging table used by `save_offers`."""
+    await conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS offers_staging
+        (LIKE offers INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+    """)
+
+
+@timed("db_write")
+async def save_offers(conn: asyncpg.Connection, offers: list[dict]) -> int:
+    """
+    Upsert scraped offers through the staging table in one transaction.
+
+    Offers already in the database get their `scraped_at`, `last_seen_at` and
+    `listing_hash` refreshed; their content columns are only overwritten when
+    the content hash changed (and the new scrape is not empty).
+
+    Args:
+        conn: Database connection with the staging table (see `ensure_offer_staging`).
+        offers: Offer dicts with every column in `OFFER_WRITE_COLUMNS`.
+
+    Returns:
+        int: Number of offers inserted or changed.
+    """
+    columns = ", ".join(OFFER_WRITE_COLUMNS)
+    content_updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in OFFER_WRITE_COLUMNS if column not in ("job_url", "listing_hash"))
+    records = [tuple(offer.get(column) for column in OFFER_WRITE_COLUMNS) for offer in offers]
+
+    async with conn.transaction():
+        await conn.copy_records_to_table("offers_staging", records=records, columns=list(OFFER_WRITE_COLUMNS))
+        await conn.execute("""
+            UPDATE offers o
+            SET scraped_at = CURRENT_TIMESTAMP,
+                last_seen_at = CURRENT_TIMESTAMP,
+                listing_hash = COALESCE(s.listing_hash, o.listing_hash)
+            FROM offers_staging s
+            WHERE o.job_url = s.job_url
+        """)
+        status = await conn.execute(f"""
+            INSERT INTO offers ({columns}, created_at, first_seen_at, last_seen_at, scraped_at, updated_at)
+            SELECT DISTINCT ON (job_url) {columns},
+                   CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+            FROM offers_staging
+            ORDER BY job_url
+            ON CONFLICT (job_url) DO UPDATE
+            SET {content_updates}, updated_at = CURRENT_TIMESTAMP
+            WHERE offers.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+              AND EXCLUDED.job_title IS NOT NULL
+        """)
+    written = _affected_rows(status)
+    METRICS.inc("db_rows_staged_total", len(records))
+    METRICS.inc("db_rows_written_total", written)
+    return written
+
+
+async def fetch_incomplete_offers(conn: asyncpg.Connection, columns: tuple[str, ...], limit: Optional[int] = None) -> list[str]:
+    """
+    URLs of offers with any of `columns` missing, or with the location set to the category (a known mis-scrape).
+
+    Args:
+        conn: Database connection
+        columns: Columns that must be filled in
+        limit: Maximum number of URLs (optional)
+
+    Returns:
+        list[str]: Offer URLs, most recently seen first
+    """
+    missing = " OR ".join(f"{column} IS NULL" for column in columns)
+    rows = await conn.fetch(f"""
+        SELECT job_url
+        FROM offers
+        WHERE {missing}
+           OR location = category
+        ORDER BY last_seen_at DESC NULLS LAST
+        {'LIMIT ' + str(int(limit)) if limit else ''}
+    """)
+    return [row["job_url"] for row in rows]
+
+
+@timed("db_backfill")
+async def update_offer_fields(conn: asyncpg.Connection, updates: list[dict], columns: tuple[str, ...]) -> int:
+    """
+    Fill in columns of existing offers, one `UPDATE ... FROM unnest(...)` per chunk.
+
+    A None value keeps the stored one; rows whose values do not change are
+    left alone (and keep their `updated_at`). The stored offer is read back
+    and merged with the new values, so `content_hash` and the typed salary
+    columns are recomputed from the full row and written in the same UPDATE
+    (a stale hash would make the next full scrape rewrite the offer, or skip
+    a real change).
+
+    Args:
+        conn: Database connection
+        updates: Dicts with `job_url` and any of `columns`
+        columns: Text columns to update
+
+    Returns:
+        int: Number of offers changed
+    """
+    # Imported here: freshness imports OFFER_COLUMNS from this module
+    from .freshness import content_hash
+
+    write_columns = columns + SALARY_COLUMNS + ("content_hash",)
+    types = ("text",) * len(columns) + SALARY_COLUMN_TYPES + ("text",)
+    params = ", ".join(f"${i + 2}::{kind}[]" for i, kind in enumerate(types))
+    assignments = ", ".join(f"{column} = v.{column}" for column in write_columns)
+    chunk_size = max(1, ScrapingConfig.BACKFILL_BATCH_SIZE)
+
+    updated = 0
+    async with conn.transaction():
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start:start + chunk_size]
+            stored = {
+                row["job_url"]: dict(row)
+                for row in await conn.fetch(f"""
+                    SELECT {", ".join(OFFER_COLUMNS)}
+                    FROM offers
+                    WHERE job_url = ANY($1::text[])
+                    FOR UPDATE
+                """, [update["job_url"] for update in chunk])
+            }
+            merged = []
+            for update in chunk:
+                offer = stored.pop(update["job_url"], None)
+                if offer is None:
+                    continue
+                values = {column: update[column] for column in columns if update.get(column) is not None}
+                if all(offer[column] == value for column, value in values.items()):
+                    continue
+                offer.update(values)
+                offer.update(salary_columns(offer))
+                offer["content_hash"] = content_hash(offer)
+                merged.append(offer)
+            if not merged:
+                continue
+            status = await conn.execute(f"""
+                UPDATE offers o
+                SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                FROM unnest($1::text[], {params}) AS v(job_url, {", ".join(write_columns)})
+                WHERE o.job_url = v.job_url
+            """, [offer["job_url"] for offer in merged], *([offer[column] for offer in merged] for column in write_columns))
+            updated += _affected_rows(status)
+    METRICS.inc("db_rows_backfilled_total", updated)
+    return updated
+
+
+async def backfill_salary_columns(conn: asyncpg.Connection, chunk_size: int = 1000) -> int:
+    """
+    Fill the typed salary columns of offers stored before they existed.
+
+    Salaries are parsed with the same code as at insert time and written
+    `chunk_size` offers per `UPDATE ... FROM unnest(...)`.
+
+    Returns:
+        int: Number of offers updated
+    """
+    text_columns = [column for column in OFFER_COLUMNS if column.startswith("salary_")]
+    rows = await conn.fetch(f"""
+        SELECT job_url, {", ".join(text_columns)}
+        FROM offers
+        WHERE salary_contract IS NULL
+          AND COALESCE({", ".join(text_columns)}) IS NOT NULL
+    """)
+    logging.info(f"🔍 Found {len(rows)} offers with salary text but no typed salary")
+
+    updated = 0
+    unparsed = 0
+    for start in range(0, len(rows), chunk_size):
+        parsed = []
+        for row in rows[start:start + chunk_size]:
+            columns = salary_columns(dict(row))
+            if columns["salary_contract"] is None:
+                unparsed += 1
+                continue
+            parsed.append((row["job_url"], columns))
+        if not parsed:
+            continue
+        status = await conn.execute(f"""
+            UPDATE offers o
+            SET salary_min = v.salary_min,
+                salary_max = v.salary_max,
+                salary_currency = v.salary_currency,
+                salary_is_gross = v.salary_is_gross,
+                salary_period = v.salary_period,
+                salary_contract = v.salary_contract
+            FROM unnest($1::text[], {", ".join(f"${i + 2}::{kind}[]" for i, kind in enumerate(SALARY_COLUMN_TYPES))})
+                AS v(job_url, {", ".join(SALARY_COLUMNS)})
+            WHERE o.job_url = v.job_url
+        """, [url for url, _ in parsed], *([columns[column] for _, columns in parsed] for column in SALARY_COLUMNS))
+        updated += _affected_rows(status)
+    logging.info(f"✅ Typed salary backfilled for {updated} offers ({unparsed} salaries could not be parsed)")
+    return updated
+
+
+# Errors a write can fail with: server-side, client-side (asyncpg) and socket errors
+DB_ERRORS = (asyncpg.PostgresError, asyncpg.exceptions.InterfaceError, OSError)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether a database error means the connection is gone (client-side data errors are not)."""
+    if isinstance(error, (asyncpg.exceptions.PostgresConnectionError, asyncpg.exceptions.ConnectionDoesNotExistError, OSError)):
+        return True
+    return isinstance(error, asyncpg.exceptions.InterfaceError) and not isinstance(error, ValueError)
+
+
+class OfferWriter:
+    """
+    Buffered writer that saves scraped offers in batches.
+
+    Offers are collected in memory and flushed by a background task when the
+    buffer reaches `batch_size` or every `flush_interval` seconds. A flush COPYs
+    the batch into a temporary staging table and merges it into `offers` (see
+    `save_offers`). If a batch fails with a database error, its records are
+    retried one by one so a single bad row cannot drop the rest. A lost
+    connection stops the writer: the error is raised from the next `add()`
+    and from `close()`, so the caller can reconnect.
+
+    The writer owns the connection while it is running: no other queries may be
+    issued on it between `start()` and `close()`.
+
+    `on_saved(offers)` is called after offers are committed and
+    `on_failed(offer, error)` after an offer could not be saved at all. A
+    failing callback is logged; it never causes committed offers to be saved again.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, batch_size: Optional[int] = None, flush_interval: Optional[float] = None,
+                 on_saved: Optional[Callable[[list[dict]], None]] = None, on_failed: Optional[Callable[[dict, str], None]] = None):
+        self.conn = conn
+        self.on_saved = on_saved
+        self.on_failed = on_failed
+        self.batch_size = batch_size or ScrapingConfig.WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval or ScrapingConfig.WRITE_FLUSH_INTERVAL
+        self.written = 0
+        self.failed = 0
+        self._buffer: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Create the staging table and start the background flusher."""
+        await ensure_offer_staging(self.conn)
+        self._task = asyncio.create_task(self._run())
+
+    async def add(self, offer_data: dict):
+        """Queue an offer for writing; never waits for the database (raises if the writer has stopped)."""
+        if self._task is not None and self._task.done():
+            self._task.result()
+        self._buffer.append(offer_data)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def close(self):
+        """Flush everything still buffered and stop the background flusher."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if self.failed:
+            logging.warning(f"⚠️ {self.failed} offers could not be saved")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                await self._flush(batch)
+
+            if self._closing:
+                return
+
+    async def _flush(self, batch: list[dict]):
+        start = time.perf_counter()
+        try:
+            written = await save_offers(self.conn, batch)
+        except DB_ERRORS as e:
+            if is_connection_error(e):
+                raise
+            logging.warning(f"⚠️ Batch write of {len(batch)} offers failed ({e}), retrying one by one")
+            await self._retry_individually(batch)
+            return
+        self.written += written
+        logging.info(f"💾 Saved batch of {len(batch)} offers ({written} new or changed) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        self._callback(self.on_saved, batch)
+
+    async def _retry_individually(self, batch: list[dict]):
+        for offer in batch:
+            try:
+                self.written += await save_offers(self.conn, [offer])
+            except DB_ERRORS as e:
+                if is_connection_error(e):
+                    raise
+                self.failed += 1
+                METRICS.inc("offer_failures_total", error="database")
+                logging.error(f"Database error saving offer {offer.get('job_url')}: {e}")
+                self._callback(self.on_failed, offer, str(e))
+                continue
+            self._callback(self.on_saved, [offer])
+
+    @staticmethod
+    def _callback(callback: Optional[Callable], *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            METRICS.inc("writer_callback_failures_total", error=type(e).__name__)
+            logging.error(f"❌ Offer writer callback {getattr(callback, '__name__', callback)} failed: {e}")
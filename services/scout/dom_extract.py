@@ -0,0 +1,260 @@
+# dom_extract.py
+"""
+Single round-trip extraction of offer pages.
+
+Instead of issuing one Playwright call per element, the selectors from
+`selectors.py` are translated into plain DOM queries and evaluated by one
+in-page script that returns every field at once. Selectors that cannot be
+expressed as DOM queries (or that throw in the page) are reported back so
+the caller can resolve those fields with regular Playwright locators.
+"""
+
+import re
+from typing import Optional
+
+from playwright.async_api import Page
+
+from .selectors import SELECTORS, PATTERNS, get_selector
+from .metrics import timed
+from .selector_health import SELECTOR_HEALTH
+
+# Offer fields read as plain text, mapped to their selectors in priority order
+TEXT_FIELDS: dict[str, tuple] = {
+    "job_title": (SELECTORS.JOB_TITLE,),
+    "location": (SELECTORS.LOCATION,),
+    "company": (SELECTORS.COMPANY,),
+    "category": (SELECTORS.CATEGORY_PILL, SELECTORS.CATEGORY_BREADCRUMB),
+    "work_schedule": (SELECTORS.WORK_SCHEDULE,),
+    "employment_type": (SELECTORS.EMPLOYMENT_TYPE,),
+    "experience": (SELECTORS.EXPERIENCE,),
+    "operating_mode": (SELECTORS.OPERATING_MODE,),
+    "description": (SELECTORS.JOB_DESCRIPTION,),
+}
+
+# Salary columns and the pattern their "per" span has to match
+SALARY_FIELDS: tuple[tuple[str, str], ...] = (
+    ("salary_any", PATTERNS.SALARY_ANY),
+    ("salary_b2b", PATTERNS.SALARY_B2B),
+    ("salary_internship", PATTERNS.SALARY_INTERNSHIP),
+    ("salary_mandate", PATTERNS.SALARY_MANDATE),
+    ("salary_permanent", PATTERNS.SALARY_PERMANENT),
+    ("salary_specific_task", PATTERNS.SALARY_SPECIFIC_TASK),
+)
+
+_NTH_SUFFIX = re.compile(r'^(.*?)\s*>>\s*nth=(\d+)\s*$')
+_HAS_TEXT = re.compile(r':has-text\((["\'])(.*?)\1\)')
+
+
+def field_chain(field: str) -> list[str]:
+    """Return every candidate selector of a text field in configured order."""
+    return list(dict.fromkeys(selector for config in TEXT_FIELDS[field] for selector in config.chain))
+
+
+def field_selectors(field: str) -> list[str]:
+    """Return the candidate selectors of a text field, currently best-performing first."""
+    return SELECTOR_HEALTH.rank(field, field_chain(field))
+
+
+def to_dom_query(selector: str) -> Optional[dict]:
+    """
+    Translate a Playwright selector into a query the in-page script understands.
+
+    Supported forms are plain CSS, `xpath=...`, a trailing `>> nth=N` and a single
+    `:has-text("...")` pseudo-class optionally followed by a combinator
+    (e.g. `h2:has-text("Job description") + div`).
+
+    Args:
+        selector: Playwright selector string
+
+    Returns:
+        Optional[dict]: Query spec, or None when the selector needs Playwright's engine
+    """
+    selector = selector.strip()
+    query: dict = {}
+
+    nth_match = _NTH_SUFFIX.match(selector)
+    if nth_match:
+        selector = nth_match.group(1).strip()
+        query["nth"] = int(nth_match.group(2))
+
+    if selector.startswith("xpath="):
+        query["xpath"] = selector[len("xpath="):]
+        return query
+
+    # Any other Playwright-only chaining or pseudo-class cannot run in the page
+    if ">>" in selector or selector.startswith(("text=", "css=", "internal:")):
+        return None
+
+    text_matches = list(_HAS_TEXT.finditer(selector))
+    if len(text_matches) > 1:
+        return None
+    if text_matches:
+        match = text_matches[0]
+        query["css"] = selector[:match.start()] or "*"
+        query["text"] = match.group(2)
+        query["rest"] = selector[match.end():].strip()
+    else:
+        query["css"] = selector
+
+    if re.search(r':(text|visible|has-text|text-is|text-matches|nth-match|left-of|right-of|above|below|near)\b', query["css"] + query.get("rest", "")):
+        return None
+    return query
+
+
+def build_extraction_spec(chains: Optional[dict[str, list[str]]] = None) -> dict:
+    """
+    Build the argument for `OFFER_EXTRACTION_SCRIPT` from the selector definitions.
+
+    Args:
+        chains: Field -> candidate selectors in the order to try them (default: `field_selectors`)
+    """
+    chains = chains or {field: field_selectors(field) for field in TEXT_FIELDS}
+    return {
+        "fields": {
+            field: [to_dom_query(selector) for selector in chains[field]]
+            for field in TEXT_FIELDS
+        },
+        "tech": {
+            "names": get_selector(SELECTORS.TECH_NAMES),
+            "levels": get_selector(SELECTORS.TECH_LEVELS),
+            "containers": get_selector(SELECTORS.TECH_CONTAINERS),
+        },
+        "salary": {
+            "spans": to_dom_query(get_selector(SELECTORS.SALARY_SPANS)),
+            # Python's re.match anchors at the start only
+            "patterns": [[column, f"^(?:{pattern})"] for column, pattern in SALARY_FIELDS],
+        },
+    }
+
+
+OFFER_EXTRACTION_SCRIPT = """
+(spec) => {
+    const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    const text = (el) => (el.innerText !== undefined ? el.innerText : el.textContent);
+
+    const relative = (el, rest) => {
+        const m = rest.match(/^([+~>])\\s*(.*)$/);
+        if (!m) return Array.from(el.querySelectorAll(':scope ' + rest));
+        const [, comb, sel] = m;
+        if (comb === '>') return Array.from(el.querySelectorAll(':scope > ' + sel));
+        const out = [];
+        for (let sib = el.nextElementSibling; sib; sib = sib.nextElementSibling) {
+            if (!sel || sib.matches(sel)) out.push(sib);
+            if (comb === '+') break;
+        }
+        return out;
+    };
+
+    const resolve = (q) => {
+        let els;
+        if (q.xpath !== undefined) {
+            const r = document.evaluate(q.xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            els = [];
+            for (let i = 0; i < r.snapshotLength; i++) els.push(r.snapshotItem(i));
+        } else {
+            els = Array.from(document.querySelectorAll(q.css));
+            if (q.text !== undefined) {
+                const needle = norm(q.text);
+                els = els.filter((e) => norm(text(e)).includes(needle));
+                if (q.rest) els = els.flatMap((e) => relative(e, q.rest));
+            }
+        }
+        if (q.nth !== undefined) els = els.length > q.nth ? [els[q.nth]] : [];
+        return els;
+    };
+
+    const result = { fields: {}, tech: [], salary: {}, fallback: [], timings: {} };
+
+    for (const [field, queries] of Object.entries(spec.fields)) {
+        let value = null;
+        let needsFallback = false;
+        // Milliseconds per candidate tried; the last one hit if a value was found
+        const timings = [];
+        for (const q of queries) {
+            if (!q) { needsFallback = true; break; }
+            const started = performance.now();
+            try {
+                const els = resolve(q);
+                timings.push(performance.now() - started);
+                if (els.length) { value = text(els[0]); break; }
+            } catch (e) {
+                needsFallback = true;
+                break;
+            }
+        }
+        if (needsFallback && value === null) result.fallback.push(field);
+        else result.fields[field] = value;
+        if (!needsFallback) result.timings[field] = timings;
+    }
+
+    // Tech stack: h4 name + first span of its parent, then generic containers
+    try {
+        const tech = new Map();
+        for (const h of document.querySelectorAll(spec.tech.names)) {
+            const name = text(h).trim();
+            const span = name && h.parentElement ? h.parentElement.querySelector(spec.tech.levels) : null;
+            const level = span ? text(span).trim() : '';
+            if (level) tech.set(name, level);
+        }
+        if (!tech.size) {
+            const containers = Array.from(document.querySelectorAll(spec.tech.containers)).slice(0, 20);
+            for (const c of containers) {
+                const h = c.querySelector(spec.tech.names);
+                const span = c.querySelector(spec.tech.levels);
+                if (!h || !span) continue;
+                const name = text(h);
+                const level = text(span);
+                if (name.trim() && level.trim() && name.length < 50 && level.length < 20) {
+                    tech.set(name.trim(), level.trim());
+                }
+            }
+        }
+        result.tech = Array.from(tech.entries());
+    } catch (e) {
+        result.fallback.push('tech_stack');
+    }
+
+    // Salaries: span text decides the contract type, its parent holds the amount
+    try {
+        if (!spec.salary.spans) throw new Error('unsupported salary selector');
+        const patterns = spec.salary.patterns.map(([col, p]) => [col, new RegExp(p, 'i')]);
+        for (const span of resolve(spec.salary.spans)) {
+            const spanText = text(span).trim();
+            const hit = patterns.find(([, re]) => re.test(spanText));
+            if (hit && span.parentElement) result.salary[hit[0]] = text(span.parentElement);
+        }
+    } catch (e) {
+        result.fallback.push('salary');
+    }
+
+    return result;
+}
+"""
+
+
+@timed("extraction", method="single_pass")
+async def evaluate_offer(page: Page) -> dict:
+    """
+    Extract all offer fields in a single `page.evaluate()` round trip.
+
+    Args:
+        page: Playwright page with the offer loaded
+
+    Returns:
+        dict: Raw field values plus `tech_stack` ({name: level}) and a
+        `fallback` list naming fields that must be resolved with locators
+    """
+    chains = {field: field_selectors(field) for field in TEXT_FIELDS}
+    result = await page.evaluate(OFFER_EXTRACTION_SCRIPT, build_extraction_spec(chains))
+
+    for field, timings in result["timings"].items():
+        found = result["fields"].get(field) is not None
+        for i, ms in enumerate(timings):
+            SELECTOR_HEALTH.record(field, chains[field][i], found and i == len(timings) - 1, ms)
+
+    raw: dict = dict(result["fields"])
+    raw["tech_stack"] = {name: level for name, level in result["tech"]}
+    for column, _ in SALARY_FIELDS:
+        raw[column] = result["salary"].get(column)
+    raw["fallback"] = list(result["fallback"])
+    return raw
@@ -0,0 +1,184 @@
+# farm.py
+"""
+Multi-process browser farm.
+
+One Chromium driven by one asyncio loop keeps a single core busy. In farm
+mode the parent applies the refresh policy once, splits the selected URLs
+into K shards and hands each to a separate process with its own event loop,
+Playwright browser, page pool and database connection. Each child runs the
+regular `process_offers` on its shard; the parent aggregates their results.
+
+Children are started with the `spawn` method (Playwright does not survive a
+fork) and inherit the environment, including database credentials loaded
+from Secrets Manager. Only the parent writes the run journal: children
+return their per-URL outcomes with their statistics and the parent records
+them, so `--resume` keeps working without concurrent SQLite writers. Offers
+of a crashed child stay pending.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from playwright.async_api import Page
+
+from .config import ScrapingConfig
+from .db import fetch_offer_state
+from .freshness import select_offers_to_scrape
+from .journal import RunJournal
+from .metrics import METRICS
+from .selector_health import SELECTOR_HEALTH
+
+
+class _ShardReport:
+    """Collects per-URL outcomes in a child; the parent records them in the run journal."""
+
+    def __init__(self):
+        self.done: list[str] = []
+        self.failed: list[tuple[str, str]] = []
+
+    def mark_done(self, urls: list[str]):
+        self.done.extend(urls)
+
+    def mark_failed(self, url: str, error: str):
+        self.failed.append((url, error))
+
+
+async def _process_shard(index: int, urls: list[str], listings: dict) -> dict:
+    # Imported here so the parent does not need a browser to build the pool
+    from .db import init_db_connection
+    from .navigation import NavigationProfile
+    from .scrape_core import init_browser, process_offers
+
+    report = _ShardReport()
+    conn = await init_db_connection()
+    profile = NavigationProfile() if ScrapingConfig.FAST_NAVIGATION else None
+    if profile is not None and index > 1:
+        # The networkidle baseline only needs measuring once per run
+        profile.calibrated = True
+    playwright, browser, page = await init_browser(headless=ScrapingConfig.HEADLESS, profile=profile)
+
+    started = time.perf_counter()
+    try:
+        processed_count, page = await process_offers(
+            page, conn, urls, browser, playwright,
+            profile=profile, listings=listings, journal=report, refresh_policy=False,
+        )
+    finally:
+        await conn.close()
+        await (page.context.browser or browser).close()
+        await playwright.stop()
+
+    return {
+        "index": index,
+        "urls": len(urls),
+        "processed": processed_count,
+        "done": report.done,
+        "failed": report.failed,
+        "elapsed": time.perf_counter() - started,
+        "ready_ms_total": profile.ready_ms_total if profile else 0.0,
+        "bytes_total": profile.bytes_total if profile else 0,
+        "blocked_total": profile.blocked_total if profile else 0,
+        "navigations": profile.offers if profile else 0,
+        "metrics": METRICS.snapshot(),
+        "selectors": SELECTOR_HEALTH.snapshot(),
+    }
+
+
+def run_shard(index: int, urls: list[str], listings: dict) -> dict:
+    """
+    Entry point of a farm process: scrape one shard of URLs.
+
+    Args:
+        index: Shard number (used in log lines; shard 1 measures the navigation baseline)
+        urls: Offer URLs assigned to this process
+        listings: Offer URL -> listing fields for those URLs
+
+    Returns:
+        dict: Shard statistics (processed, done URLs, failed (URL, error) pairs, elapsed, navigation totals)
+    """
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [%(levelname)s] [worker {index}] %(message)s")
+    return asyncio.run(_process_shard(index, urls, listings))
+
+
+def split_shards(urls: list[str], processes: int) -> list[list[str]]:
+    """Deal URLs round-robin so every shard gets a mix of new, changed and due offers."""
+    shards = [urls[i::processes] for i in range(processes)]
+    return [shard for shard in shards if shard]
+
+
+async def process_offers_farm(page: Page, conn, offer_urls: list[str], processes: int, listings: Optional[dict] = None, journal: Optional[RunJournal] = None) -> tuple[int, Page]:
+    """
+    Process job offers across `processes` worker processes.
+
+    Same contract as `process_offers`: the refresh policy is applied here,
+    the selected offers are scraped by the children and the number of offers
+    inserted or changed is returned together with the (untouched) parent page.
+
+    Args:
+        page: Parent Playwright page (not used for scraping)
+        conn: Database connection, used for the refresh policy only
+        offer_urls: List of job offer URLs to process
+        processes: Number of worker processes
+        listings: Offer URL -> listing fields from `collect_offer_listings` (optional)
+        journal: Run journal, updated with the children's outcomes (optional, enables --resume)
+
+    Returns:
+        tuple[int, Page]: Number of offers inserted or changed and the parent page
+    """
+    listings = listings or {}
+    selected = select_offers_to_scrape(offer_urls, await fetch_offer_state(conn), listings)
+    if journal is not None:
+        chosen = set(selected)
+        journal.mark_done([url for url in offer_urls if url not in chosen])
+
+    if not selected:
+        logging.info("✅ No offers to process - all offers are up to date in database")
+        return 0, page
+
+    shards = split_shards(selected, processes)
+    logging.info(f"🏭 Processing {len(selected)} offers in {len(shards)} processes × {ScrapingConfig.MAX_CONCURRENT_PAGES} pages")
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            loop.run_in_executor(pool, run_shard, i, shard, {url: listings[url] for url in shard if url in listings})
+            for i, shard in enumerate(shards, 1)
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    stats = []
+    for shard, result in zip(shards, results):
+        if isinstance(result, BaseException):
+            # Offers of a crashed process stay pending in the journal
+            logging.error(f"❌ Worker process failed on a shard of {len(shard)} offers: {result}")
+            continue
+        stats.append(result)
+        METRICS.merge(result["metrics"])
+        SELECTOR_HEALTH.merge(result["selectors"])
+        if journal is not None:
+            journal.mark_done(result["done"])
+            for url, error in result["failed"]:
+                journal.mark_failed(url, error)
+        logging.info(f"🏭 Worker {result['index']}: {result['urls']} offers in {result['elapsed']:.0f} s, "
+                     f"{result['processed']} new or changed, {len(result['failed'])} failed")
+
+    processed_count = sum(s["processed"] for s in stats)
+    failed_count = sum(len(s["failed"]) for s in stats) + sum(len(shard) for shard, r in zip(shards, results) if isinstance(r, BaseException))
+    navigations = sum(s["navigations"] for s in stats)
+    if navigations:
+        avg_ms = sum(s["ready_ms_total"] for s in stats) / navigations
+        avg_kb = sum(s["bytes_total"] for s in stats) / navigations / 1024
+        blocked = sum(s["blocked_total"] for s in stats)
+        logging.info(f"⚡ Fast navigation: {navigations} offers, avg ready {avg_ms:.0f} ms, avg {avg_kb:.0f} KB, {blocked} requests blocked")
+    logging.info(f"🏭 Farm throughput: {len(selected) / elapsed * 60:.1f} offers/min over {elapsed:.0f} s")
+
+    if failed_count:
+        logging.warning(f"⚠️ Failed to process {failed_count} offers")
+    logging.info(f"✅ Processed {len(selected)} offers ({processed_count} new or changed)")
+    return processed_count, page
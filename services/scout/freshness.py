@@ -0,0 +1,69 @@
+# freshness.py
+"""
+Change detection and refresh policy for incremental re-scraping.
+
+Offers already in the database are only visited again when the listing
+reports different data for them (listing hash) or when their last scrape is
+older than `ScrapingConfig.REFRESH_AFTER_DAYS`.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .config import ScrapingConfig
+from .db import OFFER_COLUMNS
+
+
+def _digest(data) -> str:
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(offer_data: dict) -> str:
+    """Hash of every scraped column except the URL itself."""
+    return _digest({column: offer_data.get(column) for column in OFFER_COLUMNS if column != "job_url"})
+
+
+def listing_hash(listing: Optional[dict]) -> Optional[str]:
+    """Hash of the listing-level fields of an offer (None when the listing carried none)."""
+    return _digest(listing) if listing else None
+
+
+def select_offers_to_scrape(offer_urls: list[str], existing: dict, listings: Optional[dict] = None) -> list[str]:
+    """
+    Apply the refresh policy to the collected offers.
+
+    Args:
+        offer_urls: Offer URLs currently listed on the website
+        existing: job_url -> record with `listing_hash` and `scraped_at` for offers in the database
+        listings: Offer URL -> listing fields, when the collector captured them
+
+    Returns:
+        list[str]: URLs to visit - new offers first, then changed, then due for refresh
+    """
+    listings = listings or {}
+    refresh_before = datetime.now() - timedelta(days=ScrapingConfig.REFRESH_AFTER_DAYS)
+    new, changed, due = [], [], []
+
+    for url in offer_urls:
+        record = existing.get(url)
+        if record is None:
+            new.append(url)
+            continue
+        current_hash = listing_hash(listings.get(url))
+        # Offers saved before listing hashes existed get one from mark_seen_offers instead of counting as changed
+        if current_hash is not None and record["listing_hash"] is not None and current_hash != record["listing_hash"]:
+            changed.append(url)
+        elif record["scraped_at"] is None or record["scraped_at"] < refresh_before:
+            due.append(url)
+
+    skipped = len(offer_urls) - len(new) - len(changed) - len(due)
+    logging.info(f"📊 Total collected: {len(offer_urls)} offers")
+    logging.info(f"🆕 New offers to process: {len(new)} offers")
+    logging.info(f"✏️ Changed on listing: {len(changed)} offers")
+    logging.info(f"⏰ Due for refresh (> {ScrapingConfig.REFRESH_AFTER_DAYS} days): {len(due)} offers")
+    logging.info(f"⏭️ Up to date in database: {skipped} offers")
+    return new + changed + due
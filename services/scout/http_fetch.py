@@ -0,0 +1,302 @@
+# http_fetch.py
+"""
+HTTP-only fast path for offer pages.
+
+Offer pages are server-rendered and embed the offer as structured data: a
+JSON-LD `JobPosting` and the framework state (Next.js `__NEXT_DATA__` or
+app-router flight chunks). `OfferFetcher` downloads the HTML over a pooled
+HTTP/2 keep-alive connection and maps that data onto the same raw fields the
+browser extraction produces. Pages where the structured data is missing or
+incomplete return None and go through Playwright as before.
+"""
+
+import json
+import logging
+import re
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import Optional
+
+import httpx
+
+from .config import ScrapingConfig
+from .dom_extract import TEXT_FIELDS, SALARY_FIELDS
+from .listing_capture import iter_json_fragments, iter_listing_items
+from .rate_control import ThrottledResponse, is_throttle_status, parse_retry_after
+from .metrics import METRICS, timed
+
+_LD_JSON = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+_NEXT_DATA = re.compile(r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+_NEXT_FLIGHT = re.compile(r'self\.__next_f\.push\(\[\d+,\s*("(?:[^"\\]|\\.)*")\]\)', re.S)
+
+# Framework-state enums mapped to the labels shown on the offer page
+_EXPERIENCE = {"junior": "Junior", "mid": "Mid", "senior": "Senior", "c_level": "C-level", "manager": "Manager"}
+_OPERATING_MODE = {"remote": "Remote", "hybrid": "Hybrid", "office": "Office"}
+_WORK_SCHEDULE = {"full_time": "Full-time", "part_time": "Part-time", "practice_internship": "Internship", "freelance": "Freelance"}
+_EMPLOYMENT_TYPE = {
+    "b2b": "B2B", "permanent": "Permanent", "mandate_contract": "Mandate", "mandate": "Mandate",
+    "specific_task_contract": "Specific-task", "specific-task": "Specific-task", "internship": "Internship", "any": "Any",
+}
+_SKILL_LEVEL = {1: "Nice To Have", 2: "Junior", 3: "Regular", 4: "Advanced", 5: "Master"}
+_SALARY_COLUMN = {
+    "B2B": "salary_b2b", "Permanent": "salary_permanent", "Mandate": "salary_mandate",
+    "Specific-task": "salary_specific_task", "Internship": "salary_internship", "Any": "salary_any",
+}
+
+# Fields an offer must have for the fast path to count as a hit (experience only comes with the framework state)
+REQUIRED_FIELDS = ("job_title", "company", "location", "description", "experience")
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text of an HTML fragment, one line per block element."""
+
+    _BLOCKS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._BLOCKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (re.sub(r"[ \t\xa0]+", " ", line).strip() for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def html_to_text(fragment: Optional[str]) -> Optional[str]:
+    """Plain text of an HTML fragment (the description body)."""
+    if not isinstance(fragment, str):
+        return None
+    parser = _TextExtractor()
+    parser.feed(fragment)
+    return parser.text() or None
+
+
+def _format_amount(value) -> str:
+    """Format a salary amount like the offer page does (`25 000`)."""
+    number = float(value)
+    return f"{number:,.0f}".replace(",", " ") if number.is_integer() else f"{number:,.2f}".replace(",", " ")
+
+
+def format_salary(amount_from, amount_to, currency: str, gross: bool, unit: str, contract: str) -> Optional[str]:
+    """Render a salary the way the offer page shows it (`20 000 - 25 000 PLN\\nNet per month - B2B`)."""
+    if amount_from is None and amount_to is None:
+        return None
+    amounts = [_format_amount(a) for a in (amount_from, amount_to) if a is not None]
+    if len(amounts) == 2 and amounts[0] == amounts[1]:
+        amounts = amounts[:1]
+    return f"{' - '.join(amounts)} {currency.upper()}\n{'Gross' if gross else 'Net'} per {unit.lower()} - {contract}"
+
+
+def _offer_state(offer: dict) -> dict:
+    """Map a framework-state offer object onto raw offer fields."""
+    raw: dict = {
+        "job_title": offer.get("title"),
+        "company": offer.get("companyName"),
+        # The page shows "city, street"
+        "location": ", ".join(part for part in (offer.get("city"), offer.get("street")) if isinstance(part, str) and part),
+        "experience": _EXPERIENCE.get(offer.get("experienceLevel"), offer.get("experienceLevel")),
+        "operating_mode": _OPERATING_MODE.get(offer.get("workplaceType"), offer.get("workplaceType")),
+        "work_schedule": _WORK_SCHEDULE.get(offer.get("workingTime"), offer.get("workingTime")),
+        "description": html_to_text(offer.get("body")),
+    }
+
+    category = offer.get("category")
+    if isinstance(category, dict):
+        category = category.get("name")
+    if isinstance(category, str):
+        raw["category"] = category
+
+    contracts = []
+    for employment in offer.get("employmentTypes") or []:
+        if not isinstance(employment, dict):
+            continue
+        contract = _EMPLOYMENT_TYPE.get(str(employment.get("type", "")).lower())
+        if not contract:
+            continue
+        contracts.append(contract)
+        salary = format_salary(
+            employment.get("from"), employment.get("to"), str(employment.get("currency") or ""),
+            bool(employment.get("gross")), str(employment.get("unit") or "month"), contract,
+        ) if employment.get("currency") else None
+        if salary:
+            raw[_SALARY_COLUMN[contract]] = salary
+    if contracts:
+        raw["employment_type"] = ", ".join(dict.fromkeys(contracts))
+
+    tech_stack = {}
+    for skill in (offer.get("requiredSkills") or []) + (offer.get("niceToHaveSkills") or []):
+        if isinstance(skill, dict) and isinstance(skill.get("name"), str):
+            level = skill.get("level")
+            tech_stack[skill["name"].strip()] = _SKILL_LEVEL.get(level, str(level) if level is not None else "")
+    if tech_stack:
+        raw["tech_stack"] = tech_stack
+    return {key: value for key, value in raw.items() if value}
+
+
+def _job_posting(node) -> Optional[dict]:
+    """Find the JobPosting object in a JSON-LD document (plain, list or @graph)."""
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            kind = item.get("@type")
+            if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+                return item
+            stack.extend(item.get("@graph") or [])
+    return None
+
+
+def _json_ld_fields(posting: dict) -> dict:
+    """Map a JSON-LD JobPosting onto raw offer fields."""
+    raw: dict = {"job_title": posting.get("title"), "description": html_to_text(posting.get("description"))}
+
+    organization = posting.get("hiringOrganization")
+    if isinstance(organization, dict):
+        raw["company"] = organization.get("name")
+
+    locations = posting.get("jobLocation")
+    for location in locations if isinstance(locations, list) else [locations]:
+        address = location.get("address") if isinstance(location, dict) else None
+        if isinstance(address, dict) and address.get("addressLocality"):
+            raw["location"] = address["addressLocality"]
+            break
+    return {key: value for key, value in raw.items() if value}
+
+
+def parse_offer_html(job_url: str, html: str) -> Optional[dict]:
+    """
+    Extract raw offer fields from an offer page's embedded structured data.
+
+    Framework state is preferred (it carries levels and every contract type);
+    JSON-LD fills in whatever it lacks.
+
+    Args:
+        job_url: Offer URL, used to pick the right object from the state
+        html: Server-rendered offer page
+
+    Returns:
+        Optional[dict]: Raw fields in the shape of `extract_offer_raw`, or None
+        when the page does not carry the required fields
+    """
+    fields: dict = {}
+
+    state_chunks = [m.group(1) for m in _NEXT_DATA.finditer(html)]
+    flight = []
+    for match in _NEXT_FLIGHT.finditer(html):
+        try:
+            flight.append(json.loads(match.group(1)))
+        except ValueError:
+            continue
+    candidates = []
+    for chunk in state_chunks:
+        try:
+            candidates.append(json.loads(chunk))
+        except ValueError:
+            continue
+    if flight:
+        candidates.extend(iter_json_fragments("".join(flight)))
+
+    offers = [item for payload in candidates for url, item in iter_listing_items(payload) if url == job_url]
+    if offers:
+        # The detail object carries the most keys (listing cards of related offers share the slug format)
+        fields.update(_offer_state(max(offers, key=len)))
+
+    for block in _LD_JSON.finditer(html):
+        try:
+            posting = _job_posting(json.loads(block.group(1)))
+        except ValueError:
+            continue
+        if posting:
+            for key, value in _json_ld_fields(posting).items():
+                fields.setdefault(key, value)
+            break
+
+    if not all(fields.get(field) for field in REQUIRED_FIELDS):
+        return None
+
+    raw: dict = {field: fields.get(field) for field in TEXT_FIELDS}
+    raw["tech_stack"] = fields.get("tech_stack") or {}
+    for column, _ in SALARY_FIELDS:
+        raw[column] = fields.get(column)
+    return raw
+
+
+class OfferFetcher:
+    """Pooled HTTP/2 client fetching offers without a browser, with hit-rate accounting."""
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client or httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT / 1000,
+            limits=httpx.Limits(
+                max_connections=ScrapingConfig.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=ScrapingConfig.HTTP_MAX_CONNECTIONS,
+            ),
+            headers={
+                "User-Agent": ScrapingConfig.HTTP_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml",
+                "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+            },
+        )
+        self.attempts = 0
+        self.hits = 0
+        self.misses: dict[str, int] = defaultdict(int)
+
+    @timed("http_fetch")
+    async def fetch_raw(self, href: str) -> Optional[dict]:
+        """
+        Fetch an offer page and parse its structured data.
+
+        Returns:
+            Optional[dict]: Raw offer fields, or None if the page must go through Playwright
+
+        Raises:
+            ThrottledResponse: On HTTP 429 / 5xx - the browser would be throttled just the same
+        """
+        self.attempts += 1
+        try:
+            response = await self.client.get(href)
+        except httpx.HTTPError as e:
+            self.misses["network"] += 1
+            logging.debug(f"HTTP fast path failed for {href}: {e}")
+            return None
+        if is_throttle_status(response.status_code):
+            self.misses[f"http {response.status_code}"] += 1
+            raise ThrottledResponse(href, response.status_code, parse_retry_after(response.headers.get("retry-after")))
+        if response.status_code != 200:
+            self.misses[f"http {response.status_code}"] += 1
+            return None
+
+        try:
+            raw = parse_offer_html(href, response.text)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not parse structured data of {href}: {e}")
+            raw = None
+        if raw is None:
+            self.misses["no structured data"] += 1
+            METRICS.inc("http_fast_path_total", result="no structured data")
+            return None
+
+        self.hits += 1
+        METRICS.inc("http_fast_path_total", result="hit")
+        return raw
+
+    def log_summary(self):
+        """Log the fast-path hit rate and why the misses went to Playwright."""
+        if not self.attempts:
+            return
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.misses.items()))
+        logging.info(f"🚀 HTTP fast path: {self.hits}/{self.attempts} offers ({self.hits / self.attempts:.0%} hit rate), "
+                     f"{self.attempts - self.hits} via Playwright" + (f" ({reasons})" if reasons else ""))
+
+    async def close(self):
+        await self.client.aclose()
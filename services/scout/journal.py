@@ -0,0 +1,155 @@
+# journal.py
+"""
+Crash-safe run journal for scrape runs.
+
+Each run gets a small SQLite file under `ScrapingConfig.JOURNAL_DIR` holding
+the collected offer links (with their listing fields) and the state of every
+URL: pending, done or failed (with the number of attempts). If the process
+dies, `python -m scout --resume` reopens the newest unfinished journal and
+continues with the URLs that are not done yet instead of re-scrolling the
+whole listing.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import ScrapingConfig
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    listing TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_state ON urls(state);
+"""
+
+
+class RunJournal:
+    """Append-only record of one scrape run, backed by SQLite."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(_SCHEMA)
+
+    @classmethod
+    def create(cls, directory: Optional[str] = None) -> "RunJournal":
+        """Start a journal for a new run."""
+        journal_dir = Path(directory or ScrapingConfig.JOURNAL_DIR)
+        journal_dir.mkdir(parents=True, exist_ok=True)
+        journal = cls(journal_dir / f"run-{time.strftime('%Y%m%d-%H%M%S')}.sqlite3")
+        journal._set("status", "collecting")
+        journal._set("started_at", str(time.time()))
+        logging.info(f"📓 Run journal: {journal.path}")
+        return journal
+
+    @classmethod
+    def latest_unfinished(cls, directory: Optional[str] = None) -> Optional["RunJournal"]:
+        """Reopen the newest journal whose run did not finish, if any."""
+        journal_dir = Path(directory or ScrapingConfig.JOURNAL_DIR)
+        for path in sorted(journal_dir.glob("run-*.sqlite3"), reverse=True):
+            journal = cls(path)
+            if journal._get("status") != "finished":
+                logging.info(f"📓 Resuming run journal: {path}")
+                return journal
+            journal.close()
+        return None
+
+    def _set(self, key: str, value: str):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO run (key, value) VALUES (?, ?)", (key, value))
+
+    def _get(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM run WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def has_links(self) -> bool:
+        """Whether link collection completed for this run."""
+        return self._get("status") in ("processing", "finished")
+
+    def record_links(self, listings: dict[str, dict]):
+        """Store the collected offer URLs (and listing fields) as pending."""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO urls (url, listing, updated_at) VALUES (?, ?, ?)",
+                [(url, json.dumps(fields, ensure_ascii=False), now) for url, fields in listings.items()]
+            )
+        self._set("status", "processing")
+
+    def listings(self) -> dict[str, dict]:
+        """All collected offers with their listing fields."""
+        return {url: json.loads(listing or "{}") for url, listing in self.db.execute("SELECT url, listing FROM urls")}
+
+    def pending_urls(self) -> list[str]:
+        """URLs still to process: pending ones and failed ones with attempts left."""
+        rows = self.db.execute(
+            "SELECT url FROM urls WHERE state = 'pending' OR (state = 'failed' AND attempts < ?) ORDER BY rowid",
+            (ScrapingConfig.JOURNAL_MAX_ATTEMPTS,)
+        )
+        return [url for (url,) in rows]
+
+    def mark_done(self, urls: list[str]):
+        """Mark URLs whose offers are safely stored in the database."""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "UPDATE urls SET state = 'done', attempts = attempts + 1, error = NULL, updated_at = ? WHERE url = ?",
+                [(now, url) for url in urls]
+            )
+
+    def mark_failed(self, url: str, error: str):
+        """Mark a URL whose scrape or save failed."""
+        with self.db:
+            self.db.execute(
+                "UPDATE urls SET state = 'failed', attempts = attempts + 1, error = ?, updated_at = ? WHERE url = ?",
+                (error[:500], time.time(), url)
+            )
+
+    def summary(self) -> dict[str, int]:
+        """Number of URLs per state."""
+        return dict(self.db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    @staticmethod
+    def _status(path: Path) -> Optional[str]:
+        """Run status stored in a journal file (None when it cannot be read)."""
+        try:
+            db = sqlite3.connect(str(path), timeout=1)
+            try:
+                row = db.execute("SELECT value FROM run WHERE key = 'status'").fetchone()
+            finally:
+                db.close()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def finish(self):
+        """Mark the run as finished and drop older finished journals (unfinished ones are kept for --resume)."""
+        self._set("status", "finished")
+        logging.info(f"📓 Run journal finished: {self.summary()}")
+        finished = [
+            path for path in sorted(self.path.parent.glob("run-*.sqlite3"), reverse=True)
+            if path == self.path or self._status(path) == "finished"
+        ]
+        for path in finished[ScrapingConfig.JOURNAL_KEEP:]:
+            if path != self.path:
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+    def close(self):
+        self.db.close()
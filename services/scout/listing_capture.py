@@ -0,0 +1,308 @@
+# listing_capture.py
+"""
+Network-response capture for the job offer listing.
+
+The listing loads its offers from JSON endpoints as the page scrolls, and the
+first page of results is embedded in the HTML. Reading those payloads gives
+the full URL set (and the basic offer fields) without querying the DOM for
+every link after every scroll.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Iterator, Optional
+
+from playwright.async_api import Page, Response
+
+from .config import ScrapingConfig
+
+# Listing payload keys mapped to `offers` columns
+_LISTING_FIELDS = {
+    "title": "job_title",
+    "companyName": "company",
+    "city": "location",
+    "experienceLevel": "experience",
+    "workplaceType": "operating_mode",
+    "workingTime": "work_schedule",
+}
+
+# Keys holding the listing's total number of offers (top level, or under `meta` / `pagination`)
+_TOTAL_KEYS = ("totalItems", "totalCount", "totalOffers", "total")
+
+# Collects embedded data: Next.js pages-router JSON, app-router flight chunks and JSON-LD
+_EMBEDDED_DATA_SCRIPT = """
+() => {
+    const chunks = [];
+    const next = document.getElementById('__NEXT_DATA__');
+    if (next) chunks.push(next.textContent);
+    for (const s of document.querySelectorAll('script[type="application/ld+json"]')) chunks.push(s.textContent);
+    if (Array.isArray(self.__next_f)) {
+        chunks.push(self.__next_f.filter((c) => typeof c[1] === 'string').map((c) => c[1]).join(''));
+    }
+    return chunks;
+}
+"""
+
+
+# Installs a page-side Set of offer hrefs fed by a MutationObserver
+_HARVESTER_INSTALL_SCRIPT = """
+(selector) => {
+    if (window.__scoutLinks) return window.__scoutLinks.seen.size;
+    const seen = new Set();
+    const pending = [];
+    const add = (el) => {
+        const href = el.getAttribute('href');
+        if (href && !seen.has(href)) {
+            seen.add(href);
+            pending.push(href);
+        }
+    };
+    const scan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.matches(selector)) add(node);
+        node.querySelectorAll(selector).forEach(add);
+    };
+    scan(document.documentElement);
+    const observer = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            if (m.type === 'attributes') scan(m.target);
+            else m.addedNodes.forEach(scan);
+        }
+    });
+    observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true, attributeFilter: ['href'] });
+    window.__scoutLinks = { seen, pending, observer };
+    return seen.size;
+}
+"""
+
+# Returns the hrefs found since the previous call and scrolls one viewport (null if the harvester is gone)
+_HARVESTER_DRAIN_SCRIPT = """
+() => {
+    const state = window.__scoutLinks;
+    if (!state) return null;
+    const delta = state.pending.splice(0);
+    window.scrollBy(0, window.innerHeight);
+    return delta;
+}
+"""
+
+_HARVESTER_STOP_SCRIPT = """
+() => {
+    const state = window.__scoutLinks;
+    if (state) state.observer.disconnect();
+    delete window.__scoutLinks;
+}
+"""
+
+
+def offer_url(slug: str) -> str:
+    """Build the absolute offer URL for a listing slug."""
+    return f"{ScrapingConfig.BASE_URL}/job-offer/{slug}"
+
+
+def normalize_offer_href(href: str) -> Optional[str]:
+    """Return an absolute job offer URL, or None if `href` is not an offer link."""
+    if not href or '/job-offer/' not in href:
+        return None
+    if href.startswith('/'):
+        return f"{ScrapingConfig.BASE_URL}{href}"
+    return href
+
+
+def _skill_names(skills) -> list[str]:
+    names = []
+    for skill in skills or []:
+        if isinstance(skill, dict):
+            skill = skill.get("name")
+        if isinstance(skill, str) and skill.strip():
+            names.append(skill.strip())
+    return names
+
+
+def listing_fields(item: dict) -> dict:
+    """Map a listing payload item onto `offers` columns (only the fields the listing carries)."""
+    fields = {column: item[key] for key, column in _LISTING_FIELDS.items() if isinstance(item.get(key), str)}
+
+    if "location" not in fields:
+        locations = item.get("multilocation") or item.get("locations") or []
+        if locations and isinstance(locations[0], dict) and isinstance(locations[0].get("city"), str):
+            fields["location"] = locations[0]["city"]
+
+    employment_types = [e.get("type") for e in item.get("employmentTypes") or [] if isinstance(e, dict) and e.get("type")]
+    if employment_types:
+        fields["employment_type"] = ", ".join(employment_types)
+
+    skills = _skill_names(item.get("requiredSkills")) + _skill_names(item.get("niceToHaveSkills"))
+    if skills:
+        fields["skills"] = skills
+    return fields
+
+
+def iter_listing_items(payload) -> Iterator[tuple[str, dict]]:
+    """Walk an arbitrary JSON payload and yield (offer URL, listing item) pairs."""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            slug = node.get("slug")
+            if isinstance(slug, str) and slug and ("title" in node or "companyName" in node):
+                yield offer_url(slug), node
+                continue
+            url = node.get("url")
+            if isinstance(url, str) and node.get("@type") == "JobPosting":
+                href = normalize_offer_href(url)
+                if href:
+                    yield href, {"title": node.get("title")}
+                    continue
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def reported_total(payload) -> Optional[int]:
+    """Total number of offers a listing payload reports for the whole listing, if it carries one."""
+    if not isinstance(payload, dict):
+        return None
+    for container in (payload, payload.get("meta"), payload.get("pagination")):
+        if isinstance(container, dict):
+            for key in _TOTAL_KEYS:
+                value = container.get(key)
+                if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                    return value
+    return None
+
+
+def iter_json_fragments(text: str) -> Iterator[object]:
+    """Yield JSON objects embedded in a larger text blob (e.g. a flight payload) around each `"slug"` key."""
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        position = text.find('"slug"', position)
+        if position == -1:
+            return
+        # Walk back to the opening brace of the object holding the slug
+        start = text.rfind('{', 0, position)
+        tries = 0
+        while start != -1 and tries < 5:
+            try:
+                obj, end = decoder.raw_decode(text, start)
+            except ValueError:
+                end = -1
+            if end > position:
+                yield obj
+                position = end
+                break
+            # Malformed, or a nested object that closes before the slug
+            start = text.rfind('{', 0, start)
+            tries += 1
+        position += 1
+
+
+class ListingCapture:
+    """Accumulates offers seen in listing JSON responses and embedded page data."""
+
+    def __init__(self):
+        self.offers: dict[str, dict] = {}
+        self.responses = 0
+        self.reported_total: Optional[int] = None  # Largest total the listing reported
+        self._pending: set[asyncio.Task] = set()
+
+    def ingest(self, payload) -> int:
+        """
+        Add every offer found in a payload; returns how many were new.
+
+        An offer seen again (in another response, or in JSON-LD carrying only
+        its title) keeps the fields captured so far: only the non-empty new
+        fields are merged in, so its listing hash does not depend on which
+        payload came last.
+        """
+        total = reported_total(payload)
+        if total is not None:
+            self.reported_total = max(self.reported_total or 0, total)
+        new = 0
+        for url, item in iter_listing_items(payload):
+            if url not in self.offers:
+                new += 1
+            fields = self.offers.setdefault(url, {})
+            fields.update((column, value) for column, value in listing_fields(item).items() if value)
+        return new
+
+    @staticmethod
+    def is_listing_response(response: Response) -> bool:
+        """Whether a response looks like a JSON offer listing payload."""
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        return "json" in response.headers.get("content-type", "")
+
+    async def _parse(self, response: Response):
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        self.responses += 1
+        self.ingest(payload)
+
+    def _on_response(self, response: Response):
+        if self.is_listing_response(response):
+            task = asyncio.ensure_future(self._parse(response))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def attach(self, page: Page):
+        """Start listening to the page's responses."""
+        page.on("response", self._on_response)
+
+    def detach(self, page: Page):
+        """Stop listening to the page's responses."""
+        page.remove_listener("response", self._on_response)
+
+    async def drain(self):
+        """Wait until every captured response has been parsed."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def read_embedded(self, page: Page) -> int:
+        """Ingest offers embedded in the current document; returns how many were new."""
+        try:
+            chunks = await page.evaluate(_EMBEDDED_DATA_SCRIPT)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not read embedded listing data: {e}")
+            return 0
+
+        new = 0
+        for chunk in chunks:
+            try:
+                new += self.ingest(json.loads(chunk))
+            except (TypeError, ValueError):
+                for fragment in iter_json_fragments(chunk or ""):
+                    new += self.ingest(fragment)
+        return new
+
+
+class LinkHarvester:
+    """In-page MutationObserver that records offer links as the listing renders them."""
+
+    def __init__(self, page: Page, selector: str):
+        self.page = page
+        self.selector = selector
+
+    async def install(self):
+        """Inject the observer (idempotent per document)."""
+        await self.page.evaluate(_HARVESTER_INSTALL_SCRIPT, self.selector)
+
+    async def drain_and_scroll(self) -> list[str]:
+        """Return the hrefs added since the last call and scroll one viewport, in one round trip."""
+        delta = await self.page.evaluate(_HARVESTER_DRAIN_SCRIPT)
+        if delta is None:
+            # The document was replaced; the new one gets a fresh observer (and its current links)
+            await self.install()
+            delta = await self.page.evaluate(_HARVESTER_DRAIN_SCRIPT)
+        return delta or []
+
+    async def stop(self):
+        """Disconnect the observer and drop the page-side state."""
+        try:
+            await self.page.evaluate(_HARVESTER_STOP_SCRIPT)
+        except Exception:
+            pass
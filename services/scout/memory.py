@@ -0,0 +1,181 @@
+# memory.py
+"""
+Memory-driven browser recycling.
+
+Instead of relaunching Chromium every `RESTART_BROWSER_EVERY` offers,
+`MemoryMonitor` samples what the browser actually uses: the proportional set
+size of every process Playwright started (browser, GPU, renderers) from
+`/proc`, and the JS heap of the page that just finished an offer.
+
+- A page heap above `CONTEXT_HEAP_LIMIT_MB` or browser memory above
+  `CONTEXT_RSS_LIMIT_MB` recycles the BrowserContext (cheap: the renderers
+  go away, the browser process stays).
+- Browser memory above `BROWSER_RSS_LIMIT_MB`, or still above the context
+  limit right after a context recycle, restarts the browser.
+
+The `/proc` walk is blocking file I/O over every process on the host, so it
+runs in a worker thread (`asyncio.to_thread`), and only every
+`MEMORY_CHECK_EVERY` offers.
+
+Where `/proc` is not available the fixed `RESTART_BROWSER_EVERY` count is
+used as before.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Page
+
+from .config import ScrapingConfig
+
+_HEAP_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : null)"
+
+CONTEXT = "context"
+BROWSER = "browser"
+
+
+def _process_tree(root: int) -> list[int]:
+    """PIDs of every descendant of `root`."""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..." - comm may contain spaces and parentheses
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children[ppid].append(int(entry))
+
+    pids, stack = [], [root]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            pids.append(child)
+            stack.append(child)
+    return pids
+
+
+def _process_kb(pid: int) -> int:
+    """Proportional set size of a process (shared pages split between sharers), RSS as fallback."""
+    for path, key in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            for line in Path(path).read_text().splitlines():
+                if line.startswith(key):
+                    return int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+    return 0
+
+
+def _is_renderer(pid: int) -> bool:
+    try:
+        return b"--type=renderer" in Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return False
+
+
+def browser_memory() -> Optional[dict]:
+    """
+    Memory of the processes started by this scraper (the Playwright driver and Chromium).
+
+    Returns:
+        Optional[dict]: `total_mb`, `max_renderer_mb` and `processes`, or None without `/proc`
+    """
+    if not Path("/proc/self/stat").exists():
+        return None
+    total_kb = 0
+    max_renderer_kb = 0
+    pids = _process_tree(os.getpid())
+    for pid in pids:
+        kb = _process_kb(pid)
+        total_kb += kb
+        if _is_renderer(pid):
+            max_renderer_kb = max(max_renderer_kb, kb)
+    return {"total_mb": total_kb / 1024, "max_renderer_mb": max_renderer_kb / 1024, "processes": len(pids)}
+
+
+async def js_heap_mb(page: Page) -> Optional[float]:
+    """Used JS heap of a page in MB (Chromium only), None if it cannot be read."""
+    try:
+        used = await page.evaluate(_HEAP_SCRIPT)
+    except Exception:
+        return None
+    return used / (1024 * 1024) if used else None
+
+
+class MemoryMonitor:
+    """Samples browser memory and decides when to recycle the context or the browser."""
+
+    def __init__(self):
+        self.available = Path("/proc/self/stat").exists()
+        self.samples: list[float] = []
+        self.heap_samples: list[float] = []
+        self.peak_renderer_mb = 0.0
+        self.context_recycles = 0
+        self.browser_restarts = 0
+        self._context_recycled = False
+
+    async def check(self, page: Page) -> Optional[str]:
+        """
+        Sample memory after an offer and pick the recycling level, if any.
+
+        Returns:
+            Optional[str]: `CONTEXT`, `BROWSER` or None
+        """
+        memory = await asyncio.to_thread(browser_memory)
+        heap = await js_heap_mb(page) if not page.is_closed() else None
+        if heap is not None:
+            self.heap_samples.append(heap)
+        if memory is None:
+            return CONTEXT if heap is not None and heap >= ScrapingConfig.CONTEXT_HEAP_LIMIT_MB else None
+
+        rss = memory["total_mb"]
+        self.samples.append(rss)
+        self.peak_renderer_mb = max(self.peak_renderer_mb, memory["max_renderer_mb"])
+        heap_text = f"{heap:.0f} MB" if heap is not None else "n/a"
+        logging.debug(f"🧠 Browser {rss:.0f} MB in {memory['processes']} processes, largest renderer {memory['max_renderer_mb']:.0f} MB, JS heap {heap_text}")
+
+        if rss >= ScrapingConfig.BROWSER_RSS_LIMIT_MB:
+            logging.info(f"🧠 Browser memory {rss:.0f} MB ≥ {ScrapingConfig.BROWSER_RSS_LIMIT_MB} MB")
+            return BROWSER
+        if rss >= ScrapingConfig.CONTEXT_RSS_LIMIT_MB:
+            if self._context_recycled:
+                # A fresh context did not bring memory down: the browser process itself grew
+                logging.info(f"🧠 Browser memory {rss:.0f} MB still ≥ {ScrapingConfig.CONTEXT_RSS_LIMIT_MB} MB after a context recycle")
+                return BROWSER
+            logging.info(f"🧠 Browser memory {rss:.0f} MB ≥ {ScrapingConfig.CONTEXT_RSS_LIMIT_MB} MB")
+            return CONTEXT
+        if heap is not None and heap >= ScrapingConfig.CONTEXT_HEAP_LIMIT_MB:
+            logging.info(f"🧠 JS heap {heap:.0f} MB ≥ {ScrapingConfig.CONTEXT_HEAP_LIMIT_MB} MB")
+            return CONTEXT
+        self._context_recycled = False
+        return None
+
+    def recycled(self, level: str):
+        """Record a context recycle or browser restart."""
+        if level == BROWSER:
+            self.browser_restarts += 1
+            self._context_recycled = False
+        else:
+            self.context_recycles += 1
+            self._context_recycled = True
+
+    def log_summary(self):
+        """Log the run's memory profile and the headroom it needed."""
+        parts = []
+        if self.samples:
+            ordered = sorted(self.samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            parts.append(f"browser peak {ordered[-1]:.0f} MB, p95 {p95:.0f} MB, avg {sum(ordered) / len(ordered):.0f} MB")
+            parts.append(f"largest renderer {self.peak_renderer_mb:.0f} MB")
+        if self.heap_samples:
+            parts.append(f"JS heap peak {max(self.heap_samples):.0f} MB")
+        parts.append(f"{self.context_recycles} context recycles, {self.browser_restarts} browser restarts")
+        logging.info(f"🧠 Memory profile: {', '.join(parts)}")
+        if self.samples:
+            logging.info(f"🧠 Suggested browser headroom: {max(self.samples) * 1.25:.0f} MB (peak + 25%)")
@@ -0,0 +1,206 @@
+# metrics.py
+"""
+Per-stage timers and counters for a scrape run.
+
+Stages (link collection, navigation, extraction, DB writes, purge, cleanup,
+rate-control waits, ...) are timed into histograms and failures are counted
+per stage and per selector. At the end of a run the registry is written as
+JSON and as a Prometheus textfile (for node_exporter's textfile collector)
+to `ScrapingConfig.METRICS_DIR`, and a per-stage summary is logged.
+
+Usage:
+    with METRICS.timer("navigation"):
+        await page.goto(href)
+    METRICS.inc("selector_misses_total", field="category")
+"""
+
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+from .config import ScrapingConfig
+
+# Histogram buckets in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _labels_text(labels: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound holding the q-quantile (None beyond the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(BUCKETS, self.counts):
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": dict(zip(map(str, BUCKETS), self.counts)),
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95)}
+
+    def merge(self, data: dict):
+        self.count += data["count"]
+        self.sum += data["sum"]
+        for i, bound in enumerate(BUCKETS):
+            self.counts[i] += data["buckets"].get(str(bound), 0)
+
+
+class Metrics:
+    """Registry of stage histograms and counters for one process."""
+
+    def __init__(self):
+        self.histograms: dict[_Key, Histogram] = {}
+        self.counters: dict[_Key, float] = defaultdict(float)
+        self.started = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increase a counter."""
+        self.counters[_key(name, labels)] += value
+
+    def observe(self, stage: str, seconds: float, **labels):
+        """Record the duration of one stage execution."""
+        key = _key(stage, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        """Time a block as `stage`; exceptions are counted in `stage_failures_total` and re-raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.inc("stage_failures_total", stage=stage, error=type(e).__name__, **labels)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state (also used to merge child processes)."""
+        return {
+            "started_at": self.started,
+            "stages": [{"stage": name, "labels": dict(labels), **h.to_dict()} for (name, labels), h in sorted(self.histograms.items())],
+            "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self.counters.items())],
+        }
+
+    def merge(self, snapshot: dict):
+        """Add another process's snapshot (farm workers) into this registry."""
+        for stage in snapshot["stages"]:
+            key = _key(stage["stage"], stage["labels"])
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.merge(stage)
+        for counter in snapshot["counters"]:
+            self.counters[_key(counter["name"], counter["labels"])] += counter["value"]
+
+    def to_prometheus(self) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        lines = [
+            "# HELP scout_stage_seconds Time spent per scrape stage.",
+            "# TYPE scout_stage_seconds histogram",
+        ]
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            base = (("stage", name),) + labels
+            for bound, cumulative in zip(BUCKETS, histogram.counts):
+                lines.append(f"scout_stage_seconds_bucket{_labels_text(base, ('le', str(bound)))} {cumulative}")
+            lines.append(f"scout_stage_seconds_bucket{_labels_text(base, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"scout_stage_seconds_sum{_labels_text(base)} {histogram.sum:.6f}")
+            lines.append(f"scout_stage_seconds_count{_labels_text(base)} {histogram.count}")
+
+        by_name: dict[str, list] = defaultdict(list)
+        for (name, labels), value in sorted(self.counters.items()):
+            by_name[name].append((labels, value))
+        for name, series in by_name.items():
+            metric = f"scout_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in series:
+                lines.append(f"{metric}{_labels_text(labels)} {value:g}")
+
+        lines.append("# TYPE scout_last_run_timestamp_seconds gauge")
+        lines.append(f"scout_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Optional[str] = None) -> tuple[Path, Path]:
+        """
+        Write `scout-metrics.json` and `scout.prom` (atomically, for the textfile collector).
+
+        Returns:
+            tuple[Path, Path]: Paths of the JSON and Prometheus files
+        """
+        target = Path(directory or ScrapingConfig.METRICS_DIR)
+        target.mkdir(parents=True, exist_ok=True)
+        json_path = target / "scout-metrics.json"
+        prom_path = target / "scout.prom"
+        for path, content in ((json_path, json.dumps(self.snapshot(), indent=2)), (prom_path, self.to_prometheus())):
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(content)
+            os.replace(tmp, path)
+        return json_path, prom_path
+
+    def log_summary(self):
+        """Log total time, count and p50/p95 per stage, then failures."""
+        totals: dict[str, Histogram] = {}
+        for (name, _), histogram in self.histograms.items():
+            total = totals.setdefault(name, Histogram())
+            total.merge(histogram.to_dict())
+        for name, histogram in sorted(totals.items(), key=lambda item: -item[1].sum):
+            p50, p95 = histogram.quantile(0.5), histogram.quantile(0.95)
+            logging.info(f"⏱️ {name}: {histogram.count}× total {histogram.sum:.1f} s, "
+                         f"p50 ≤ {p50 if p50 is not None else '>300'} s, p95 ≤ {p95 if p95 is not None else '>300'} s")
+        for (name, labels), value in sorted(self.counters.items()):
+            if name.endswith("failures_total") or name.endswith("misses_total"):
+                label_text = ", ".join(f"{k}={v}" for k, v in labels)
+                logging.info(f"❗ {name} [{label_text}]: {value:g}")
+
+
+# Process-wide registry
+METRICS = Metrics()
+
+
+def timed(stage: str, **labels):
+    """Decorator timing every call of a coroutine function as `stage`."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with METRICS.timer(stage, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
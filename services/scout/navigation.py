@@ -0,0 +1,227 @@
+# navigation.py
+"""
+Fast navigation profile for offer pages.
+
+Blocks images, media, fonts and third-party analytics through request routing
+and treats an offer page as ready as soon as the elements we read are in the
+DOM, instead of waiting for `networkidle`. A few offers are loaded once with
+the default profile to measure how much time and bandwidth the fast profile
+saves per offer.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Page, Request, Route, Response
+
+from .config import ScrapingConfig
+from .metrics import METRICS, timed
+from .selectors import SELECTORS, get_selector
+
+# Elements that must be present before extraction starts. Every offer has
+# them; optional sections (e.g. the tech stack) are read if they are there,
+# but not waited for - offers without them would always run into READY_TIMEOUT.
+READY_SELECTORS = (
+    get_selector(SELECTORS.JOB_TITLE),
+    get_selector(SELECTORS.COMPANY),
+)
+
+_READY_SCRIPT = "(selectors) => selectors.every((s) => document.querySelector(s) !== null)"
+
+
+def _content_length(response: Response) -> int:
+    """Size of a response from its Content-Length header (0 if unknown)."""
+    try:
+        return int(response.headers.get("content-length", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _transfer_bytes(request: Request) -> int:
+    """
+    Bytes received for a finished request: encoded body plus headers.
+
+    Measured by the browser, so chunked and compressed responses (which
+    usually carry no Content-Length) count too; the header is only a fallback.
+    """
+    try:
+        sizes = await request.sizes()
+        return max(0, sizes["responseBodySize"]) + max(0, sizes["responseHeadersSize"])
+    except Exception:
+        pass
+    try:
+        response = await request.response()
+    except Exception:
+        return 0
+    return _content_length(response) if response is not None else 0
+
+
+class NavigationProfile:
+    """Request blocking and readiness rules applied to every offer page."""
+
+    def __init__(self):
+        self.blocked_types = set(ScrapingConfig.BLOCKED_RESOURCE_TYPES)
+        self.blocked_domains = tuple(ScrapingConfig.BLOCKED_DOMAINS)
+
+        # Per-page counters, only for pages with a navigation in progress
+        self._blocked: dict[Page, int] = {}
+        self._bytes: dict[Page, int] = {}
+        self._sizing: dict[Page, set[asyncio.Task]] = {}
+
+        # Run totals
+        self.offers = 0
+        self.ready_ms_total = 0.0
+        self.blocked_total = 0
+        self.blocked_by_type: dict[str, int] = defaultdict(int)
+        self.bytes_total = 0
+
+        # Default-profile (networkidle, nothing blocked) reference
+        self.baseline_ms: Optional[float] = None
+        self.baseline_bytes: Optional[float] = None
+        self.calibrated = False
+
+    def _is_blocked(self, url: str, resource_type: str) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        host = urlparse(url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    def _page_of(self, route: Route) -> Optional[Page]:
+        try:
+            return route.request.frame.page
+        except Exception:
+            # Service worker requests have no frame
+            return None
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        if self._is_blocked(request.url, request.resource_type):
+            page = self._page_of(route)
+            if page in self._blocked:
+                self._blocked[page] += 1
+            self.blocked_total += 1
+            self.blocked_by_type[request.resource_type] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _handle_request_finished(self, request: Request):
+        try:
+            page = request.frame.page
+        except Exception:
+            return
+        # Late requests after `goto` returned (or of closed pages) are not counted
+        if page in self._bytes:
+            task = asyncio.ensure_future(self._count_bytes(page, request))
+            pending = self._sizing.setdefault(page, set())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+    async def _count_bytes(self, page: Page, request: Request):
+        size = await _transfer_bytes(request)
+        if page in self._bytes:
+            self._bytes[page] += size
+
+    async def attach(self, context):
+        """Install request blocking and transfer size accounting on a browser context."""
+        await context.route("**/*", self._handle_route)
+        context.on("requestfinished", self._handle_request_finished)
+
+    async def calibrate(self, browser, offer_urls: list[str]):
+        """
+        Load a few offers with the default profile to measure the baseline cost.
+
+        Args:
+            browser: Playwright browser used to open an unrouted context
+            offer_urls: Offer URLs to sample from
+        """
+        samples = offer_urls[:ScrapingConfig.NAVIGATION_BASELINE_SAMPLES]
+        if not samples or self.calibrated:
+            return
+        # Once per profile, even when process_offers runs once per queue batch
+        self.calibrated = True
+
+        context = await browser.new_context(locale='pl-PL')
+        page = await context.new_page()
+        sizing: list[asyncio.Task] = []
+
+        def count_bytes(request: Request):
+            sizing.append(asyncio.ensure_future(_transfer_bytes(request)))
+
+        context.on("requestfinished", count_bytes)
+        durations = []
+        sizes = []
+        try:
+            for href in samples:
+                sizing.clear()
+                start = time.perf_counter()
+                try:
+                    await page.goto(href, wait_until='networkidle', timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+                except Exception as e:
+                    logging.warning(f"⚠️ Baseline navigation failed for {href}: {e}")
+                    continue
+                durations.append((time.perf_counter() - start) * 1000)
+                sizes.append(sum(await asyncio.gather(*sizing)))
+        finally:
+            await context.close()
+
+        if durations:
+            self.baseline_ms = sum(durations) / len(durations)
+            self.baseline_bytes = sum(sizes) / len(sizes)
+            logging.info(f"📏 Baseline navigation: {self.baseline_ms:.0f} ms, {self.baseline_bytes / 1024:.0f} KB per offer ({len(durations)} samples)")
+
+    @timed("navigation", profile="fast")
+    async def goto(self, page: Page, href: str):
+        """
+        Navigate to an offer and wait until the elements we extract are present.
+
+        Returns:
+            The main resource response, as returned by `page.goto`
+        """
+        self._blocked[page] = 0
+        self._bytes[page] = 0
+        start = time.perf_counter()
+
+        try:
+            response = await page.goto(href, wait_until=ScrapingConfig.NAVIGATION_WAIT_UNTIL, timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+            try:
+                await page.wait_for_function(_READY_SCRIPT, arg=list(READY_SELECTORS), timeout=ScrapingConfig.READY_TIMEOUT)
+            except Exception:
+                # Title or company missing (e.g. an error page); extract what is there
+                METRICS.inc("ready_timeouts_total")
+                logging.debug(f"Ready selectors incomplete after {ScrapingConfig.READY_TIMEOUT} ms: {href}")
+        finally:
+            pending = self._sizing.pop(page, set())
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            blocked = self._blocked.pop(page, 0)
+            loaded_bytes = self._bytes.pop(page, 0)
+
+        ready_ms = (time.perf_counter() - start) * 1000
+
+        self.offers += 1
+        self.ready_ms_total += ready_ms
+        self.bytes_total += loaded_bytes
+        METRICS.inc("navigation_bytes_total", loaded_bytes)
+        METRICS.inc("navigation_blocked_requests_total", blocked)
+
+        message = f"⚡ Ready in {ready_ms:.0f} ms, {loaded_bytes / 1024:.0f} KB loaded, {blocked} requests blocked"
+        if self.baseline_ms is not None:
+            message += f" (saved {(self.baseline_ms - ready_ms) / 1000:.1f} s, {(self.baseline_bytes - loaded_bytes) / 1024:.0f} KB vs networkidle)"
+        logging.info(message)
+        return response
+
+    def log_summary(self):
+        """Log run totals and average per-offer savings."""
+        if not self.offers:
+            return
+        avg_ms = self.ready_ms_total / self.offers
+        avg_bytes = self.bytes_total / self.offers
+        by_type = ", ".join(f"{kind}: {count}" for kind, count in sorted(self.blocked_by_type.items()))
+        logging.info(f"⚡ Fast navigation: {self.offers} offers, avg ready {avg_ms:.0f} ms, avg {avg_bytes / 1024:.0f} KB, {self.blocked_total} requests blocked ({by_type})")
+        if self.baseline_ms is not None:
+            logging.info(f"💾 Saved per offer: {(self.baseline_ms - avg_ms) / 1000:.1f} s and {(self.baseline_bytes - avg_bytes) / 1024:.0f} KB on average")
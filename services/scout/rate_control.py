@@ -0,0 +1,220 @@
+# rate_control.py
+"""
+Adaptive (AIMD) request rate control.
+
+Replaces the fixed `REQUEST_DELAY` sleep after every offer. A
+`RateController` hands out request slots: it bounds how many offers are in
+flight and spaces request starts by the current delay. Every completed
+request feeds back into it:
+
+- success at normal latency: additive increase - concurrency grows by about
+  one slot per window of requests and the delay shrinks by `RATE_DELAY_STEP`
+- HTTP 429 / 5xx, a timeout, or latency well above the observed floor:
+  multiplicative decrease - concurrency is cut by `RATE_DECREASE` and the
+  delay doubled (at most once per latency window, so one burst of errors
+  counts as one congestion event); a `Retry-After` pauses all starts
+
+Latency is tracked per extraction path (HTTP fast path, browser), each with
+its own EWMA and floor: a browser fallback is naturally several times slower
+than a fast-path hit and must not read as the site slowing down.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .config import ScrapingConfig
+from .metrics import METRICS
+
+
+class ThrottledResponse(Exception):
+    """The site answered with HTTP 429 or a 5xx status."""
+
+    def __init__(self, url: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+def is_throttle_status(status: Optional[int]) -> bool:
+    """Whether a response status means the site wants us to slow down."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a `Retry-After` header (the delta-seconds form only)."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _is_timeout(error: BaseException) -> bool:
+    # asyncio, Playwright and httpx timeouts share nothing but the name
+    return isinstance(error, asyncio.TimeoutError) or "Timeout" in type(error).__name__
+
+
+class _PathLatency:
+    """Latency EWMA and floor of one extraction path."""
+
+    def __init__(self):
+        self.latency: Optional[float] = None  # EWMA of request latency (s)
+        self.floor: Optional[float] = None  # Slowly rising minimum of the EWMA
+        self.samples = 0
+
+    def observe(self, latency: float):
+        self.samples += 1
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.floor is None or self.latency < self.floor:
+            self.floor = self.latency
+        else:
+            # Let the floor follow a site that got permanently slower
+            self.floor += (self.latency - self.floor) * 0.01
+
+    @property
+    def slow(self) -> bool:
+        return self.samples >= 5 and self.latency > self.floor * ScrapingConfig.RATE_LATENCY_FACTOR
+
+
+class TrackedRequest:
+    """Handle of a tracked request; set `path` to the extraction path that produced the result."""
+
+    def __init__(self, path: str = "browser"):
+        self.path = path
+
+
+class RateController:
+    """AIMD controller for request concurrency and inter-request delay."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, initial_concurrency: Optional[int] = None,
+                 initial_delay: Optional[float] = None, name: str = "scrape"):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency or ScrapingConfig.MAX_CONCURRENT_PAGES)
+        self.limit = float(min(self.max_concurrency, initial_concurrency or ScrapingConfig.RATE_INITIAL_CONCURRENCY))
+        self.delay = ScrapingConfig.REQUEST_DELAY if initial_delay is None else initial_delay
+        self.in_flight = 0
+
+        self.paths: dict[str, _PathLatency] = {}
+
+        self.completed = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.slow = 0
+        self.decreases = 0
+
+        self._condition = asyncio.Condition()
+        self._next_start = 0.0
+        self._pause_until = 0.0
+        self._last_decrease = 0.0
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Highest latency EWMA over the extraction paths (s)."""
+        latencies = [p.latency for p in self.paths.values() if p.latency is not None]
+        return max(latencies) if latencies else None
+
+    @property
+    def concurrency(self) -> int:
+        """Requests currently allowed in flight."""
+        return max(1, int(self.limit))
+
+    async def acquire(self):
+        """Wait for a free slot and for this request's start time."""
+        waited = time.monotonic()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._next_start, self._pause_until)
+            self._next_start = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+        METRICS.observe("rate_wait", time.monotonic() - waited)
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def track(self):
+        """
+        Hold a request slot and feed the request's outcome back into the controller.
+
+        Yields a `TrackedRequest`; set its `path` (e.g. "http") when the result
+        did not come from the browser, so latency is compared within that path.
+        `ThrottledResponse` and timeout errors count as congestion; any other
+        error is neutral (e.g. a page we could not parse). Exceptions propagate.
+        """
+        await self.acquire()
+        started = time.monotonic()
+        request = TrackedRequest()
+        try:
+            yield request
+        except ThrottledResponse as e:
+            self.throttled += 1
+            self._congestion(f"HTTP {e.status}", e.retry_after)
+            raise
+        except Exception as e:
+            if _is_timeout(e):
+                self.timeouts += 1
+                self._congestion("timeout")
+            raise
+        else:
+            self._success(time.monotonic() - started, request.path)
+        finally:
+            await self.release()
+
+    def _success(self, latency: float, path: str = "browser"):
+        self.completed += 1
+        stats = self.paths.setdefault(path, _PathLatency())
+        stats.observe(latency)
+
+        if stats.slow:
+            self.slow += 1
+            self._congestion(f"latency {stats.latency:.1f} s ({path})")
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + ScrapingConfig.RATE_INCREASE / self.limit)
+            self.delay = max(ScrapingConfig.RATE_MIN_DELAY, self.delay - ScrapingConfig.RATE_DELAY_STEP)
+
+        if self.completed % ScrapingConfig.RATE_LOG_EVERY == 0:
+            self.log_state()
+
+    def _congestion(self, reason: str, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        if retry_after:
+            self._pause_until = max(self._pause_until, now + min(retry_after, ScrapingConfig.RATE_MAX_DELAY))
+
+        # One decrease per latency window: a burst of errors is one congestion event
+        if now - self._last_decrease < max(self.latency or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        METRICS.inc("rate_backoffs_total", reason=reason.split()[0])
+        self.limit = max(1.0, self.limit * ScrapingConfig.RATE_DECREASE)
+        self.delay = min(ScrapingConfig.RATE_MAX_DELAY, max(self.delay * 2, ScrapingConfig.RATE_BACKOFF_DELAY))
+        logging.warning(f"🐢 {self.name}: {reason}, backing off to {self.concurrency} concurrent, {self.delay:.2f} s delay")
+
+    def state(self) -> dict:
+        """Current controller state, for logs and metrics."""
+        return {
+            "concurrency": self.concurrency,
+            "limit": round(self.limit, 2),
+            "delay": round(self.delay, 3),
+            "in_flight": self.in_flight,
+            "latency": {path: round(p.latency, 3) for path, p in self.paths.items()},
+            "samples": {path: p.samples for path, p in self.paths.items()},
+            "completed": self.completed,
+            "throttled": self.throttled,
+            "timeouts": self.timeouts,
+            "slow": self.slow,
+            "decreases": self.decreases,
+        }
+
+    def log_state(self):
+        latency = ", ".join(f"{path} {p.latency:.2f} s ({p.samples})" for path, p in sorted(self.paths.items())) or "n/a"
+        logging.info(f"🎛️ {self.name}: {self.concurrency}/{self.max_concurrency} concurrent, {self.delay:.2f} s delay, "
+                     f"latency {latency}, {self.completed} ok, {self.throttled} throttled, {self.timeouts} timeouts, {self.decreases} backoffs")
@@ -0,0 +1,101 @@
+# salary.py
+"""
+Salary parsing into typed `offers` columns.
+
+Offers store salaries as the text shown on the page, one column per contract
+type (`20 000 - 25 000 PLN\\nNet per month - B2B`). `salary_columns` parses
+them once at insert time into `salary_min`, `salary_max`, `salary_currency`,
+`salary_is_gross`, `salary_period` and `salary_contract`, picking the contract
+with the API's priority (B2B > Permanent > Any > Mandate > Task > Internship),
+so salary filters and sorting can use plain indexed columns instead of the
+regex-heavy `offers_parsed` view. A text that does not parse is skipped, so
+`salary_contract` names the column the numbers came from; the API displays
+that column's text, keeping the shown salary and the typed columns in step.
+"""
+
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+# Salary text columns in the order the API picks them, with their contract label
+SALARY_PRIORITY = (
+    ("salary_b2b", "B2B"),
+    ("salary_permanent", "Permanent"),
+    ("salary_any", "Any"),
+    ("salary_mandate", "Mandate"),
+    ("salary_specific_task", "Specific-task"),
+    ("salary_internship", "Internship"),
+)
+
+# Typed columns filled from the salary text
+SALARY_COLUMNS = ("salary_min", "salary_max", "salary_currency", "salary_is_gross", "salary_period", "salary_contract")
+
+# Same shape as the `offers_parsed` view: "<min>[ - <max>] <CUR> <Gross|Net> per <period>"
+_SALARY = re.compile(
+    r"([0-9][0-9\s,.]*?)(?:\s*[-–]\s*([0-9][0-9\s,.]*?))?\s*([A-Z]{3})\s*(Gross|Net)\s*per\s*(\w+)",
+    re.I,
+)
+
+
+def _amount(text: Optional[str]) -> Optional[Decimal]:
+    """Parse `25 000`, `25,000` or `150.50` (spaces and commas are thousands separators)."""
+    if not text:
+        return None
+    try:
+        return Decimal(re.sub(r"[\s,\xa0]", "", text))
+    except InvalidOperation:
+        return None
+
+
+def parse_salary(text: Optional[str]) -> Optional[dict]:
+    """
+    Parse one salary text.
+
+    Args:
+        text: Salary as shown on the offer page
+
+    Returns:
+        Optional[dict]: `min`, `max`, `currency`, `is_gross` and `period`, or None if the text is not a salary
+    """
+    if not text:
+        return None
+    match = _SALARY.search(text)
+    if not match:
+        return None
+    low = _amount(match.group(1))
+    high = _amount(match.group(2)) or low
+    if low is None:
+        return None
+    return {
+        "min": min(low, high),
+        "max": max(low, high),
+        "currency": match.group(3).upper(),
+        "is_gross": match.group(4).lower() == "gross",
+        "period": match.group(5).lower(),
+    }
+
+
+def salary_columns(offer: dict) -> dict:
+    """
+    Typed salary columns for an offer, from the highest-priority parseable salary.
+
+    Returns:
+        dict: Every column in `SALARY_COLUMNS` (all None when the offer has no parseable salary)
+    """
+    for column, contract in SALARY_PRIORITY:
+        text = offer.get(column)
+        parsed = parse_salary(text)
+        if parsed is None:
+            if text:
+                logging.debug(f"Unparseable {column} for {offer.get('job_url')}: {text!r}")
+            continue
+        return {
+            "salary_min": parsed["min"],
+            "salary_max": parsed["max"],
+            "salary_currency": parsed["currency"],
+            "salary_is_gross": parsed["is_gross"],
+            "salary_period": parsed["period"],
+            "salary_contract": contract,
+        }
+    return dict.fromkeys(SALARY_COLUMNS)
@@ -1,11 +1,26 @@
 # scrape_core.py
 import asyncio
 import re
+import time
 from typing import Optional
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import async_playwright, BrowserContext, Page
 import logging
-from .selectors import SELECTORS, PATTERNS, get_selector
+from .selectors import SELECTORS, get_selector
+from .dom_extract import TEXT_FIELDS, SALARY_FIELDS, field_selectors, evaluate_offer
 from .config import ScrapingConfig
+from .navigation import NavigationProfile
+from .db import OfferWriter, ensure_offer_staging, save_offers, fetch_offer_state, is_connection_error
+from .journal import RunJournal
+from .work_queue import ScrapeQueue
+from .http_fetch import OfferFetcher
+from .rate_control import RateController, ThrottledResponse, is_throttle_status, parse_retry_after
+from .memory import MemoryMonitor, BROWSER, CONTEXT
+from .skill_stream import SkillStream
+from .salary import salary_columns
+from .selector_health import SELECTOR_HEALTH
+from .metrics import METRICS, timed
+from .freshness import content_hash, listing_hash, select_offers_to_scrape
+from .listing_capture import ListingCapture, LinkHarvester, normalize_offer_href
 
 def sanitize_string(value, max_length=None):
     """Simple string sanitization without validation."""
@@ -34,16 +49,65 @@ async def extract_element_text(page: Page, selector: str, fallback_selector: str
 
 SCROLL_PAUSE = ScrapingConfig.SCROLL_PAUSE_TIME
 
-async def init_browser(headless: bool = True):
+async def new_browser_page(browser, profile: Optional[NavigationProfile] = None) -> Page:
+    """Open a fresh browser context (with the navigation profile, if any) and return its first page."""
+    context = await browser.new_context(locale='pl-PL')
+    if profile is not None:
+        await profile.attach(context)
+    return await context.new_page()
+
+async def init_browser(headless: bool = True, profile: Optional[NavigationProfile] = None):
     playwright = await async_playwright().start()
     browser = await playwright.chromium.launch(headless=headless)
-    context = await browser.new_context(locale='pl-PL')
-    page = await context.new_page()
+    page = await new_browser_page(browser, profile)
     return playwright, browser, page
 
-async def collect_offer_links(page: Page) -> list[str]:
+async def restart_browser(playwright, browser, page: Page, profile: Optional[NavigationProfile] = None):
+    """
+    Relaunch the browser to release its memory.
+
+    Returns:
+        tuple: The new (browser, page), or the old ones if the relaunch failed
     """
-    Collects job offer links from JustJoin.it by scrolling through the page.
+    context = page.context
+    try:
+        await page.close()
+        await browser.close()
+        browser = await playwright.chromium.launch(headless=ScrapingConfig.HEADLESS)
+        page = await new_browser_page(browser, profile)
+        logging.info("✅ Browser restarted successfully")
+    except Exception as e:
+        logging.warning(f"⚠️  Browser restart failed: {e}, continuing with existing browser")
+        if page.is_closed():
+            page = await context.new_page()
+    return browser, page
+
+async def recycle_context(browser, page: Page, profile: Optional[NavigationProfile] = None) -> Page:
+    """
+    Replace the page's BrowserContext with a fresh one, keeping the browser process.
+
+    Much cheaper than a browser restart: closing the context tears down its
+    renderer processes and their heaps.
+
+    Returns:
+        Page: First page of the new context (the old page if recycling failed)
+    """
+    old_context = page.context
+    try:
+        new_page = await new_browser_page(browser, profile)
+    except Exception as e:
+        logging.warning(f"⚠️  Context recycle failed: {e}, continuing with existing context")
+        return page
+    try:
+        await old_context.close()
+    except Exception:
+        pass
+    logging.info("✅ Browser context recycled")
+    return new_page
+
+async def _collect_links_dom(page: Page) -> list[str]:
+    """
+    Collects job offer links by scrolling through the page and reading every link from the DOM.
     
     Args:
         page: Playwright page object
@@ -69,10 +133,8 @@ async def collect_offer_links(page: Page) -> list[str]:
             
             for link in current_links:
                 try:
-                    href = await link.get_attribute('href', timeout=ScrapingConfig.LINK_TIMEOUT)
-                    if href and '/job-offer/' in href:
-                        if href.startswith('/'):
-                            href = f"https://justjoin.it{href}"
+                    href = normalize_offer_href(await link.get_attribute('href', timeout=ScrapingConfig.LINK_TIMEOUT))
+                    if href:
                         current_urls.add(href)
                 except Exception as e:
                     # Skip this link and continue
@@ -107,9 +169,405 @@ async def collect_offer_links(page: Page) -> list[str]:
     logging.info(f"✅ Collected {len(offer_urls)} unique job offer links")
     return offer_urls
 
-async def process_offers(page: Page, conn, offer_urls: list[str], browser=None, playwright=None) -> tuple[int, Page]:
+async def _collect_links_observer(page: Page) -> list[str]:
+    """
+    Collects job offer links with an in-page MutationObserver.
+
+    Links are accumulated in a page-side Set as the listing renders them, so each
+    scroll step only transfers the hrefs that appeared since the previous one.
+    
+    Args:
+        page: Playwright page object
+    
+    Returns:
+        list[str]: List of job offer URLs
+    """
+    unique_urls: set[str] = set()
+    idle_count = 0
+    max_idle = ScrapingConfig.MAX_IDLE_SCROLLS
+    harvester = LinkHarvester(page, get_selector(SELECTORS.JOB_OFFER_LINKS))
+
+    logging.info("🔄 Starting to collect job offer links (MutationObserver)...")
+
+    # Wait for page to load initially
+    await asyncio.sleep(3)
+    await harvester.install()
+
+    try:
+        while idle_count < max_idle:
+            delta = await harvester.drain_and_scroll()
+            new_urls = {href for href in map(normalize_offer_href, delta) if href} - unique_urls
+            unique_urls.update(new_urls)
+
+            if new_urls:
+                idle_count = 0
+                logging.info(f"📊 Collected {len(unique_urls)} unique links (+{len(new_urls)}).")
+            else:
+                idle_count += 1
+                logging.info(f"⏸️ No new links found (idle {idle_count}/{max_idle})")
+
+            await asyncio.sleep(SCROLL_PAUSE)
+    finally:
+        await harvester.stop()
+
+    offer_urls = list(unique_urls)
+    logging.info(f"✅ Collected {len(offer_urls)} unique job offer links")
+    return offer_urls
+
+async def _dom_offer_urls(page: Page) -> set[str]:
+    """Offer URLs of the links currently in the DOM."""
+    try:
+        hrefs = await page.evaluate(
+            "(selector) => Array.from(document.querySelectorAll(selector), (a) => a.getAttribute('href'))",
+            get_selector(SELECTORS.JOB_OFFER_LINKS),
+        )
+    except Exception as e:
+        logging.warning(f"⚠️ Could not read offer links from the DOM: {e}")
+        return set()
+    return {href for href in map(normalize_offer_href, hrefs or []) if href}
+
+def _capture_shortfall(capture: ListingCapture, dom_urls: set[str]) -> Optional[str]:
+    """Why a network capture looks incomplete (None when it does not)."""
+    if capture.reported_total and len(capture.offers) < capture.reported_total * ScrapingConfig.LISTING_MIN_COVERAGE:
+        return f"{len(capture.offers)} of {capture.reported_total} reported offers captured"
+    missing = dom_urls - capture.offers.keys()
+    if missing:
+        return f"{len(missing)} offer links in the DOM missing from the capture"
+    return None
+
+async def _collect_listings_network(page: Page) -> ListingCapture:
+    """
+    Collects offers from the listing's own JSON responses and embedded page data.
+
+    Args:
+        page: Playwright page with the listing loaded
+
+    Returns:
+        ListingCapture: Offer URLs mapped to the basic fields the listing carries
+        (`offers`) and the total the listing reported (`reported_total`)
+    """
+    capture = ListingCapture()
+    capture.attach(page)
+    idle_count = 0
+    max_idle = ScrapingConfig.NETWORK_IDLE_SCROLLS
+
+    logging.info("🔄 Capturing job offers from listing responses...")
+    try:
+        await capture.read_embedded(page)
+        logging.info(f"📊 Embedded listing data: {len(capture.offers)} offers")
+
+        while idle_count < max_idle:
+            known = len(capture.offers)
+
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            try:
+                await page.wait_for_event("response", predicate=capture.is_listing_response, timeout=ScrapingConfig.NETWORK_RESPONSE_TIMEOUT)
+            except Exception:
+                pass
+            await capture.drain()
+
+            if len(capture.offers) > known:
+                idle_count = 0
+                logging.info(f"📊 Captured {len(capture.offers)} unique offers ({capture.responses} responses).")
+            else:
+                idle_count += 1
+                logging.info(f"⏸️ No new offers captured (idle {idle_count}/{max_idle})")
+    finally:
+        capture.detach(page)
+        await capture.drain()
+
+    return capture
+
+@timed("collect_links")
+async def collect_offer_listings(page: Page) -> dict[str, dict]:
+    """
+    Collects job offers from JustJoin.it together with their listing-level fields.
+
+    In 'network' mode offers are read from the listing's JSON payloads; the DOM
+    collectors ('observer', or the legacy 'dom' loop) are only used when that
+    yields nothing or looks incomplete - fewer offers than the listing reports
+    (`LISTING_MIN_COVERAGE`), or offer links in the DOM the capture missed. A
+    short capture is merged with the DOM links, so a missed page or a changed
+    API shape cannot silently shrink the offer set (and make the freshness and
+    purge steps treat the missing offers as gone). Offers found only in the
+    DOM carry no listing fields.
+
+    Args:
+        page: Playwright page with the listing loaded
+
+    Returns:
+        dict[str, dict]: Offer URL mapped to its listing fields
+    """
+    listings: dict[str, dict] = {}
+    reported = None
+    if ScrapingConfig.LINK_COLLECTION_MODE == 'network':
+        try:
+            capture = await _collect_listings_network(page)
+            listings, reported = capture.offers, capture.reported_total
+            shortfall = _capture_shortfall(capture, await _dom_offer_urls(page)) if listings else None
+        except Exception as e:
+            logging.warning(f"⚠️ Network capture failed: {e}")
+            shortfall = None
+        if listings and shortfall is None:
+            logging.info(f"✅ Collected {len(listings)} unique job offer links from listing responses")
+            return listings
+        if listings:
+            METRICS.inc("listing_capture_short_total")
+            logging.warning(f"⚠️ Listing capture looks incomplete ({shortfall}), adding links from DOM scrolling")
+        else:
+            logging.warning("⚠️ No offers in listing responses, falling back to DOM scrolling")
+        await page.evaluate("window.scrollTo(0, 0)")
+
+    if ScrapingConfig.LINK_COLLECTION_MODE == 'dom':
+        urls = await _collect_links_dom(page)
+    else:
+        urls = await _collect_links_observer(page)
+    merged = {url: {} for url in urls}
+    merged.update(listings)
+    if listings:
+        logging.info(f"✅ Collected {len(merged)} unique job offer links ({len(listings)} from listing responses, "
+                     f"{len(merged) - len(listings)} more from the DOM)")
+    if reported and len(merged) < reported * ScrapingConfig.LISTING_MIN_COVERAGE:
+        logging.warning(f"⚠️ Only {len(merged)} of {reported} offers reported by the listing were collected")
+    return merged
+
+async def collect_offer_links(page: Page) -> list[str]:
+    """
+    Collects job offer links from JustJoin.it.
+    
+    Args:
+        page: Playwright page object
+    
+    Returns:
+        list[str]: List of job offer URLs
+    """
+    return list(await collect_offer_listings(page))
+
+async def extract_tech_stack(page: Page) -> dict[str, str]:
+    """Extract the tech stack ({name: level}) with per-element locators."""
+    # Tech stack - try multiple approaches to find tech items
+    tech_stack = {}
+    try:
+        # Approach 1: Look for h4 elements that might be tech names
+        tech_names = await page.locator(get_selector(SELECTORS.TECH_NAMES)).all()
+        for name_elem in tech_names:
+            try:
+                name_text = await name_elem.inner_text()
+                if name_text and name_text.strip():
+                    # Look for span element in the same parent
+                    parent = name_elem.locator('..')
+                    span_elem = parent.locator(get_selector(SELECTORS.TECH_LEVELS)).first
+                    if await span_elem.count() > 0:
+                        level_text = await span_elem.inner_text()
+                        if level_text and level_text.strip():
+                            tech_stack[name_text.strip()] = level_text.strip()
+            except:
+                continue
+                
+        # If no tech found, try approach 2: look for specific patterns
+        if not tech_stack:
+            # Look for elements that contain both h4 and span
+            tech_containers = await page.locator(get_selector(SELECTORS.TECH_CONTAINERS)).all()
+            for container in tech_containers[:20]:  # Limit to first 20
+                try:
+                    h4_elem = container.locator(get_selector(SELECTORS.TECH_NAMES)).first
+                    span_elem = container.locator(get_selector(SELECTORS.TECH_LEVELS)).first
+                    
+                    if await h4_elem.count() > 0 and await span_elem.count() > 0:
+                        name = await h4_elem.inner_text()
+                        level = await span_elem.inner_text()
+                        
+                        if name and level and name.strip() and level.strip():
+                            # Skip if it looks like a tech stack item
+                            if len(name) < 50 and len(level) < 20:
+                                tech_stack[name.strip()] = level.strip()
+                except:
+                    continue
+    except Exception as e:
+        logging.error(f"❌ Error in tech stack extraction: {e}")
+        pass
+    return tech_stack
+
+async def extract_salaries(page: Page) -> dict[str, Optional[str]]:
+    """Extract the salary texts per contract type with per-element locators."""
+    salaries: dict[str, Optional[str]] = {column: None for column, _ in SALARY_FIELDS}
+    
+    # Salary extraction - check all spans with " per "
+    try:
+        spans = await page.locator(get_selector(SELECTORS.SALARY_SPANS)).all()
+        
+        for span in spans:
+            try:
+                span_text = await span.inner_text()
+                for column, pattern in SALARY_FIELDS:
+                    if re.match(pattern, span_text.strip(), re.IGNORECASE):
+                        parent_div = span.locator('xpath=..')
+                        salaries[column] = await parent_div.inner_text()
+                        break
+            except Exception as span_error:
+                continue
+    except Exception as e:
+        logging.error(f"❌ Error in salary extraction: {e}")
+        pass
+    return salaries
+
+async def extract_text_field(page: Page, field: str) -> Optional[str]:
+    """Extract a single text field with Playwright locators, trying its candidate selectors best-ranked first."""
+    name = field.replace('_', ' ')
+    value = None
+    with METRICS.timer("extraction", method="locator", field=field):
+        for selector in field_selectors(field):
+            started = time.perf_counter()
+            value = await extract_element_text(page, selector, name=name)
+            SELECTOR_HEALTH.record(field, selector, value is not None, (time.perf_counter() - started) * 1000)
+            if value is not None:
+                break
+    return value
+
+async def extract_offer_with_locators(page: Page) -> dict:
+    """Extract all offer fields with individual Playwright locators (one round trip per element)."""
+    raw: dict = {field: await extract_text_field(page, field) for field in TEXT_FIELDS}
+    raw["tech_stack"] = await extract_tech_stack(page)
+    raw.update(await extract_salaries(page))
+    return raw
+
+def count_selector_misses(raw: dict):
+    """Count fields whose selectors matched nothing on an offer page."""
+    for field in TEXT_FIELDS:
+        if not raw.get(field):
+            METRICS.inc("selector_misses_total", field=field)
+    if not raw.get("tech_stack"):
+        METRICS.inc("selector_misses_total", field="tech_stack")
+    if not any(raw.get(column) for column, _ in SALARY_FIELDS):
+        METRICS.inc("selector_misses_total", field="salary")
+
+async def extract_offer_raw(page: Page) -> dict:
+    """
+    Extract raw offer fields from a loaded offer page.
+
+    Uses the single round-trip engine when enabled and resolves any fields it
+    could not handle with per-field locators.
+    """
+    if not ScrapingConfig.SINGLE_PASS_EXTRACTION:
+        raw = await extract_offer_with_locators(page)
+        count_selector_misses(raw)
+        return raw
+
+    try:
+        raw = await evaluate_offer(page)
+    except Exception as e:
+        logging.warning(f"⚠️ Single-pass extraction failed, falling back to locators: {e}")
+        raw = await extract_offer_with_locators(page)
+        count_selector_misses(raw)
+        return raw
+
+    for field in raw.pop("fallback"):
+        METRICS.inc("extraction_fallbacks_total", field=field)
+        if field == "tech_stack":
+            raw["tech_stack"] = await extract_tech_stack(page)
+        elif field == "salary":
+            raw.update(await extract_salaries(page))
+        else:
+            raw[field] = await extract_text_field(page, field)
+    count_selector_misses(raw)
+    return raw
+
+def build_offer_data(job_url: str, raw: dict) -> dict:
+    """Sanitize raw extracted fields into a row for the `offers` table."""
+    tech_stack_formatted = "; ".join(
+        f"{name}: {level}" for name, level in raw["tech_stack"].items()
+    )
+
+    # Sanitize and prepare offer data
+    offer_data = {
+        "job_url": sanitize_string(job_url),
+        "job_title": sanitize_string(raw["job_title"]),
+        "category": sanitize_string(raw["category"]),
+        "company": sanitize_string(raw["company"]),
+        "location": sanitize_string(raw["location"]),
+        "salary_any": sanitize_string(raw["salary_any"]),
+        "salary_b2b": sanitize_string(raw["salary_b2b"]),
+        "salary_internship": sanitize_string(raw["salary_internship"]),
+        "salary_mandate": sanitize_string(raw["salary_mandate"]),
+        "salary_permanent": sanitize_string(raw["salary_permanent"]),
+        "salary_specific_task": sanitize_string(raw["salary_specific_task"]),
+        "work_schedule": sanitize_string(raw["work_schedule"]),
+        "experience": sanitize_string(raw["experience"]),
+        "employment_type": sanitize_string(raw["employment_type"]),
+        "operating_mode": sanitize_string(raw["operating_mode"]),
+        "tech_stack": sanitize_string(tech_stack_formatted),
+        "description": sanitize_string(raw["description"])
+    }
+    offer_data["content_hash"] = content_hash(offer_data)
+    # Derived from the salary text, so not part of the content hash
+    offer_data.update(salary_columns(offer_data))
+
+    return offer_data
+
+async def scrape_offer(page: Page, href: str, profile: Optional[NavigationProfile] = None) -> dict:
+    """
+    Navigate to a single job offer and extract its data.
+
+    Args:
+        page: Playwright page object used for navigation
+        href: URL of the job offer
+        profile: Fast navigation profile (optional, waits for networkidle without it)
+
+    Returns:
+        dict: Sanitized offer data keyed by `offers` column name
+    """
+    # Navigate to the offer page
+    if profile is not None:
+        response = await profile.goto(page, href)
+    else:
+        with METRICS.timer("navigation", profile="networkidle"):
+            response = await page.goto(href, wait_until='networkidle', timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
+
+    # An error page would be stored as an empty offer; let the rate controller back off instead
+    if response is not None and is_throttle_status(response.status):
+        raise ThrottledResponse(href, response.status, parse_retry_after(response.headers.get("retry-after")))
+
+    raw = await extract_offer_raw(page)
+    return build_offer_data(href, raw)
+
+async def fetch_offer(fetcher: OfferFetcher, href: str) -> Optional[dict]:
+    """
+    Try the HTTP fast path for a single job offer.
+
+    Returns:
+        Optional[dict]: Sanitized offer data, or None if the offer must be scraped with Playwright
+    """
+    raw = await fetcher.fetch_raw(href)
+    return build_offer_data(href, raw) if raw is not None else None
+
+def requeue_throttled(queue: asyncio.Queue, retries: dict[str, int], item: tuple[int, str], error: Exception) -> bool:
+    """
+    Put a throttled offer back in the work queue (at most `THROTTLE_RETRIES` times).
+
+    The rate controller has already backed off (and honours `Retry-After`), so
+    the offer is simply tried again later instead of being lost.
+
+    Returns:
+        bool: Whether the offer was requeued (False: count it as failed)
+    """
+    if not isinstance(error, ThrottledResponse):
+        return False
+    href = item[1]
+    retries[href] = retries.get(href, 0) + 1
+    if retries[href] > ScrapingConfig.THROTTLE_RETRIES:
+        return False
+    METRICS.inc("offer_requeues_total", reason="throttled")
+    logging.warning(f"🐢 Offer throttled (HTTP {error.status}), requeued ({retries[href]}/{ScrapingConfig.THROTTLE_RETRIES}): {href}")
+    queue.put_nowait(item)
+    return True
+
+async def process_offers(page: Page, conn, offer_urls: list[str], browser=None, playwright=None, profile: Optional[NavigationProfile] = None, listings: Optional[dict] = None, journal: Optional[RunJournal] = None, refresh_policy: bool = True, fetcher: Optional[OfferFetcher] = None, rate: Optional[RateController] = None, memory: Optional[MemoryMonitor] = None, skills: Optional[SkillStream] = None) -> tuple[int, Page]:
     """
     Process job offers and save them to the database.
+
+    New offers are always scraped; offers already in the database are only
+    re-visited when their listing data changed or their last scrape is older
+    than `REFRESH_AFTER_DAYS` (see `freshness.select_offers_to_scrape`).
     
     Args:
         page: Playwright page object
@@ -117,210 +575,320 @@ async def process_offers(page: Page, conn, offer_urls: list[str], browser=None,
         offer_urls: List of job offer URLs to process
         browser: Playwright browser object (optional, for memory cleanup)
         playwright: Playwright instance (optional, for memory cleanup)
+        profile: Fast navigation profile (optional, must already be attached to the page's context)
+        listings: Offer URL -> listing fields from `collect_offer_listings` (optional, enables change detection)
+        journal: Run journal receiving per-URL done/failed state (optional, enables --resume);
+            a `ScrapeQueue` works the same way
+        refresh_policy: Apply the refresh policy; False when the URLs were already selected (queue workers)
+        fetcher: HTTP fast-path fetcher (optional; created for this call when `HTTP_FAST_PATH` is on)
+        rate: Adaptive rate controller (optional; created for this call when not given)
+        memory: Memory monitor driving context/browser recycling (optional; created for this call when `MEMORY_RECYCLING` is on)
+        skills: Skill stream receiving every saved offer (optional; created for this call when `STREAM_SKILLS` is on)
     
     Returns:
-        tuple[int, Page]: Number of offers processed and the current page object
+        tuple[int, Page]: Number of offers inserted or changed and the current page object
     """
     
-    # Memory management: restart browser every N offers to prevent memory leaks
+    # Memory management: recycle the context or restart the browser when memory grows
     can_restart = browser is not None and playwright is not None
     
-    # Get existing URLs to avoid duplicates
-    existing_urls = set()
-    try:
-        existing_records = await conn.fetch("SELECT job_url FROM offers")
-        existing_urls = {record['job_url'] for record in existing_records}
-        logging.info(f"📊 Found {len(existing_urls)} existing offers in database")
-    except Exception as e:
-        logging.warning(f"⚠️ Could not fetch existing URLs: {e}")
-    
-    # Filter out existing URLs before processing
-    new_offer_urls = [url for url in offer_urls if url not in existing_urls]
-    skipped_count = len(offer_urls) - len(new_offer_urls)
-    
-    logging.info(f"📊 Total collected: {len(offer_urls)} offers")
-    logging.info(f"⏭️ Already in database: {skipped_count} offers")
-    logging.info(f"🆕 New offers to process: {len(new_offer_urls)} offers")
+    if refresh_policy:
+        # Apply the refresh policy to the state of offers already in the database
+        existing = await fetch_offer_state(conn)
+        new_offer_urls = select_offers_to_scrape(offer_urls, existing, listings)
+    else:
+        new_offer_urls = list(offer_urls)
+    listings = listings or {}
+
+    # Offers the refresh policy skipped need no work in this run
+    if journal is not None:
+        selected = set(new_offer_urls)
+        journal.mark_done([url for url in offer_urls if url not in selected])
     
     if not new_offer_urls:
-        logging.info("✅ No new offers to process - all offers already exist in database")
+        logging.info("✅ No offers to process - all offers are up to date in database")
         return 0, page
     
-    processed_count = 0
-    
+    total = len(new_offer_urls)
+    concurrency = max(1, ScrapingConfig.MAX_CONCURRENT_PAGES)
+    logging.info(f"⚡ Processing with up to {concurrency} concurrent page(s), adapted by the rate controller")
+
+    if profile is not None and browser is not None:
+        await profile.calibrate(browser, new_offer_urls)
+
+    owns_rate = rate is None
+    if owns_rate:
+        rate = RateController(max_concurrency=concurrency)
+
+    owns_memory = memory is None and ScrapingConfig.MEMORY_RECYCLING
+    if owns_memory:
+        memory = MemoryMonitor()
+    # Without memory measurements fall back to the fixed restart count
+    restart_every = ScrapingConfig.RESTART_BROWSER_EVERY if memory is None or not memory.available else None
+
+    owns_fetcher = fetcher is None and ScrapingConfig.HTTP_FAST_PATH
+    if owns_fetcher:
+        fetcher = OfferFetcher()
+
+    owns_skills = skills is None and ScrapingConfig.STREAM_SKILLS
+    if owns_skills:
+        skills = SkillStream()
+        await skills.start()
+
+    # Work queue shared by all pages; it survives browser restarts
+    queue: asyncio.Queue = asyncio.Queue()
     for i, href in enumerate(new_offer_urls, 1):
-        try:
-            # Memory cleanup: restart browser every N offers (from config)
-            if can_restart and i > 1 and (i - 1) % ScrapingConfig.RESTART_BROWSER_EVERY == 0:
-                logging.info(f"♻️  Restarting browser for memory cleanup (processed {i-1}/{len(new_offer_urls)} offers)")
-                try:
-                    await page.close()
-                    await browser.close()
-                    browser = await playwright.chromium.launch(headless=True)
-                    context = await browser.new_context(locale='pl-PL')
-                    page = await context.new_page()
-                    logging.info("✅ Browser restarted successfully")
-                except Exception as e:
-                    logging.warning(f"⚠️  Browser restart failed: {e}, continuing with existing browser")
-            
-            logging.info(f"🔄 Processing new offer {i}/{len(new_offer_urls)}: {href}")
-            
-            # Navigate to the offer page
-            await page.goto(href, wait_until='networkidle', timeout=ScrapingConfig.PAGE_LOAD_TIMEOUT)
-            
-            # Extract job details
-            job_url = href
-            
-            # Extract simple fields with helper
-            job_title = await extract_element_text(page, get_selector(SELECTORS.JOB_TITLE), name="job title")
-            location = await extract_element_text(page, get_selector(SELECTORS.LOCATION), fallback_selector=SELECTORS.LOCATION.fallback, name="location")
-            company = await extract_element_text(page, get_selector(SELECTORS.COMPANY), name="company")
-            category = await extract_element_text(page, get_selector(SELECTORS.CATEGORY_PILL), fallback_selector=get_selector(SELECTORS.CATEGORY_BREADCRUMB), name="category")
-            work_schedule = await extract_element_text(page, get_selector(SELECTORS.WORK_SCHEDULE), name="work schedule")
-            employment_type = await extract_element_text(page, get_selector(SELECTORS.EMPLOYMENT_TYPE), name="employment type")
-            experience = await extract_element_text(page, get_selector(SELECTORS.EXPERIENCE), name="experience")
-            operating_mode = await extract_element_text(page, get_selector(SELECTORS.OPERATING_MODE), name="operating mode")
-            description = await extract_element_text(page, get_selector(SELECTORS.JOB_DESCRIPTION), fallback_selector=SELECTORS.JOB_DESCRIPTION.fallback, name="description")
-            
-            # Tech stack - try multiple approaches to find tech items
-            tech_stack = {}
+        queue.put_nowait((i, href))
+
+    throttle_retries: dict[str, int] = {}
+
+    # asyncpg connections do not allow concurrent queries
+    db_lock = asyncio.Lock()
+    def record_saved(offers: list[dict]):
+        if journal is not None:
+            journal.mark_done([offer["job_url"] for offer in offers])
+        if skills is not None:
+            skills.put(offers)
+
+    def record_failed(href: str, error: str):
+        if journal is not None:
+            journal.mark_failed(href, error)
+
+    writer = OfferWriter(
+        conn,
+        on_saved=record_saved,
+        on_failed=lambda offer, error: record_failed(offer["job_url"], error),
+    ) if ScrapingConfig.BATCH_WRITES else None
+    if writer is not None:
+        await writer.start()
+    else:
+        await ensure_offer_staging(conn)
+    processed_count = 0
+    failed_count = 0
+    since_restart = 0
+    recycle_level = None
+    # Set when saving can no longer succeed (lost connection): raised once the workers stopped
+    write_error: Optional[BaseException] = None
+
+    async def worker(worker_page: Page, context: BrowserContext, restart_requested: asyncio.Event) -> Page:
+        """Scrape offers from the shared queue on one page; returns the page in use at the end (a crashed tab is replaced)."""
+        nonlocal processed_count, failed_count, since_restart, recycle_level, write_error
+
+        while not restart_requested.is_set():
             try:
-                # Approach 1: Look for h4 elements that might be tech names
-                tech_names = await page.locator(get_selector(SELECTORS.TECH_NAMES)).all()
-                for name_elem in tech_names:
-                    try:
-                        name_text = await name_elem.inner_text()
-                        if name_text and name_text.strip():
-                            # Look for span element in the same parent
-                            parent = name_elem.locator('..')
-                            span_elem = parent.locator(get_selector(SELECTORS.TECH_LEVELS)).first
-                            if await span_elem.count() > 0:
-                                level_text = await span_elem.inner_text()
-                                if level_text and level_text.strip():
-                                    tech_stack[name_text.strip()] = level_text.strip()
-                    except:
-                        continue
-                        
-                # If no tech found, try approach 2: look for specific patterns
-                if not tech_stack:
-                    # Look for elements that contain both h4 and span
-                    tech_containers = await page.locator(get_selector(SELECTORS.TECH_CONTAINERS)).all()
-                    for container in tech_containers[:20]:  # Limit to first 20
-                        try:
-                            h4_elem = container.locator(get_selector(SELECTORS.TECH_NAMES)).first
-                            span_elem = container.locator(get_selector(SELECTORS.TECH_LEVELS)).first
-                            
-                            if await h4_elem.count() > 0 and await span_elem.count() > 0:
-                                name = await h4_elem.inner_text()
-                                level = await span_elem.inner_text()
-                                
-                                if name and level and name.strip() and level.strip():
-                                    # Skip if it looks like a tech stack item
-                                    if len(name) < 50 and len(level) < 20:
-                                        tech_stack[name.strip()] = level.strip()
-                        except:
-                            continue
-            except Exception as e:
-                logging.error(f"❌ Error in tech stack extraction: {e}")
-                pass
-            
-            # Prepare offer data
-            tech_stack_formatted = "; ".join(
-                f"{name}: {level}" for name, level in tech_stack.items()
-            )
-            
-            # Initialize all salary variables
-            salary_any = None
-            salary_b2b = None
-            salary_internship = None
-            salary_mandate = None
-            salary_permanent = None
-            salary_specific_task = None
-            
-            # Salary extraction - check all spans with " per "
+                i, href = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return worker_page
+
             try:
-                spans = await page.locator(get_selector(SELECTORS.SALARY_SPANS)).all()
-                any_pattern = PATTERNS.SALARY_ANY
-                b2b_pattern = PATTERNS.SALARY_B2B
-                internship_pattern = PATTERNS.SALARY_INTERNSHIP
-                mandate_pattern = PATTERNS.SALARY_MANDATE
-                permanent_pattern = PATTERNS.SALARY_PERMANENT
-                specific_task_pattern = PATTERNS.SALARY_SPECIFIC_TASK
-                
-                for span in spans:
+                # The rate controller decides when (and how many) requests go out
+                async with rate.track() as request:
+                    logging.info(f"🔄 Processing new offer {i}/{total}: {href}")
+                    offer_data = await fetch_offer(fetcher, href) if fetcher is not None else None
+                    if offer_data is not None:
+                        request.path = "http"
+                    else:
+                        # A crashed tab must not take the remaining offers down with it
+                        if worker_page.is_closed():
+                            worker_page = await context.new_page()
+                        offer_data = await scrape_offer(worker_page, href, profile)
+                offer_data["listing_hash"] = listing_hash(listings.get(href))
+
+                # Save to database (inserts new offers, refreshes existing ones)
+                if writer is not None:
+                    try:
+                        await writer.add(offer_data)
+                    except Exception as db_error:
+                        # The writer stopped: scraping the rest would only fail every offer
+                        write_error = write_error or db_error
+                        restart_requested.set()
+                        return worker_page
+                else:
                     try:
-                        span_text = await span.inner_text()
-                        if re.match(any_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_any = await parent_div.inner_text()
-                        elif re.match(b2b_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_b2b = await parent_div.inner_text()
-                        elif re.match(internship_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_internship = await parent_div.inner_text()
-                        elif re.match(mandate_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_mandate = await parent_div.inner_text()
-                        elif re.match(permanent_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_permanent = await parent_div.inner_text()
-                        elif re.match(specific_task_pattern, span_text.strip(), re.IGNORECASE):
-                            parent_div = span.locator('xpath=..')
-                            salary_specific_task = await parent_div.inner_text()
-                    except Exception as span_error:
-                        continue
+                        async with db_lock:
+                            processed_count += await save_offers(conn, [offer_data])
+                    except Exception as db_error:
+                        if is_connection_error(db_error):
+                            write_error = write_error or db_error
+                            restart_requested.set()
+                            return worker_page
+                        failed_count += 1
+                        METRICS.inc("offer_failures_total", error="database")
+                        logging.error(f"Database error saving offer {href}: {db_error}")
+                        record_failed(href, str(db_error))
+                    else:
+                        record_saved([offer_data])
             except Exception as e:
-                logging.error(f"❌ Error in salary extraction: {e}")
-                pass
+                if not requeue_throttled(queue, throttle_retries, (i, href), e):
+                    failed_count += 1
+                    METRICS.inc("offer_failures_total", error=type(e).__name__)
+                    logging.error(f"Error processing job offer {href}: {e}")
+                    record_failed(href, str(e))
+            finally:
+                since_restart += 1
+                if queue.empty() or browser is None:
+                    pass
+                elif restart_every is not None:
+                    if can_restart and since_restart >= restart_every:
+                        recycle_level = BROWSER
+                        restart_requested.set()
+                elif memory is not None and since_restart % ScrapingConfig.MEMORY_CHECK_EVERY == 0:
+                    try:
+                        level = await memory.check(worker_page)
+                    except Exception as e:
+                        logging.warning(f"⚠️ Memory check failed: {e}")
+                        level = None
+                    if level == BROWSER and not can_restart:
+                        level = CONTEXT
+                    if level is not None:
+                        # A browser restart wins over a context recycle requested by another worker
+                        recycle_level = BROWSER if BROWSER in (level, recycle_level) else CONTEXT
+                        restart_requested.set()
+        return worker_page
 
-            # Sanitize and prepare offer data
-            offer_data = {
-                "job_url": sanitize_string(job_url),
-                "job_title": sanitize_string(job_title),
-                "category": sanitize_string(category),
-                "company": sanitize_string(company),
-                "location": sanitize_string(location),
-                "salary_any": sanitize_string(salary_any),
-                "salary_b2b": sanitize_string(salary_b2b),
-                "salary_internship": sanitize_string(salary_internship),
-                "salary_mandate": sanitize_string(salary_mandate),
-                "salary_permanent": sanitize_string(salary_permanent),
-                "salary_specific_task": sanitize_string(salary_specific_task),
-                "work_schedule": sanitize_string(work_schedule),
-                "experience": sanitize_string(experience),
-                "employment_type": sanitize_string(employment_type),
-                "operating_mode": sanitize_string(operating_mode),
-                "tech_stack": sanitize_string(tech_stack_formatted),
-                "description": sanitize_string(description)
-            }
-            
-            # Save to database (we already filtered out existing offers at the start)
+    try:
+        while not queue.empty():
+            context = page.context
+            pages = [page]
+            for _ in range(min(concurrency, queue.qsize()) - 1):
+                try:
+                    pages.append(await context.new_page())
+                except Exception as e:
+                    logging.warning(f"⚠️ Could not open additional page: {e}")
+                    break
+
+            restart_requested = asyncio.Event()
+            # Workers hand back the page they ended on, a replacement if their tab crashed
+            pages = await asyncio.gather(*(worker(p, context, restart_requested) for p in pages))
+            page = pages[0]
+
+            for extra_page in pages[1:]:
+                try:
+                    await extra_page.close()
+                except Exception:
+                    pass
+
+            if write_error is not None:
+                logging.error(f"❌ Saving offers failed, stopping ({queue.qsize()} offers left unscraped): {write_error}")
+                raise write_error
+
+            if restart_requested.is_set():
+                done = total - queue.qsize()
+                METRICS.inc("browser_recycles_total", level=recycle_level or BROWSER)
+                if recycle_level == BROWSER:
+                    logging.info(f"♻️  Restarting browser for memory cleanup (processed {done}/{total} offers)")
+                    browser, page = await restart_browser(playwright, browser, page, profile)
+                    since_restart = 0
+                else:
+                    logging.info(f"♻️  Recycling browser context for memory cleanup (processed {done}/{total} offers)")
+                    page = await recycle_context(browser, page, profile)
+                if memory is not None:
+                    memory.recycled(recycle_level)
+                recycle_level = None
+    finally:
+        if writer is not None:
+            try:
+                await writer.close()
+            except Exception:
+                # Already raised from the workers; the fetcher and skill stream still need closing
+                if write_error is None:
+                    raise
+        if owns_fetcher:
+            await fetcher.close()
+        if owns_skills:
+            await skills.close()
+
+    if writer is not None:
+        processed_count = writer.written
+        failed_count += writer.failed
+
+    if profile is not None:
+        profile.log_summary()
+    if owns_fetcher:
+        fetcher.log_summary()
+    if owns_rate:
+        rate.log_state()
+    if owns_memory:
+        memory.log_summary()
+    if failed_count:
+        logging.warning(f"⚠️ Failed to process {failed_count} offers")
+    logging.info(f"✅ Processed {total} offers ({processed_count} new or changed)")
+    return processed_count, page
+
+
+async def process_queue(page: Page, conn, queue: ScrapeQueue, browser=None, playwright=None, profile: Optional[NavigationProfile] = None) -> tuple[int, Page]:
+    """
+    Work the shared scrape queue until it stays empty.
+
+    Claims `QUEUE_BATCH_SIZE` URLs at a time, scrapes them with `process_offers`
+    (which reports done/failed into the queue) and acknowledges the batch.
+    The worker exits once no URL could be claimed for `QUEUE_IDLE_TIMEOUT`
+    seconds.
+
+    Args:
+        page: Playwright page object
+        conn: Database connection for offers (the queue uses its own)
+        queue: This worker's `ScrapeQueue`
+        browser: Playwright browser object (optional, for memory cleanup)
+        playwright: Playwright instance (optional, for memory cleanup)
+        profile: Fast navigation profile (optional)
+
+    Returns:
+        tuple[int, Page]: Number of offers inserted or changed and the current page object
+    """
+    processed_count = 0
+    since_restart = 0
+    idle_since = None
+    started = time.perf_counter()
+    logging.info(f"👷 Worker {queue.worker_id} started")
+
+    # One pooled client for every batch this worker claims
+    fetcher = OfferFetcher() if ScrapingConfig.HTTP_FAST_PATH else None
+    rate = RateController()
+    memory = MemoryMonitor() if ScrapingConfig.MEMORY_RECYCLING else None
+    skills = SkillStream() if ScrapingConfig.STREAM_SKILLS else None
+    if skills is not None:
+        await skills.start()
+    queue.start_heartbeat()
+    try:
+        while True:
+            listings = await queue.claim()
+            if not listings:
+                idle_since = idle_since or time.perf_counter()
+                if time.perf_counter() - idle_since >= ScrapingConfig.QUEUE_IDLE_TIMEOUT:
+                    break
+                await asyncio.sleep(ScrapingConfig.QUEUE_POLL_INTERVAL)
+                continue
+            idle_since = None
+
+            logging.info(f"📦 Claimed {len(listings)} offers")
             try:
-                await conn.execute(
-                    """
-                    INSERT INTO offers (job_url, job_title, category, company, location, salary_any, salary_b2b, salary_internship, salary_mandate, salary_permanent, salary_specific_task, work_schedule, experience, employment_type, operating_mode, tech_stack, description, created_at)
-                    VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15,$16,$17, CURRENT_TIMESTAMP)
-                    """,
-                    offer_data["job_url"], offer_data["job_title"], offer_data["category"], 
-                    offer_data["company"], offer_data["location"], offer_data["salary_any"], 
-                    offer_data["salary_b2b"], offer_data["salary_internship"], offer_data["salary_mandate"], 
-                    offer_data["salary_permanent"], offer_data["salary_specific_task"], offer_data["work_schedule"], 
-                    offer_data["experience"], offer_data["employment_type"], offer_data["operating_mode"], 
-                    offer_data["tech_stack"], offer_data["description"]
+                count, page = await process_offers(
+                    page, conn, list(listings), page.context.browser or browser, playwright,
+                    profile=profile, listings=listings, journal=queue, refresh_policy=False, fetcher=fetcher, rate=rate, memory=memory, skills=skills,
                 )
-                processed_count += 1
-            except Exception as db_error:
-                logging.error(f"Database error saving offer {job_url}: {db_error}")
-                # If it's a connection error, we'll let the caller handle reconnection
-                if "connection is closed" in str(db_error).lower():
-                    raise db_error
-                        
-        except Exception as e:
-            logging.error(f"Error processing job offer {href}: {e}")
-        finally:
-            # Small delay between requests to be respectful
-            await asyncio.sleep(ScrapingConfig.REQUEST_DELAY)
-    
-    logging.info(f"✅ Processed {processed_count} new offers")
-    return processed_count, page
\ No newline at end of file
+                processed_count += count
+            finally:
+                await queue.ack()
+
+            # Without memory measurements: batches are smaller than RESTART_BROWSER_EVERY, so count across them
+            since_restart += len(listings)
+            if (memory is None or not memory.available) and playwright is not None and since_restart >= ScrapingConfig.RESTART_BROWSER_EVERY:
+                logging.info(f"♻️  Restarting browser for memory cleanup ({queue.claimed} offers claimed)")
+                browser, page = await restart_browser(playwright, page.context.browser or browser, page, profile)
+                since_restart = 0
+    finally:
+        await queue.stop_heartbeat()
+        rate.log_state()
+        if memory is not None:
+            memory.log_summary()
+        if fetcher is not None:
+            fetcher.log_summary()
+            await fetcher.close()
+        if skills is not None:
+            await skills.close()
+
+    elapsed = time.perf_counter() - started
+    offers_per_min = queue.claimed / elapsed * 60 if elapsed else 0
+    logging.info(f"👷 Worker {queue.worker_id} done: {queue.claimed} offers claimed, {processed_count} new or changed ({offers_per_min:.1f} offers/min)")
+    return processed_count, page
@@ -0,0 +1,165 @@
+# selector_health.py
+"""
+Selector health telemetry and adaptive candidate ranking.
+
+Every text field has an ordered chain of candidate selectors (see
+`SelectorConfig.chain`). Each time a candidate is tried, its outcome and
+latency are recorded here, and its score (an exponentially weighted hit
+rate, `SELECTOR_SCORE_ALPHA`) is updated. Candidates keep their configured
+order - fallbacks may read a slightly different text, so a working primary
+stays first - but a candidate whose score drops below `SELECTOR_MIN_SCORE`
+moves behind the working ones. When the site changes its markup, the broken
+selector is demoted within a few offers instead of every offer first waiting
+it out. Every `SELECTOR_PROBE_EVERY`-th offer tries the configured order
+again, so a demoted selector that works again is promoted back.
+
+The statistics are saved to `SELECTOR_STATS_PATH` at the end of a run and
+loaded at the start of the next one, so a run starts with the ranking the
+previous one ended with.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import ScrapingConfig
+
+# Score of a candidate that has never been tried
+_PRIOR = 0.5
+
+
+class SelectorHealth:
+    """Success rate and latency per selector candidate, ranking each field's chain."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or ScrapingConfig.SELECTOR_STATS_PATH)
+        self.stats: dict[str, dict[str, dict]] = {}
+        self._baseline: dict[tuple[str, str], tuple[int, int, float]] = {}  # Counts loaded from the previous run
+        self._ranked: dict[str, int] = {}
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Could not read selector statistics from {self.path}: {e}")
+            return
+        self.stats = data.get("fields", {})
+        self._baseline = {
+            (field, selector): (entry["attempts"], entry["hits"], entry["ms_total"])
+            for field, selectors in self.stats.items() for selector, entry in selectors.items()
+        }
+        logging.debug(f"🧭 Loaded selector statistics for {len(self.stats)} fields from {self.path}")
+
+    def _entry(self, field: str, selector: str) -> dict:
+        self._load()
+        return self.stats.setdefault(field, {}).setdefault(selector, {"attempts": 0, "hits": 0, "ms_total": 0.0, "score": _PRIOR})
+
+    def record(self, field: str, selector: str, hit: bool, ms: float):
+        """Record one attempt of a candidate selector."""
+        entry = self._entry(field, selector)
+        entry["attempts"] += 1
+        entry["hits"] += int(hit)
+        entry["ms_total"] += ms
+        entry["score"] += ScrapingConfig.SELECTOR_SCORE_ALPHA * ((1.0 if hit else 0.0) - entry["score"])
+
+    def _score(self, field: str, selector: str) -> float:
+        entry = self.stats.get(field, {}).get(selector)
+        return entry["score"] if entry else _PRIOR
+
+    def rank(self, field: str, chain: list[str]) -> list[str]:
+        """
+        Order a field's candidates for the next attempt: working ones in configured order, then demoted ones by score.
+
+        Returns:
+            list[str]: The same selectors in the order to try them
+        """
+        self._load()
+        if not ScrapingConfig.SELECTOR_RANKING:
+            return list(chain)
+        self._ranked[field] = self._ranked.get(field, 0) + 1
+        if self._ranked[field] % ScrapingConfig.SELECTOR_PROBE_EVERY == 0:
+            return list(chain)
+        return self.order(field, chain)
+
+    def order(self, field: str, chain: list[str]) -> list[str]:
+        """Current ranking of a field's candidates (without counting as an attempt)."""
+        self._load()
+        def key(item):
+            index, selector = item
+            score = self._score(field, selector)
+            if score >= ScrapingConfig.SELECTOR_MIN_SCORE:
+                return (0, 0.0, index)
+            return (1, -score, index)
+
+        return [selector for _, selector in sorted(enumerate(chain), key=key)]
+
+    def snapshot(self) -> dict:
+        """This run's attempts per candidate, with current scores (used to merge farm workers)."""
+        self._load()
+        fields: dict[str, dict[str, dict]] = {}
+        for field, selectors in self.stats.items():
+            for selector, entry in selectors.items():
+                attempts, hits, ms_total = self._baseline.get((field, selector), (0, 0, 0.0))
+                if entry["attempts"] > attempts:
+                    fields.setdefault(field, {})[selector] = {
+                        "attempts": entry["attempts"] - attempts,
+                        "hits": entry["hits"] - hits,
+                        "ms_total": entry["ms_total"] - ms_total,
+                        "score": entry["score"],
+                    }
+        return {"fields": fields}
+
+    def merge(self, snapshot: dict):
+        """Add another process's run (see `snapshot`) into these statistics."""
+        for field, selectors in snapshot.get("fields", {}).items():
+            for selector, other in selectors.items():
+                entry = self._entry(field, selector)
+                total = entry["attempts"] + other["attempts"]
+                entry["score"] = (entry["score"] * entry["attempts"] + other["score"] * other["attempts"]) / total
+                entry["attempts"] = total
+                entry["hits"] += other["hits"]
+                entry["ms_total"] += other["ms_total"]
+
+    def save(self):
+        """Write the statistics for the next run (atomically)."""
+        if not self.stats:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps({"updated_at": time.time(), "fields": self.stats}, indent=2))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save selector statistics to {self.path}: {e}")
+
+    def log_summary(self, chains: dict[str, list[str]]):
+        """
+        Log every field whose primary selector is demoted, and each candidate's health.
+
+        Args:
+            chains: Field -> configured candidate chain
+        """
+        for field, chain in chains.items():
+            field_stats = self.stats.get(field, {})
+            ranked = self.order(field, chain)
+            for selector in ranked:
+                entry = field_stats.get(selector)
+                if entry and entry["attempts"]:
+                    logging.debug(f"🧭 {field}: {selector!r} {entry['hits']}/{entry['attempts']} hits, "
+                                  f"{entry['ms_total'] / entry['attempts']:.1f} ms avg, score {entry['score']:.2f}")
+            if ranked and ranked[0] != chain[0]:
+                logging.warning(f"🧭 {field}: primary selector {chain[0]!r} is failing (score {self._score(field, chain[0]):.2f}), "
+                                f"{ranked[0]!r} is tried first (score {self._score(field, ranked[0]):.2f}) - check selectors.py")
+
+
+# Process-wide statistics
+SELECTOR_HEALTH = SelectorHealth()
@@ -14,6 +14,12 @@ class SelectorConfig:
     primary: str
     description: str = ""
     fallback: str = ""
+    candidates: tuple[str, ...] = ()  # Further alternatives, tried after primary and fallback
+
+    @property
+    def chain(self) -> list[str]:
+        """Every candidate selector in configured order (primary, fallback, candidates)."""
+        return list(dict.fromkeys(s for s in (self.primary, self.fallback, *self.candidates) if s))
 
 
 class JustJoinItSelectors:
@@ -59,21 +65,28 @@ class JustJoinItSelectors:
     
     WORK_SCHEDULE = SelectorConfig(
         primary='.MuiStack-root:has(> .MuiStack-root > svg path[d^="M21 19C21 19.552"])', # Suitcase Icon
+        candidates=('div:has(> div > svg path[d^="M21 19C21 19.552"])',),  # Same icon, without the MUI class names
         description="Work schedule (Full-time, etc.)"
     )
     
     EMPLOYMENT_TYPE = SelectorConfig(
         primary='.MuiStack-root:has(> .MuiStack-root > svg path[d^="M6 22.625"])', # Document Icon
+        candidates=('div:has(> div > svg path[d^="M6 22.625"])',),
         description="Employment type (B2B, Permanent, etc.)"
     )
     
     EXPERIENCE = SelectorConfig(
         primary='.MuiStack-root:has(> .MuiStack-root > svg[data-testid="SchoolOutlinedIcon"])', # School Icon
+        candidates=(
+            'div:has(> div > svg[data-testid="SchoolOutlinedIcon"])',
+            'div:has(> div > svg[data-testid*="School"])',  # Any variant of the school icon
+        ),
         description="Experience level (Junior, Mid, Senior)"
     )
     
     OPERATING_MODE = SelectorConfig(
         primary='.MuiStack-root:has(> .MuiStack-root > svg path[d^="M16.065 24.2315"])', # Globe/Network Icon
+        candidates=('div:has(> div > svg path[d^="M16.065 24.2315"])',),
         description="Operating mode (Remote, Hybrid, Office)"
     )
     
@@ -116,7 +129,10 @@ class SelectorPatterns:
 
 def get_selector(selector_config: SelectorConfig) -> str:
     """
-    Get the selector string from configuration.
+    Get the primary selector string from configuration.
+
+    Offer text fields are read through ranked candidate chains instead
+    (see `dom_extract.field_selectors`).
     
     Args:
         selector_config: SelectorConfig object containing selector information
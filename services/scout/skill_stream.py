@@ -0,0 +1,99 @@
+# skill_stream.py
+"""
+Streaming scrape → skills pipeline.
+
+Without it, offers only get their skills after the scrape has finished and
+the Atlas normalization Lambda has re-read every offer. With
+`STREAM_SKILLS` on, every offer saved by `process_offers` is put on an
+asyncio queue; a consumer on its own database connection takes them in
+batches of up to `SKILL_STREAM_BATCH_SIZE`, parses their `tech_stack`,
+inserts raw skills it has not seen yet and links `offer_skills`
+(`atlas.normalize_skills.ingest_offer_skills`). Offers whose raw skills are
+already normalized become searchable within seconds of being scraped; new
+raw skills are linked as pending rows and get their canonical name from the
+next normalization run, which still runs after the scrape.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .config import ScrapingConfig
+from .db import init_db_connection
+from .metrics import METRICS
+
+
+class SkillStream:
+    """Queue of saved offers and the consumer linking their skills."""
+
+    def __init__(self, conn=None):
+        self.conn = conn
+        self._owns_conn = conn is None
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._ingest = None
+        self.offers = 0
+        self.new_skills = 0
+        self.links = 0
+        self.failed = 0
+        self.lag_max = 0.0
+
+    async def start(self):
+        """Open the stream's connection and start the consumer."""
+        # Atlas lives next to Scout (PYTHONPATH=services); only needed in streaming mode
+        from atlas.normalize_skills import ingest_offer_skills
+        self._ingest = ingest_offer_skills
+        if self.conn is None:
+            self.conn = await init_db_connection()
+        self._task = asyncio.create_task(self._consume())
+        logging.info("🌊 Streaming skills of saved offers into offer_skills")
+
+    def put(self, offers: list[dict]):
+        """Queue saved offers (the `OfferWriter.on_saved` / journal hook)."""
+        now = time.monotonic()
+        for offer in offers:
+            if offer.get("tech_stack"):
+                self.queue.put_nowait((now, offer["job_url"], offer["tech_stack"], offer.get("category")))
+
+    async def _consume(self):
+        while True:
+            item = await self.queue.get()
+            batch = [item] if item is not None else []
+            while item is not None and len(batch) < ScrapingConfig.SKILL_STREAM_BATCH_SIZE and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                await self._link(batch)
+            if item is None:
+                return
+
+    async def _link(self, batch: list[tuple]):
+        try:
+            with METRICS.timer("skill_stream"):
+                new_skills, links = await self._ingest(self.conn, [(url, stack, category) for _, url, stack, category in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            METRICS.inc("skill_stream_failures_total", error=type(e).__name__)
+            logging.error(f"❌ Could not link skills of {len(batch)} offers: {e}")
+            return
+        self.offers += len(batch)
+        self.new_skills += new_skills
+        self.links += links
+        self.lag_max = max(self.lag_max, time.monotonic() - batch[0][0])
+        METRICS.inc("skill_stream_offers_total", len(batch))
+        METRICS.inc("skill_stream_links_total", links)
+        logging.debug(f"🌊 Linked {links} skills for {len(batch)} offers ({new_skills} new raw skills)")
+
+    async def close(self):
+        """Drain the queue, stop the consumer and log what was linked."""
+        if self._task is not None:
+            self.queue.put_nowait(None)
+            await self._task
+            self._task = None
+        if self._owns_conn and self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+        logging.info(f"🌊 Skill stream: {self.offers} offers linked ({self.links} links, {self.new_skills} new raw skills), "
+                     f"{self.failed} failed, max lag {self.lag_max:.1f} s")
@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.dom_extract import TEXT_FIELDS, field_chain, to_dom_query  # noqa: E402
+
+
+@pytest.mark.parametrize("field", sorted(TEXT_FIELDS))
+def test_candidates_run_in_the_single_pass_script(field):
+    assert all(to_dom_query(selector) is not None for selector in field_chain(field))
+
+
+@pytest.mark.parametrize("field", ["work_schedule", "employment_type", "experience", "operating_mode"])
+def test_icon_fields_have_candidates_beyond_the_mui_classes(field):
+    chain = field_chain(field)
+    assert len(chain) >= 2
+    assert any("MuiStack-root" not in selector for selector in chain)
+
+
+def test_to_dom_query_forms():
+    assert to_dom_query("h1") == {"css": "h1"}
+    assert to_dom_query("xpath=//h1 >> nth=1") == {"nth": 1, "xpath": "//h1"}
+    assert to_dom_query('h2:has-text("Job description") + div') == {"css": "h2", "text": "Job description", "rest": "+ div"}
+    assert to_dom_query("text=Apply") is None
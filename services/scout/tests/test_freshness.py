@@ -0,0 +1,52 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.config import ScrapingConfig  # noqa: E402
+from scout.freshness import content_hash, listing_hash, select_offers_to_scrape  # noqa: E402
+
+LISTING = {"job_title": "Python Developer", "company": "Acme"}
+RECENT = datetime.now() - timedelta(days=1)
+STALE = datetime.now() - timedelta(days=ScrapingConfig.REFRESH_AFTER_DAYS + 1)
+
+
+def _record(listing=LISTING, scraped_at=RECENT):
+    return {"listing_hash": listing_hash(listing), "scraped_at": scraped_at}
+
+
+def test_listing_hash_ignores_key_order():
+    assert listing_hash({"a": 1, "b": 2}) == listing_hash({"b": 2, "a": 1})
+    assert listing_hash({}) is None
+    assert listing_hash(None) is None
+
+
+def test_content_hash_ignores_url_and_unknown_columns():
+    offer = {"job_url": "https://example.com/a", "job_title": "Python Developer"}
+    assert content_hash(offer) == content_hash({**offer, "job_url": "https://example.com/b", "listing_hash": "x"})
+    assert content_hash(offer) != content_hash({**offer, "job_title": "Java Developer"})
+
+
+def test_new_changed_and_due_offers_are_selected_in_order():
+    existing = {
+        "due": _record(scraped_at=STALE),
+        "changed": _record(),
+        "unchanged": _record(),
+        "never-scraped": _record(scraped_at=None),
+    }
+    listings = {url: LISTING for url in existing}
+    listings["changed"] = {**LISTING, "company": "Acme Software"}
+
+    selected = select_offers_to_scrape(["due", "unchanged", "new", "changed", "never-scraped"], existing, listings)
+    assert selected == ["new", "changed", "due", "never-scraped"]
+
+
+def test_offers_without_stored_listing_hash_are_not_changed():
+    existing = {"old": {"listing_hash": None, "scraped_at": RECENT}}
+    assert select_offers_to_scrape(["old"], existing, {"old": LISTING}) == []
+
+
+def test_offers_without_listing_fields_only_follow_the_refresh_age():
+    existing = {"recent": _record(), "stale": _record(scraped_at=STALE)}
+    assert select_offers_to_scrape(["recent", "stale"], existing) == ["stale"]
@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.bench import FIXTURES_DIR, check_accuracy  # noqa: E402
+from scout.http_fetch import format_salary, html_to_text, parse_offer_html  # noqa: E402
+from scout.listing_capture import offer_url  # noqa: E402
+from scout.scrape_core import build_offer_data  # noqa: E402
+
+EXPECTED = json.loads((FIXTURES_DIR / "expected.json").read_text())
+# Offer pages rendered without embedded data: only Playwright can read them
+DOM_ONLY = {
+    "cloudnine-devops-engineer-gdansk-devops",
+    "secureops-security-analyst-katowice-security",
+    "startly-qa-intern-poznan-testing",
+}
+
+
+def _parse(slug: str):
+    html = (FIXTURES_DIR / "offers" / f"{slug}.html").read_text()
+    return parse_offer_html(offer_url(slug), html)
+
+
+def test_fixture_corpus_is_complete():
+    slugs = {path.stem for path in (FIXTURES_DIR / "offers").glob("*.html")}
+    assert slugs == set(EXPECTED)
+
+
+@pytest.mark.parametrize("slug", sorted(set(EXPECTED) - DOM_ONLY))
+def test_fast_path_matches_expected(slug):
+    raw = _parse(slug)
+    assert raw is not None
+    url = offer_url(slug)
+    accuracy = check_accuracy({url: build_offer_data(url, raw)}, EXPECTED)
+    assert accuracy["mismatches"] == []
+
+
+@pytest.mark.parametrize("slug", sorted(DOM_ONLY))
+def test_pages_without_embedded_data_fall_back(slug):
+    assert _parse(slug) is None
+
+
+def test_state_of_another_offer_is_not_used():
+    html = (FIXTURES_DIR / "offers" / "acme-senior-python-developer-warszawa-python.html").read_text()
+    assert parse_offer_html(offer_url("some-other-offer"), html) is None
+
+
+def test_html_to_text():
+    assert html_to_text("<p>One</p><ul><li>Two</li></ul>") == "One\nTwo"
+    assert html_to_text(None) is None
+
+
+def test_format_salary():
+    assert format_salary(20000, 26000, "pln", False, "month", "B2B") == "20 000 - 26 000 PLN\nNet per month - B2B"
+    assert format_salary(4000, 4000, "pln", True, "month", "Internship") == "4 000 PLN\nGross per month - Internship"
+    assert format_salary(None, None, "pln", True, "month", "Permanent") is None
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.config import ScrapingConfig  # noqa: E402
+from scout.journal import RunJournal  # noqa: E402
+
+LISTINGS = {
+    "https://example.com/job-offer/a": {"job_title": "A"},
+    "https://example.com/job-offer/b": {},
+    "https://example.com/job-offer/c": {"job_title": "C"},
+}
+
+
+def _journal(directory: Path, name: str = "run-20260101-000000") -> RunJournal:
+    journal = RunJournal(directory / f"{name}.sqlite3")
+    journal._set("status", "collecting")
+    return journal
+
+
+def test_links_are_pending_until_done(tmp_path):
+    journal = _journal(tmp_path)
+    assert not journal.has_links
+    journal.record_links(LISTINGS)
+    assert journal.has_links
+    assert journal.listings() == LISTINGS
+    assert journal.pending_urls() == list(LISTINGS)
+
+    journal.mark_done(["https://example.com/job-offer/a"])
+    journal.mark_failed("https://example.com/job-offer/b", "timeout")
+    assert journal.pending_urls() == ["https://example.com/job-offer/b", "https://example.com/job-offer/c"]
+    assert journal.summary() == {"done": 1, "failed": 1, "pending": 1}
+
+
+def test_failed_urls_stop_after_max_attempts(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScrapingConfig, "JOURNAL_MAX_ATTEMPTS", 2)
+    journal = _journal(tmp_path)
+    journal.record_links(LISTINGS)
+    for _ in range(2):
+        journal.mark_failed("https://example.com/job-offer/b", "timeout")
+    assert "https://example.com/job-offer/b" not in journal.pending_urls()
+
+
+def test_recording_links_again_keeps_states(tmp_path):
+    journal = _journal(tmp_path)
+    journal.record_links(LISTINGS)
+    journal.mark_done(["https://example.com/job-offer/a"])
+    journal.record_links(LISTINGS)
+    assert "https://example.com/job-offer/a" not in journal.pending_urls()
+
+
+def test_latest_unfinished_skips_finished_runs(tmp_path):
+    older = _journal(tmp_path, "run-20260101-000000")
+    newer = _journal(tmp_path, "run-20260102-000000")
+    newer.finish()
+    newer.close()
+
+    resumed = RunJournal.latest_unfinished(str(tmp_path))
+    assert resumed is not None and resumed.path == older.path
+    resumed.close()
+    older.close()
+
+
+def test_finish_prunes_only_finished_journals(tmp_path, monkeypatch):
+    monkeypatch.setattr(ScrapingConfig, "JOURNAL_KEEP", 2)
+    unfinished = _journal(tmp_path, "run-20260101-000000")
+    unfinished.close()
+    for day in range(2, 5):
+        journal = _journal(tmp_path, f"run-2026010{day}-000000")
+        journal.finish()
+        journal.close()
+
+    remaining = sorted(path.name for path in tmp_path.glob("run-*.sqlite3"))
+    assert remaining == ["run-20260101-000000.sqlite3", "run-20260103-000000.sqlite3", "run-20260104-000000.sqlite3"]
@@ -0,0 +1,76 @@
+import json
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.bench import FIXTURES_DIR  # noqa: E402
+from scout.listing_capture import (  # noqa: E402
+    ListingCapture, iter_json_fragments, iter_listing_items, normalize_offer_href, offer_url, reported_total,
+)
+
+EXPECTED = json.loads((FIXTURES_DIR / "expected.json").read_text())
+
+
+def _api_page() -> dict:
+    return json.loads((FIXTURES_DIR / "api" / "offers-page-2.json").read_text())
+
+
+def _next_data() -> dict:
+    html = (FIXTURES_DIR / "listing.html").read_text()
+    match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', html, re.S)
+    return json.loads(match.group(1))
+
+
+def test_listing_fixtures_cover_every_offer():
+    urls = [url for payload in (_next_data(), _api_page()) for url, _ in iter_listing_items(payload)]
+    assert len(urls) == len(set(urls))
+    assert set(urls) == {offer_url(slug) for slug in EXPECTED}
+
+
+def test_iter_listing_items_reads_json_ld_postings():
+    payload = {"@graph": [{"@type": "JobPosting", "url": "/job-offer/acme-python", "title": "Python Developer"}]}
+    assert [url for url, _ in iter_listing_items(payload)] == [offer_url("acme-python")]
+
+
+def test_iter_listing_items_ignores_objects_without_offer_fields():
+    assert list(iter_listing_items({"data": [{"slug": "python"}], "slug": "all-locations"})) == []
+
+
+def test_iter_json_fragments_finds_objects_in_text():
+    text = 'self.push("x");{"offer":{"slug":"acme-python","title":"Python"}} trailing {broken'
+    assert list(iter_json_fragments(text)) == [{"slug": "acme-python", "title": "Python"}]
+
+
+def test_normalize_offer_href():
+    assert normalize_offer_href("/job-offer/acme-python") == offer_url("acme-python")
+    assert normalize_offer_href(offer_url("acme-python")) == offer_url("acme-python")
+    assert normalize_offer_href("/job-offers/all-locations") is None
+
+
+def test_reported_total():
+    assert reported_total({"data": [], "meta": {"totalItems": 120}}) == 120
+    assert reported_total({"pagination": {"totalCount": 7}}) == 7
+    assert reported_total(_api_page()) is None
+    assert reported_total({"meta": {"total": True}}) is None
+
+
+def test_capture_counts_new_offers_and_totals():
+    capture = ListingCapture()
+    assert capture.ingest(_next_data()) == 5
+    assert capture.ingest(_api_page()) == 3
+    assert capture.ingest(_api_page()) == 0
+    capture.ingest({"data": [], "meta": {"totalItems": 8}})
+    assert len(capture.offers) == 8
+    assert capture.reported_total == 8
+
+
+def test_capture_merges_fields_of_repeated_offers():
+    capture = ListingCapture()
+    capture.ingest({"data": [{"slug": "acme-python", "title": "Python Developer", "companyName": "Acme",
+                              "requiredSkills": [{"name": "Python"}]}]})
+    capture.ingest({"@type": "JobPosting", "url": offer_url("acme-python"), "title": "Python Developer"})
+    assert capture.offers[offer_url("acme-python")] == {
+        "job_title": "Python Developer", "company": "Acme", "skills": ["Python"],
+    }
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.navigation import _transfer_bytes  # noqa: E402
+
+
+class _Response:
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+class _Request:
+    def __init__(self, sizes: dict = None, headers: dict = None):
+        self._sizes = sizes
+        self._headers = headers
+
+    async def sizes(self) -> dict:
+        if self._sizes is None:
+            raise RuntimeError("Unable to fetch sizes for failed request")
+        return self._sizes
+
+    async def response(self):
+        return _Response(self._headers) if self._headers is not None else None
+
+
+def test_transfer_bytes_counts_encoded_body_and_headers():
+    # A chunked, compressed document carries no Content-Length
+    request = _Request(sizes={"responseBodySize": 18_000, "responseHeadersSize": 512}, headers={})
+    assert asyncio.run(_transfer_bytes(request)) == 18_512
+
+
+def test_transfer_bytes_ignores_unknown_sizes():
+    request = _Request(sizes={"responseBodySize": -1, "responseHeadersSize": 300})
+    assert asyncio.run(_transfer_bytes(request)) == 300
+
+
+def test_transfer_bytes_falls_back_to_content_length():
+    assert asyncio.run(_transfer_bytes(_Request(headers={"content-length": "2048"}))) == 2048
+    assert asyncio.run(_transfer_bytes(_Request(headers={"content-length": "n/a"}))) == 0
+    assert asyncio.run(_transfer_bytes(_Request())) == 0
@@ -0,0 +1,117 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.config import ScrapingConfig  # noqa: E402
+from scout.rate_control import (  # noqa: E402
+    RateController, ThrottledResponse, is_throttle_status, parse_retry_after,
+)
+from scout.scrape_core import requeue_throttled  # noqa: E402
+
+
+def _controller(**kwargs) -> RateController:
+    kwargs.setdefault("max_concurrency", 8)
+    kwargs.setdefault("initial_concurrency", 2)
+    kwargs.setdefault("initial_delay", 0.0)
+    return RateController(**kwargs)
+
+
+async def _request(rate: RateController, error: Exception = None, path: str = "browser"):
+    async with rate.track() as request:
+        request.path = path
+        if error is not None:
+            raise error
+
+
+def test_throttle_statuses():
+    assert is_throttle_status(429)
+    assert is_throttle_status(503)
+    assert not is_throttle_status(404)
+    assert not is_throttle_status(None)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2026 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+def test_successes_increase_concurrency():
+    rate = _controller()
+    for _ in range(10):
+        rate._success(0.1)
+    assert rate.concurrency > 2
+    assert rate.concurrency <= rate.max_concurrency
+
+
+def test_throttled_request_backs_off_and_propagates():
+    rate = _controller(initial_concurrency=8)
+
+    with pytest.raises(ThrottledResponse):
+        asyncio.run(_request(rate, ThrottledResponse("https://example.com", 429)))
+    assert rate.concurrency == 4
+    assert rate.delay > 0
+    assert rate.throttled == 1
+    assert rate.in_flight == 0
+
+
+def test_burst_of_errors_is_one_backoff():
+    rate = _controller(initial_concurrency=8)
+
+    async def run():
+        for _ in range(3):
+            with pytest.raises(ThrottledResponse):
+                await _request(rate, ThrottledResponse("https://example.com", 503))
+
+    asyncio.run(run())
+    assert rate.decreases == 1
+    assert rate.concurrency == 4
+
+
+def test_timeouts_count_as_congestion_other_errors_do_not():
+    rate = _controller(initial_concurrency=8)
+
+    async def run():
+        with pytest.raises(ValueError):
+            await _request(rate, ValueError("could not parse"))
+        assert rate.decreases == 0
+        with pytest.raises(asyncio.TimeoutError):
+            await _request(rate, asyncio.TimeoutError())
+
+    asyncio.run(run())
+    assert rate.timeouts == 1
+    assert rate.decreases == 1
+
+
+def test_latency_is_compared_within_each_path():
+    rate = _controller()
+    for _ in range(10):
+        rate._success(0.2, "http")
+    # The browser path is much slower than the fast path, but steady
+    for _ in range(10):
+        rate._success(2.0, "browser")
+    assert rate.slow == 0
+
+    for _ in range(10):
+        rate._success(20.0, "browser")
+    assert rate.slow > 0
+    assert set(rate.state()["latency"]) == {"http", "browser"}
+
+
+def test_throttled_offers_are_requeued_a_limited_number_of_times(monkeypatch):
+    monkeypatch.setattr(ScrapingConfig, "THROTTLE_RETRIES", 2)
+    queue: asyncio.Queue = asyncio.Queue()
+    retries: dict[str, int] = {}
+    item = (1, "https://example.com/job-offer/a")
+    error = ThrottledResponse(item[1], 429)
+
+    assert requeue_throttled(queue, retries, item, error)
+    assert requeue_throttled(queue, retries, item, error)
+    assert not requeue_throttled(queue, retries, item, error)
+    assert queue.qsize() == 2
+    assert not requeue_throttled(queue, retries, (2, "https://example.com/job-offer/b"), ValueError("bad page"))
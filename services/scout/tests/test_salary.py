@@ -0,0 +1,58 @@
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scout.salary import SALARY_COLUMNS, parse_salary, salary_columns  # noqa: E402
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("20 000 - 25 000 PLN\nNet per month - B2B", ("20000", "25000", "PLN", False, "month")),
+    ("90 000 - 120 000 USD Gross per year", ("90000", "120000", "USD", True, "year")),
+    ("30 000 – 20 000 pln gross per month", ("20000", "30000", "PLN", True, "month")),
+    ("25,000 PLN Gross per month", ("25000", "25000", "PLN", True, "month")),
+    ("12\xa0000 PLN Net per month", ("12000", "12000", "PLN", False, "month")),
+    ("150 - 180 PLN Net per hour", ("150", "180", "PLN", False, "hour")),
+    ("150.50 EUR Net per hour", ("150.50", "150.50", "EUR", False, "hour")),
+    ("1 200 EUR Net per day", ("1200", "1200", "EUR", False, "day")),
+])
+def test_parse_salary(text, expected):
+    low, high, currency, is_gross, period = expected
+    assert parse_salary(text) == {
+        "min": Decimal(low),
+        "max": Decimal(high),
+        "currency": currency,
+        "is_gross": is_gross,
+        "period": period,
+    }
+
+
+@pytest.mark.parametrize("text", [None, "", "Undisclosed salary", "20 000 - 25 000", "PLN Net per month"])
+def test_parse_salary_rejects_non_salaries(text):
+    assert parse_salary(text) is None
+
+
+def test_salary_columns_follow_contract_priority():
+    columns = salary_columns({
+        "salary_permanent": "15 000 PLN Gross per month",
+        "salary_b2b": "20 000 - 25 000 PLN Net per month",
+    })
+    assert columns["salary_contract"] == "B2B"
+    assert (columns["salary_min"], columns["salary_max"]) == (Decimal("20000"), Decimal("25000"))
+
+
+def test_salary_columns_skip_unparseable_contract():
+    columns = salary_columns({
+        "salary_b2b": "Undisclosed salary",
+        "salary_permanent": "15 000 PLN Gross per month",
+    })
+    # The API shows the text of `salary_contract`, so it must name the parsed column
+    assert columns["salary_contract"] == "Permanent"
+    assert columns["salary_min"] == Decimal("15000")
+
+
+def test_salary_columns_without_salary():
+    assert salary_columns({"salary_b2b": "Undisclosed salary"}) == dict.fromkeys(SALARY_COLUMNS)
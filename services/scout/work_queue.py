@@ -0,0 +1,245 @@
+# work_queue.py
+"""
+Postgres work queue for running several scout workers in parallel.
+
+The collector enqueues the offer URLs selected by the refresh policy into
+`scrape_queue`. Any number of workers (processes or containers) claim batches
+with `FOR UPDATE SKIP LOCKED`, so concurrent claims never block on or return
+the same rows, and hold them under a lease that a heartbeat keeps renewing.
+If a worker dies, its lease expires and the URLs are claimed again by another
+worker, up to `QUEUE_MAX_ATTEMPTS` times; after that the row is marked failed
+(with its last error) the next time a worker claims or counts the queue.
+
+A `ScrapeQueue` exposes the same `mark_done` / `mark_failed` hooks as the run
+journal, so `process_offers` reports into it unchanged; the states are
+buffered and written back by `ack()` after each batch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Optional
+
+import asyncpg
+
+from .config import ScrapingConfig
+from .db import _affected_rows
+
+_CLAIM_QUERY = """
+    WITH claimable AS (
+        SELECT job_url
+        FROM scrape_queue
+        WHERE (state = 'pending' OR (state = 'claimed' AND lease_expires_at < CURRENT_TIMESTAMP))
+          AND attempts < $3
+        ORDER BY enqueued_at, job_url
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE scrape_queue q
+    SET state = 'claimed',
+        claimed_by = $2,
+        attempts = q.attempts + 1,
+        lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => $4),
+        updated_at = CURRENT_TIMESTAMP
+    FROM claimable c
+    WHERE q.job_url = c.job_url
+    RETURNING q.job_url, q.listing
+"""
+
+# Claimed rows whose lease expired with no attempts left: no worker will take them again
+_FAIL_EXHAUSTED_QUERY = """
+    UPDATE scrape_queue
+    SET state = 'failed',
+        error = COALESCE(error, 'lease expired') || ' (gave up after ' || attempts || ' attempts)',
+        claimed_by = NULL,
+        lease_expires_at = NULL,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE state = 'claimed'
+      AND lease_expires_at < CURRENT_TIMESTAMP
+      AND attempts >= $1
+"""
+
+
+def default_worker_id() -> str:
+    """Identify this worker in `scrape_queue.claimed_by`."""
+    return ScrapingConfig.WORKER_ID or f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ScrapeQueue:
+    """
+    One worker's handle on the shared `scrape_queue` table.
+
+    Uses its own connection: the heartbeat renews leases while the offers
+    connection is busy with writes.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, worker_id: Optional[str] = None):
+        self.conn = conn
+        self.worker_id = worker_id or default_worker_id()
+        self.claimed = 0
+        self._lock = asyncio.Lock()
+        self._done: list[str] = []
+        self._failed: list[tuple[str, str]] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def enqueue(self, listings: dict[str, dict]) -> int:
+        """
+        Replace the queue contents with a new run's URLs.
+
+        Finished rows from earlier runs are dropped; the given URLs are
+        (re)set to pending with their listing fields, except those a worker
+        still holds under a live lease.
+
+        Args:
+            listings: Offer URL -> listing fields, in scrape order
+
+        Returns:
+            int: Number of URLs enqueued
+        """
+        async with self._lock, self.conn.transaction():
+            await self.conn.execute("DELETE FROM scrape_queue WHERE state IN ('done', 'failed')")
+            await self.conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS scrape_queue_staging (job_url TEXT, listing JSONB, position INTEGER)
+                ON COMMIT DELETE ROWS
+            """)
+            await self.conn.copy_records_to_table(
+                "scrape_queue_staging",
+                records=[(url, json.dumps(fields or {}, ensure_ascii=False), i) for i, (url, fields) in enumerate(listings.items())],
+                columns=["job_url", "listing", "position"],
+            )
+            # Spread enqueued_at by position so claims follow the collector's order
+            result = await self.conn.execute("""
+                INSERT INTO scrape_queue (job_url, listing, state, attempts, enqueued_at, updated_at)
+                SELECT job_url, listing, 'pending', 0,
+                       CURRENT_TIMESTAMP + make_interval(secs => position / 1000.0), CURRENT_TIMESTAMP
+                FROM scrape_queue_staging
+                ON CONFLICT (job_url) DO UPDATE
+                SET listing = EXCLUDED.listing,
+                    state = 'pending',
+                    attempts = 0,
+                    claimed_by = NULL,
+                    lease_expires_at = NULL,
+                    error = NULL,
+                    enqueued_at = EXCLUDED.enqueued_at,
+                    updated_at = CURRENT_TIMESTAMP
+                -- Offers a worker holds under a live lease stay with that worker
+                WHERE scrape_queue.state <> 'claimed'
+                   OR scrape_queue.lease_expires_at < CURRENT_TIMESTAMP
+            """)
+        count = _affected_rows(result)
+        logging.info(f"📥 Enqueued {count} offers in scrape_queue")
+        return count
+
+    async def claim(self, limit: Optional[int] = None) -> dict[str, dict]:
+        """
+        Claim up to `limit` URLs (pending, or with an expired lease) for this worker.
+
+        Returns:
+            dict[str, dict]: Claimed offer URL -> listing fields
+        """
+        async with self._lock:
+            await self._fail_exhausted()
+            rows = await self.conn.fetch(
+                _CLAIM_QUERY,
+                limit or ScrapingConfig.QUEUE_BATCH_SIZE,
+                self.worker_id,
+                ScrapingConfig.QUEUE_MAX_ATTEMPTS,
+                float(ScrapingConfig.QUEUE_LEASE_SECONDS),
+            )
+        self.claimed += len(rows)
+        return {row["job_url"]: json.loads(row["listing"] or "{}") for row in rows}
+
+    def mark_done(self, urls: list[str]):
+        """Record URLs whose offers are stored (written back by `ack`)."""
+        self._done.extend(urls)
+
+    def mark_failed(self, url: str, error: str):
+        """Record a URL whose scrape or save failed (written back by `ack`)."""
+        self._failed.append((url, error[:500]))
+
+    async def ack(self):
+        """
+        Write back the recorded states and release anything still claimed.
+
+        Failed URLs go back to pending while they have attempts left. Claimed
+        URLs that were never reported (e.g. the batch was interrupted) are
+        released without waiting for their lease to expire.
+        """
+        done, self._done = self._done, []
+        failed, self._failed = self._failed, []
+        async with self._lock, self.conn.transaction():
+            if done:
+                await self.conn.execute("""
+                    UPDATE scrape_queue
+                    SET state = 'done', error = NULL, claimed_by = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE job_url = ANY($1::text[]) AND claimed_by = $2
+                """, done, self.worker_id)
+            if failed:
+                await self.conn.executemany("""
+                    UPDATE scrape_queue
+                    SET state = CASE WHEN attempts >= $4 THEN 'failed' ELSE 'pending' END,
+                        error = $2, claimed_by = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE job_url = $1 AND claimed_by = $3
+                """, [(url, error, self.worker_id, ScrapingConfig.QUEUE_MAX_ATTEMPTS) for url, error in failed])
+            await self.conn.execute("""
+                UPDATE scrape_queue
+                SET state = 'pending', attempts = attempts - 1, claimed_by = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE claimed_by = $1 AND state = 'claimed'
+            """, self.worker_id)
+
+    async def _fail_exhausted(self):
+        """Mark claimed URLs failed once their lease expired and no attempts are left (caller holds the lock)."""
+        result = await self.conn.execute(_FAIL_EXHAUSTED_QUERY, ScrapingConfig.QUEUE_MAX_ATTEMPTS)
+        if count := _affected_rows(result):
+            logging.warning(f"⚠️ {count} offers failed after {ScrapingConfig.QUEUE_MAX_ATTEMPTS} expired leases")
+
+    async def renew_leases(self) -> int:
+        """Extend the lease on every URL this worker holds."""
+        async with self._lock:
+            result = await self.conn.execute("""
+                UPDATE scrape_queue
+                SET lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => $2)
+                WHERE claimed_by = $1 AND state = 'claimed'
+            """, self.worker_id, float(ScrapingConfig.QUEUE_LEASE_SECONDS))
+        return _affected_rows(result)
+
+    async def _heartbeat_loop(self):
+        interval = ScrapingConfig.QUEUE_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.renew_leases()
+            except Exception as e:
+                logging.warning(f"⚠️ Could not renew scrape_queue leases: {e}")
+
+    def start_heartbeat(self):
+        """Keep this worker's leases alive in the background."""
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop_heartbeat(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+
+    async def remaining(self) -> int:
+        """Number of URLs still pending or being worked on (with attempts left or a live lease)."""
+        async with self._lock:
+            await self._fail_exhausted()
+            return await self.conn.fetchval("""
+                SELECT COUNT(*) FROM scrape_queue
+                WHERE (state = 'pending' AND attempts < $1)
+                   OR (state = 'claimed' AND (lease_expires_at >= CURRENT_TIMESTAMP OR attempts < $1))
+            """, ScrapingConfig.QUEUE_MAX_ATTEMPTS)
+
+    async def summary(self) -> dict[str, int]:
+        """Number of URLs per state."""
+        async with self._lock:
+            rows = await self.conn.fetch("SELECT state, COUNT(*) AS count FROM scrape_queue GROUP BY state")
+        return {row["state"]: row["count"] for row in rows}